@@ -0,0 +1,10 @@
+"""
+Benchmarks
+==========
+
+Seeded maze generators and timed scenarios for every `QuokkaMaze` operation.
+
+Run from the repository root:
+
+    python -m benchmarks.run --out bench.json
+"""
@@ -0,0 +1,130 @@
+"""
+Generators
+==========
+
+Seeded synthetic mazes for benchmarking. Every generator returns a list of
+`(u, v)` id pairs for `QuokkaMaze.from_edges`; `place_food` picks the food
+vertices. The same seed always gives the same maze.
+"""
+
+import math
+import random
+from typing import List, Tuple
+
+from graph import QuokkaMaze
+
+
+Edges = List[Tuple[int, int]]
+
+
+def corridor(n: int, seed: int = 0) -> Edges:
+    """
+    A single path of `n` vertices, 0 -- 1 -- ... -- n-1.
+    """
+    return [(i, i + 1) for i in range(n - 1)]
+
+
+def grid(n: int, seed: int = 0) -> Edges:
+    """
+    A square grid with (about) `n` vertices, numbered row by row.
+    """
+    side = max(1, int(n ** 0.5))
+    edges = []
+    for row in range(side):
+        for col in range(side):
+            v = row * side + col
+            if col + 1 < side:
+                edges.append((v, v + 1))
+            if row + 1 < side:
+                edges.append((v, v + side))
+    return edges
+
+
+def gnp(n: int, seed: int = 0, degree: float = 4.0) -> Edges:
+    """
+    An Erdős–Rényi G(n, p) graph with average degree `degree`.
+
+    Edges are sampled with geometric skips, so this takes time proportional
+    to the number of edges rather than n^2.
+    """
+    rng = random.Random(seed)
+    p = min(1.0, degree / max(1, n - 1))
+    if p <= 0:
+        return []
+    if p >= 1:
+        return [(u, v) for u in range(n) for v in range(u + 1, n)]
+
+    # Batagelj and Brandes: jump straight to the next edge of the pairs
+    # (w, v) with w < v, taken in order.
+    edges = []
+    log_q = math.log(1 - p)
+    v, w = 1, -1
+    while v < n:
+        w += 1 + int(math.log(1 - rng.random()) / log_q)
+        while w >= v and v < n:
+            w -= v
+            v += 1
+        if v < n:
+            edges.append((w, v))
+    return edges
+
+
+def scale_free(n: int, seed: int = 0, attach: int = 2) -> Edges:
+    """
+    A Barabási–Albert preferential attachment graph, where every new vertex
+    joins `attach` existing vertices chosen in proportion to their degree.
+    """
+    rng = random.Random(seed)
+    edges = []
+    ends: List[int] = []
+    for v in range(n):
+        targets = set()
+        if ends:
+            while len(targets) < min(attach, v):
+                targets.add(rng.choice(ends))
+        else:
+            targets = set(range(v))
+        for u in targets:
+            edges.append((u, v))
+            ends.extend((u, v))
+    return edges
+
+
+def place_food(n: int, density: float, seed: int = 0) -> List[int]:
+    """
+    Picks the food vertices, each vertex has food with chance `density`.
+    """
+    rng = random.Random(seed)
+    return [v for v in range(n) if rng.random() < density]
+
+
+def build(
+    kind: str,
+    n: int,
+    food_density: float = 0.2,
+    seed: int = 0
+) -> QuokkaMaze:
+    """
+    Builds a maze with one of the generators in `GENERATORS`.
+
+    :param kind - The name of the generator.
+    :param n - The (approximate) number of vertices.
+    :param food_density - The chance that a vertex has food.
+    :param seed - The random seed.
+    :return the maze.
+    """
+    edges = GENERATORS[kind](n, seed)
+    size = 1 + max((max(e) for e in edges), default=n - 1)
+    return QuokkaMaze.from_edges(
+        edges,
+        food=place_food(size, food_density, seed + 1),
+        n=size
+    )
+
+
+GENERATORS = {
+    'corridor': corridor,
+    'grid': grid,
+    'gnp': gnp,
+    'scale_free': scale_free,
+}
@@ -0,0 +1,273 @@
+"""
+Run
+===
+
+Times every `QuokkaMaze` operation on the seeded mazes of
+`benchmarks.generators`, across sizes and values of k, and writes the results
+as JSON:
+
+    python -m benchmarks.run --sizes 100 1000 --ks 2 4 --out bench.json
+
+Each result records the generator, n, k, the operation, how many calls were
+timed, and the total/mean/min/max seconds per call. A query that runs longer
+than `--call-timeout` seconds is abandoned and counted in `timeouts`, so one
+blow-up does not stall the whole run (this needs SIGALRM, i.e. not Windows).
+"""
+
+import argparse
+import json
+import platform
+import random
+import signal
+import sys
+import time
+from typing import Callable, Dict, List, Union
+
+from benchmarks.generators import GENERATORS, build, place_food
+from graph import QuokkaMaze
+from vertex import Vertex
+
+
+QUERIES = (
+    'find_path',
+    'find_path_bidirectional',
+    'find_path_astar',
+    'exists_path_with_extra_food',
+    'find_location_of_extra_food',
+    'minimize_extra_food',
+    'minimize_extra_food_astar',
+)
+
+
+class CallTimeout(Exception):
+    """
+    Raised inside a call that ran past its time limit.
+    """
+
+
+def _on_alarm(signum, frame):
+    raise CallTimeout()
+
+
+def summarise(times: List[float], timeouts: int = 0) -> Dict[str, float]:
+    """
+    Summarises the seconds taken by each call that finished.
+    """
+    return {
+        'calls': len(times),
+        'timeouts': timeouts,
+        'total_s': sum(times),
+        'mean_s': sum(times) / len(times) if times else 0.0,
+        'min_s': min(times, default=0.0),
+        'max_s': max(times, default=0.0),
+    }
+
+
+def time_calls(
+    calls: List[Callable[[], object]],
+    timeout: Union[float, None] = None
+) -> Dict[str, float]:
+    """
+    Times each call on its own, abandoning calls that run past `timeout`
+    seconds where SIGALRM is available.
+    """
+    if not hasattr(signal, 'setitimer'):
+        timeout = None
+
+    times = []
+    timeouts = 0
+    previous = signal.signal(signal.SIGALRM, _on_alarm) if timeout else None
+    try:
+        for call in calls:
+            start = time.perf_counter()
+            try:
+                if timeout:
+                    signal.setitimer(signal.ITIMER_REAL, timeout)
+                call()
+            except CallTimeout:
+                timeouts += 1
+                continue
+            finally:
+                if timeout:
+                    signal.setitimer(signal.ITIMER_REAL, 0)
+            times.append(time.perf_counter() - start)
+    finally:
+        if timeout:
+            signal.signal(signal.SIGALRM, previous)
+    return summarise(times, timeouts)
+
+
+def bench_mutations(
+    kind: str,
+    n: int,
+    food_density: float,
+    queries: int,
+    seed: int
+) -> List[Dict]:
+    """
+    Times add_vertex, fix_edge and block_edge one call at a time.
+    """
+    edges = GENERATORS[kind](n, seed)
+    size = 1 + max((max(e) for e in edges), default=n - 1)
+    food = set(place_food(size, food_density, seed + 1))
+    vertices = [Vertex(i in food) for i in range(size)]
+
+    maze = QuokkaMaze()
+    results = [
+        ('add_vertex', time_calls([
+            (lambda v=v: maze.add_vertex(v))
+            for v in vertices
+        ])),
+        ('fix_edge', time_calls([
+            (lambda u=u, v=v: maze.fix_edge(vertices[u], vertices[v]))
+            for u, v in edges
+        ])),
+    ]
+
+    sample = random.Random(seed).sample(edges, min(queries, len(edges)))
+    results.append(('block_edge', time_calls([
+        (lambda u=u, v=v: maze.block_edge(vertices[u], vertices[v]))
+        for u, v in sample
+    ])))
+
+    return [
+        dict(generator=kind, n=size, k=None, operation=op, **stats)
+        for op, stats in results
+    ]
+
+
+def bench_queries(
+    kind: str,
+    n: int,
+    k: int,
+    food_density: float,
+    queries: int,
+    budget: int,
+    seed: int,
+    timeout: Union[float, None] = None
+) -> List[Dict]:
+    """
+    Times each query operation on random endpoints.
+    """
+    maze = build(kind, n, food_density, seed)
+    rng = random.Random(seed + k)
+    vertices = list(maze.vertices)
+    pairs = [
+        (rng.choice(vertices), rng.choice(vertices))
+        for _ in range(queries)
+    ]
+
+    calls = {
+        'find_path':
+            lambda s, t: maze.find_path(s, t, k),
+        'find_path_bidirectional':
+            lambda s, t: maze.find_path(s, t, k, 'bidirectional'),
+        'find_path_astar':
+            lambda s, t: maze.find_path(s, t, k, 'astar'),
+        'exists_path_with_extra_food':
+            lambda s, t: maze.exists_path_with_extra_food(s, t, k, budget),
+        'find_location_of_extra_food':
+            lambda s, t: maze.find_location_of_extra_food(s, t, k, budget),
+        'minimize_extra_food':
+            lambda s, t: maze.minimize_extra_food(s, t, k),
+        'minimize_extra_food_astar':
+            lambda s, t: maze.minimize_extra_food(s, t, k, 'astar'),
+    }
+
+    results = []
+    for op in QUERIES:
+        stats = time_calls([
+            (lambda s=s, t=t, call=calls[op]: call(s, t))
+            for s, t in pairs
+        ], timeout)
+        results.append(dict(
+            generator=kind,
+            n=len(vertices),
+            k=k,
+            operation=op,
+            **stats
+        ))
+    return results
+
+
+def run(
+    generators: List[str],
+    sizes: List[int],
+    ks: List[int],
+    food_density: float = 0.2,
+    queries: int = 20,
+    budget: int = 2,
+    seed: int = 0,
+    timeout: Union[float, None] = 10.0
+) -> Dict:
+    """
+    Runs every scenario and returns the results, ready to dump as JSON.
+    """
+    results = []
+    for kind in generators:
+        for n in sizes:
+            results.extend(
+                bench_mutations(kind, n, food_density, queries, seed)
+            )
+            for k in ks:
+                results.extend(bench_queries(
+                    kind, n, k, food_density, queries, budget, seed, timeout
+                ))
+
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'seed': seed,
+            'food_density': food_density,
+            'queries': queries,
+            'budget': budget,
+            'call_timeout_s': timeout,
+        },
+        'results': results,
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark every QuokkaMaze operation."
+    )
+    parser.add_argument('--generators', nargs='+', default=sorted(GENERATORS),
+                        choices=sorted(GENERATORS))
+    parser.add_argument('--sizes', nargs='+', type=int, default=[100, 1000])
+    parser.add_argument('--ks', nargs='+', type=int, default=[2, 4])
+    parser.add_argument('--food-density', type=float, default=0.2)
+    parser.add_argument('--queries', type=int, default=20,
+                        help="queries (and blocked edges) per scenario")
+    parser.add_argument('--budget', type=int, default=2,
+                        help="x for the extra food queries")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--call-timeout', type=float, default=10.0,
+                        help="seconds before a query is abandoned, 0 for "
+                             "no limit")
+    parser.add_argument('--out', help="write the JSON here, not stdout")
+    args = parser.parse_args(argv)
+
+    report = run(
+        args.generators,
+        args.sizes,
+        args.ks,
+        food_density=args.food_density,
+        queries=args.queries,
+        budget=args.budget,
+        seed=args.seed,
+        timeout=args.call_timeout or None
+    )
+
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""
+Bitset
+======
+
+Bit-parallel reachability from many sources at once.
+
+Every vertex holds a bitset with one bit per source, and a breadth first
+search moves the bits of every source along an edge with a single OR, so
+hundreds of sources cost about as much as one. The bitsets are plain Python
+integers, which have no fixed width, so any number of sources can be searched
+together.
+
+A walk survives exactly when it goes from `s` to a food vertex in at most `k`
+steps, on through foods at most `k` steps apart, and from the last of them to
+`t` in at most `k` steps (or straight from `s` to `t` in at most `k`). The
+foods at most `k` steps apart are the components of the food graph (see
+`food_graph`), so the whole search is two bounded searches of depth `k`:
+
+    1. from the sources, marking the vertices each source reaches in `k`
+       steps, and through them the food components it reaches;
+    2. from every food vertex, carrying the sources of its component `k`
+       steps further.
+
+As with `shortest_walk`, the answers are about walks: a pair is feasible when
+a surviving walk exists, which is what `QuokkaMaze.can_reach` answers too.
+"""
+
+from typing import Dict, List, Sequence, Union
+
+from food_graph import FoodGraph
+from stats import active_counters
+
+
+def multi_source_reach(
+    graph,
+    sources: Sequence[int],
+    k: int,
+    food_graph: Union[FoodGraph, None] = None
+) -> List[int]:
+    """
+    Finds every vertex each source can reach, such that from any location
+    with food we reach the next location with food in at most `k` steps.
+
+    :param graph - The graph to search, see `search` for the interface.
+    :param sources - The ids of the start vertices, each assumed to have food.
+    :param k - The maximum number of hops between locations with food.
+    :param food_graph - The food graph of `graph` for `k`, if already built.
+    :return a bitset per vertex id, with bit `i` set if `sources[i]` reaches
+        the vertex.
+    """
+
+    n = graph.n
+    if k < 0:
+        return [0] * n
+    if food_graph is None:
+        food_graph = FoodGraph(graph, k)
+
+    seeds: Dict[int, int] = {}
+    for i, s in enumerate(sources):
+        seeds[s] = seeds.get(s, 0) | 1 << i
+    direct = spread(graph, seeds, k)
+
+    # The sources reaching each food component, by its root.
+    components: Dict[int, int] = {}
+    foods = [v for v in range(n) if graph.has_food(v)]
+    for f in foods:
+        if direct[f]:
+            c = food_graph.component(f)
+            components[c] = components.get(c, 0) | direct[f]
+
+    seeds = {}
+    for f in foods:
+        bits = components.get(food_graph.component(f), 0)
+        if bits:
+            seeds[f] = bits
+    onward = spread(graph, seeds, k)
+
+    return [a | b for a, b in zip(direct, onward)]
+
+
+def spread(graph, seeds: Dict[int, int], depth: int) -> List[int]:
+    """
+    Runs a bit-parallel breadth first search, bounded to `depth` steps.
+
+    :param graph - The graph to search.
+    :param seeds - The bitset to start from at each seed vertex.
+    :param depth - The most steps to take from a seed.
+    :return a bitset per vertex id, the union of the seeds within `depth`
+        steps of it.
+    """
+
+    neighbours = graph.neighbours
+    bits = [0] * graph.n
+    for v, b in seeds.items():
+        bits[v] = b
+    # fresh holds the bits that reached each vertex in the last round.
+    fresh = dict(seeds)
+
+    counters = active_counters()
+    expanded = peak = 0
+
+    for _ in range(depth):
+        if not fresh:
+            break
+        if len(fresh) > peak:
+            peak = len(fresh)
+        arrived: Dict[int, int] = {}
+        for v, b in fresh.items():
+            expanded += 1
+            for w in neighbours(v):
+                new = b & ~bits[w]
+                if new:
+                    bits[w] |= new
+                    arrived[w] = arrived.get(w, 0) | new
+        fresh = arrived
+
+    if counters is not None:
+        counters.add(expanded=expanded, frontier=peak)
+    return bits
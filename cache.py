@@ -0,0 +1,125 @@
+"""
+Cache
+=====
+
+A bounded, version aware memo for query results on the quokka maze.
+
+Every entry is only valid for the graph version it was computed on. As soon as
+the maze reports a new version (after `add_vertex`, `fix_edge` or
+`block_edge`) the whole cache is dropped, so a stale answer is never served.
+
+The cache may be used from several threads at once (see `service`). A miss is
+computed outside the lock, so two threads may compute the same result. Queries
+pinned to an older version than the cache holds are computed, not cached.
+"""
+
+import threading
+from collections import OrderedDict, namedtuple
+from typing import Any, Callable, Hashable
+
+
+CacheInfo = namedtuple(
+    'CacheInfo',
+    ['hits', 'misses', 'invalidations', 'maxsize', 'currsize']
+)
+
+
+class QueryCache:
+    """
+    Query Cache
+    -----------
+
+    A least recently used cache of query results, tagged with the graph
+    version they belong to.
+
+    Functions:
+        * lookup(key, version, compute) - returns the cached result for `key`,
+            or computes and stores it.
+        * clear() - drops every entry.
+        * info() - returns the hit/miss statistics as a `CacheInfo`.
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        """
+        Initialises an empty cache.
+
+        :param maxsize - The maximum number of results kept, must be > 0.
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize must be greater than 0")
+        self.maxsize = maxsize
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(
+        self,
+        key: Hashable,
+        version: int,
+        compute: Callable[[], Any]
+    ) -> Any:
+        """
+        Returns the result for `key` on graph `version`, calling `compute` on
+        a miss. Lists are copied on the way in and out, so callers can not
+        change a cached result.
+
+        :param key - The query, e.g. ('find_path', s, t, k).
+        :param version - The current version of the graph.
+        :param compute - Computes the result on a miss.
+        :return the result of the query.
+        """
+        entries = self._entries
+        with self._lock:
+            if self.version is None or version > self.version:
+                if entries:
+                    self.invalidations += 1
+                entries.clear()
+                self.version = version
+
+            if version == self.version and key in entries:
+                self.hits += 1
+                entries.move_to_end(key)
+                return _copy(entries[key])
+            self.misses += 1
+
+        result = compute()
+        with self._lock:
+            if version == self.version:
+                entries[key] = _copy(result)
+                if len(entries) > self.maxsize:
+                    entries.popitem(last=False)
+        return result
+
+    def clear(self) -> None:
+        """
+        Drops every entry, keeping the statistics.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def info(self) -> CacheInfo:
+        """
+        Returns the statistics of the cache.
+        """
+        return CacheInfo(
+            self.hits,
+            self.misses,
+            self.invalidations,
+            self.maxsize,
+            len(self._entries)
+        )
+
+
+def _copy(result: Any) -> Any:
+    """
+    Copies list results (also inside tuples) so the cached value can not be
+    mutated.
+    """
+    if isinstance(result, list):
+        return list(result)
+    if isinstance(result, tuple):
+        return tuple(_copy(r) for r in result)
+    return result
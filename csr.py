@@ -0,0 +1,142 @@
+"""
+CSR
+===
+
+A frozen, array backed copy of a quokka maze.
+
+Vertices are numbered by their id in the maze. The neighbours of vertex `i` are
+`targets[offsets[i]:offsets[i + 1]]` (compressed sparse row), and whether a
+vertex has food is packed into a bitmap with one bit per vertex. This takes a
+few bytes per edge instead of a Python object per reference, and lets the
+search routines work on plain integers.
+"""
+
+from array import array
+from typing import Iterable, List, Sequence
+
+from vertex import Vertex
+
+
+def _index_typecode(limit: int) -> str:
+    """
+    Picks the smallest signed array typecode that can hold values < limit.
+    """
+    return 'i' if limit < 2 ** 31 else 'q'
+
+
+def pack_food(flags: Iterable[bool], n: int) -> bytearray:
+    """
+    Packs an iterable of food flags into a bitmap, one bit per vertex.
+
+    :param flags - Whether each vertex, in id order, has food.
+    :param n - The number of vertices.
+    :return the bitmap, bit `i & 7` of byte `i >> 3` is set for food.
+    """
+    food = bytearray((n + 7) >> 3)
+    for i, has_food in enumerate(flags):
+        if has_food:
+            food[i >> 3] |= 1 << (i & 7)
+    return food
+
+
+class CSRGraph:
+    """
+    CSR Graph
+    ---------
+
+    An immutable adjacency structure for a maze with `n` vertices.
+
+    Attributes:
+        * self.n (int) - the number of vertices.
+        * self.offsets (Sequence[int]) - `n + 1` row offsets into `targets`.
+        * self.targets (Sequence[int]) - the concatenated neighbour ids.
+        * self.food (Sequence[int]) - the packed food bitmap.
+        * self.vertices (Sequence[Vertex]) - maps ids back to vertices.
+        * self.version (int) - the version of the maze this was built from.
+    """
+
+    __slots__ = ('n', 'offsets', 'targets', 'food', 'vertices', 'version')
+
+    def __init__(
+        self,
+        offsets: Sequence[int],
+        targets: Sequence[int],
+        food: Sequence[int],
+        vertices: Sequence[Vertex]
+    ) -> None:
+        """
+        Wraps already built buffers, see `from_vertices` to build them.
+        """
+        self.n = len(offsets) - 1
+        self.offsets = offsets
+        self.targets = targets
+        self.food = food
+        self.vertices = vertices
+        self.version = 0
+
+    @classmethod
+    def from_vertices(cls, vertices: Sequence[Vertex]) -> 'CSRGraph':
+        """
+        Builds the CSR form of the graph induced by `vertices`.
+        Neighbours that are not in `vertices` are dropped.
+
+        :param vertices - The vertices of the maze, in id order.
+        :return the frozen graph.
+        """
+        n = len(vertices)
+        ids = {v: i for i, v in enumerate(vertices)}
+
+        offsets = array('q', [0])
+        targets = array(_index_typecode(n))
+        for v in vertices:
+            targets.extend(ids[w] for w in v.edges if w in ids)
+            offsets.append(len(targets))
+
+        food = pack_food((v.has_food for v in vertices), n)
+        return cls(offsets, targets, food, list(vertices))
+
+    @classmethod
+    def from_graph(cls, graph) -> 'CSRGraph':
+        """
+        Builds the CSR form of any graph with `n`, `neighbours(i)`,
+        `has_food(i)` and `vertices`, such as a `snapshot.MazeSnapshot`.
+
+        :param graph - The graph to copy.
+        :return the frozen graph.
+        """
+        n = graph.n
+        neighbours = graph.neighbours
+
+        offsets = array('q', [0])
+        targets = array(_index_typecode(n))
+        for i in range(n):
+            targets.extend(neighbours(i))
+            offsets.append(len(targets))
+
+        food = pack_food(map(graph.has_food, range(n)), n)
+        return cls(offsets, targets, food, list(graph.vertices[:n]))
+
+    def neighbours(self, i: int) -> Sequence[int]:
+        """
+        Returns the ids of the neighbours of vertex `i`.
+        """
+        return self.targets[self.offsets[i]:self.offsets[i + 1]]
+
+    def has_food(self, i: int) -> bool:
+        """
+        Returns whether vertex `i` has food.
+        """
+        return bool(self.food[i >> 3] >> (i & 7) & 1)
+
+    def degree(self, i: int) -> int:
+        """
+        Returns the number of neighbours of vertex `i`.
+        """
+        return self.offsets[i + 1] - self.offsets[i]
+
+    def to_vertices(self, ids: Iterable[int]) -> List[Vertex]:
+        """
+        Translates a sequence of ids back into vertices.
+        """
+        vertices = self.vertices
+        return [vertices[i] for i in ids]
@@ -0,0 +1,67 @@
+"""
+Edge List
+=========
+
+Reads edge lists for bulk loading a quokka maze.
+
+An edge list file has one edge per line, as two integer vertex ids separated by
+whitespace. Blank lines and lines starting with `#` are ignored:
+
+    # A -- B -- C
+    0 1
+    1 2
+"""
+
+import os
+from typing import IO, Iterable, Iterator, Tuple, Union
+
+
+EdgeSource = Union[str, os.PathLike, IO[str], Iterable[Tuple[int, int]]]
+
+
+def read_edge_list(source: EdgeSource) -> Iterator[Tuple[int, int]]:
+    """
+    Lazily yields the `(u, v)` id pairs of an edge list.
+
+    :param source - A path to an edge list file, an open text file, or an
+        iterable of `(u, v)` pairs.
+    :return an iterator over the pairs.
+    :raises ValueError if a line or pair is not two integers.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source) as f:
+            yield from _parse_lines(f)
+    elif hasattr(source, 'readline'):
+        yield from _parse_lines(source)
+    else:
+        for pair in source:
+            u, v = pair
+            yield _to_id(u), _to_id(v)
+
+
+def _parse_lines(lines: Iterable[str]) -> Iterator[Tuple[int, int]]:
+    """
+    Parses the lines of an edge list file.
+    """
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        fields = line.split()
+        if len(fields) != 2:
+            raise ValueError(f"line {number}: expected 2 ids, got {line!r}")
+        try:
+            yield int(fields[0]), int(fields[1])
+        except ValueError:
+            raise ValueError(
+                f"line {number}: ids must be integers, got {line!r}"
+            ) from None
+
+
+def _to_id(value) -> int:
+    """
+    Checks that a vertex id is an integer.
+    """
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError(f"ids must be integers, got {value!r}")
+    return value
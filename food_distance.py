@@ -0,0 +1,132 @@
+"""
+Food Distance
+=============
+
+The hop distance from every vertex to its nearest food, and what is derived
+from it, for one version of a quokka maze.
+
+The distances are found with one multi source breadth first search from every
+vertex with food, and stay valid until an edge changes. The structures that
+also depend on `k` (such as the food graph) are built the first time they are
+needed, and only the most recently used few are kept.
+
+The searches use the distances to skip dead states: a colony on `v` with `r`
+stamina left and no food within `r` steps can only survive if `t` itself is
+within `r` steps, so when it is not, nothing is gained by expanding the state.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Union
+
+from food_graph import FoodGraph
+from landmarks import hop_distances
+
+
+class FoodDistanceIndex:
+    """
+    Food Distance Index
+    -------------------
+
+    Nearest food distances of `graph`, and a least recently used cache of the
+    structures derived from them for a given `k`.
+
+    Functions:
+        * food_graph(k) - the food graph for `k`.
+        * derived(key, build) - a cached structure, built on a miss.
+        * dead_ends(t, k) - a test for states that can not survive.
+    """
+
+    def __init__(self, graph, maxsize: int = 8) -> None:
+        """
+        Runs the multi source BFS from every vertex with food.
+
+        :param graph - The graph, see `search` for the required interface.
+        :param maxsize - The most derived structures kept, must be > 0.
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize must be greater than 0")
+        self.graph = graph
+        self.maxsize = maxsize
+        self.distance = hop_distances(
+            graph,
+            (v for v in range(graph.n) if graph.has_food(v))
+        )
+        self._derived: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def derived(
+        self,
+        key: Hashable,
+        build: Union[Callable[[], Any], None] = None
+    ) -> Any:
+        """
+        Returns a derived structure, calling `build` on a miss. The least
+        recently used structure is dropped once there are too many.
+
+        :param key - What the structure is, e.g. ('food_graph', k).
+        :param build - Builds the structure, or None to only look it up.
+        :return the structure, or None if it is not built and `build` is None.
+        """
+        derived = self._derived
+        with self._lock:
+            if key in derived:
+                derived.move_to_end(key)
+                return derived[key]
+        if build is None:
+            return None
+
+        # Built outside the lock, so two threads may build the same thing.
+        value = build()
+        with self._lock:
+            derived[key] = value
+            derived.move_to_end(key)
+            if len(derived) > self.maxsize:
+                derived.popitem(last=False)
+        return value
+
+    def food_graph(self, k: int, build: bool = True) -> FoodGraph:
+        """
+        Returns the food graph for `k`, see `food_graph.FoodGraph`.
+
+        :param k - The maximum number of hops between locations with food.
+        :param build - Whether to build it if it is not cached.
+        :return the food graph, or None if not cached and `build` is false.
+        """
+        return self.derived(
+            ('food_graph', k),
+            (lambda: FoodGraph(self.graph, k)) if build else None
+        )
+
+    def dead_ends(self, t: int, k: int) -> Callable[[int, int], bool]:
+        """
+        Returns a test for the states that can not reach `t`: a state `(v, r)`
+        is a dead end when neither food nor `t` is within `r` steps of `v`.
+
+        The distances to `t` are found by a breadth first search from `t`
+        bounded to `k` steps, as no state has more than `k` stamina.
+
+        :param t - The id of the destination vertex.
+        :param k - The maximum number of hops between locations with food.
+        :return the test, called as `dead(v, r)`.
+        """
+        neighbours = self.graph.neighbours
+        near: Dict[int, int] = {t: 0}
+        frontier = [t]
+        for d in range(1, k + 1):
+            reached = []
+            for v in frontier:
+                for w in neighbours(v):
+                    if w not in near:
+                        near[w] = d
+                        reached.append(w)
+            frontier = reached
+
+        distance = self.distance
+        beyond = k + 1
+
+        def dead(v: int, r: int) -> bool:
+            d = distance[v]
+            return (d < 0 or r < d) and near.get(v, beyond) > r
+
+        return dead
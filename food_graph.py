@@ -0,0 +1,182 @@
+"""
+Food Graph
+==========
+
+Precomputed connectivity between the food locations of a maze, for a fixed k.
+
+Two food vertices are joined when one can be reached from the other in at most
+`k` hops. Once the colony reaches a food vertex it can reach every food vertex
+in the same component, so answering whether `t` is reachable from `s` only
+needs the components of the food around `s` and `t`.
+
+The components are found without computing all pairwise distances: a multi
+source BFS from every food vertex (bounded to depth `k - 1`) labels each vertex
+with its nearest food. Every edge `(u, v)` with
+`dist[u] + 1 + dist[v] <= k` joins the nearest foods of `u` and `v`. Any two
+foods within `k` hops are connected by a chain of such joins along their
+shortest path, so the union-find components match the food graph exactly.
+
+The answers are about walks, where the colony may double back on itself. A
+negative answer therefore also rules out any simple path, but a positive answer
+still needs `QuokkaMaze.find_path` to produce the path.
+"""
+
+from collections import deque
+from typing import List, Set, Union
+
+
+class FoodGraph:
+    """
+    Food Graph
+    ----------
+
+    Union-find components of the food vertices of `graph` at a fixed `k`.
+
+    Functions:
+        * component(v) - the component label of a food vertex.
+        * reachable(s, t) - whether a walk from `s` to `t` survives.
+    """
+
+    def __init__(self, graph, k: int) -> None:
+        """
+        Builds the food graph for `k` with a bounded multi-source BFS.
+
+        :param graph - The graph, see `search` for the required interface.
+        :param k - The maximum number of hops between locations with food.
+        """
+        self.graph = graph
+        self.k = k
+
+        n = graph.n
+        neighbours = graph.neighbours
+        self._parent = list(range(n))
+        self._size = [1] * n
+
+        if k <= 0:
+            return
+
+        dist = [-1] * n
+        nearest = [-1] * n
+        queue = deque()
+        for v in range(n):
+            if graph.has_food(v):
+                dist[v] = 0
+                nearest[v] = v
+                queue.append(v)
+
+        while queue:
+            v = queue.popleft()
+            if 2 * dist[v] + 1 > k:
+                # A further vertex can not join two foods within k hops.
+                continue
+            for w in neighbours(v):
+                if dist[w] < 0:
+                    dist[w] = dist[v] + 1
+                    nearest[w] = nearest[v]
+                    queue.append(w)
+
+        for v in range(n):
+            if dist[v] < 0:
+                continue
+            for w in neighbours(v):
+                if w > v and dist[w] >= 0 and dist[v] + 1 + dist[w] <= k:
+                    self._union(nearest[v], nearest[w])
+
+    def component(self, v: int) -> Union[int, None]:
+        """
+        Returns the component label of a food vertex.
+
+        :param v - The id of a vertex.
+        :return the label, or None if `v` has no food.
+        """
+        if not self.graph.has_food(v):
+            return None
+        return self._find(v)
+
+    def reachable(self, s: int, t: int) -> bool:
+        """
+        Determines whether a walk from `s` to `t` exists such that from any
+        location with food we reach the next location with food in at most
+        `k` steps.
+
+        This is O(α(n)) when both `s` and `t` have food, otherwise it explores
+        the vertices within `k` hops of the endpoints without food.
+
+        :param s - The id of the start vertex, assumed to have food.
+        :param t - The id of the destination vertex.
+        :return true if such a walk exists, else false.
+        """
+        if s == t:
+            return True
+        if self.k <= 0:
+            return False
+
+        has_food = self.graph.has_food
+        if has_food(s) and has_food(t):
+            return self._find(s) == self._find(t)
+
+        if has_food(s):
+            around_s = {self._find(s)}
+        else:
+            around_s = self._components_near(s, t)
+            if around_s is None:
+                # `t` itself is within k hops of `s`.
+                return True
+
+        if has_food(t):
+            return self._find(t) in around_s
+        around_t = self._components_near(t, s)
+        if around_t is None:
+            return True
+        return not around_s.isdisjoint(around_t)
+
+    def _components_near(self, v: int, target: int) -> Union[Set[int], None]:
+        """
+        Collects the components of the food within `k` hops of `v`.
+        Returns None instead if `target` is within `k` hops of `v`.
+        """
+        neighbours = self.graph.neighbours
+        has_food = self.graph.has_food
+
+        labels = set()
+        seen = {v}
+        frontier: List[int] = [v]
+        for _ in range(self.k):
+            nxt = []
+            for u in frontier:
+                for w in neighbours(u):
+                    if w in seen:
+                        continue
+                    seen.add(w)
+                    if w == target:
+                        return None
+                    if has_food(w):
+                        # Food ends the stretch, the walk continues from it.
+                        labels.add(self._find(w))
+                    else:
+                        nxt.append(w)
+            frontier = nxt
+        return labels
+
+    def _find(self, v: int) -> int:
+        """
+        Finds the root of `v`, halving the path along the way.
+        """
+        parent = self._parent
+        while parent[v] != v:
+            parent[v] = parent[parent[v]]
+            v = parent[v]
+        return v
+
+    def _union(self, a: int, b: int) -> None:
+        """
+        Merges the components of `a` and `b`, by size.
+        """
+        a = self._find(a)
+        b = self._find(b)
+        if a == b:
+            return
+        if self._size[a] < self._size[b]:
+            a, b = b, a
+        self._parent[b] = a
+        self._size[a] += self._size[b]
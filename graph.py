@@ -16,11 +16,107 @@ All functions to implement are marked with a `TODO` comment.
 Please implement these methods to help the quokkas find their new home!
 """
 
-from typing import List, Union
+import os
+import threading
+from collections.abc import Sequence
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
 
+from bitset import multi_source_reach
+from cache import CacheInfo, QueryCache
+from csr import CSRGraph
+from edgelist import EdgeSource, read_edge_list
+from food_distance import FoodDistanceIndex
+from food_graph import FoodGraph
+from landmarks import Landmarks, hop_distances
+from path_tree import PathTree
+from snapshot import MazeSnapshot, SnapshotLog
+from search import (
+    FOOD_WALKS,
+    WALKS,
+    best_simple_path,
+    greedy_placements,
+    is_simple,
+    iter_valid_paths,
+    min_food_walk,
+    min_food_walks,
+    shortcut,
+    shortest_walk,
+    shortest_walks
+)
+from stats import QueryStats, instrumented
+from storage import make_vertices, read_snapshot, write_snapshot
 from vertex import Vertex
 
 
+class VertexView(Sequence):
+    """
+    A read-only view over the vertices of a maze, in insertion order.
+
+    Membership tests are answered by the maze's identity keyed index in O(1),
+    rather than by scanning a list.
+    """
+
+    def __init__(self, ids: Dict[Vertex, int], order: List[Vertex]) -> None:
+        self._ids = ids
+        self._order = order
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __getitem__(self, i):
+        return self._order[i]
+
+    def __iter__(self) -> Iterator[Vertex]:
+        return iter(self._order)
+
+    def __contains__(self, v) -> bool:
+        try:
+            return v in self._ids
+        except TypeError:
+            # Unhashable objects can never be vertices of the maze.
+            return False
+
+    def __eq__(self, other) -> bool:
+        # Compares equal to any sequence holding the same vertices in the
+        # same order, as the plain list this view replaced did.
+        if isinstance(other, VertexView):
+            return self._order == other._order
+        if isinstance(other, Sequence) and not isinstance(other, str):
+            return self._order == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"VertexView({self._order!r})"
+
+
+class _Indexes:
+    """
+    The food distance index and the landmarks of a maze, each built for one
+    snapshot. The maze and every view pinned from it share one holder, so an
+    index built while answering on a view is reused by the maze and by the
+    other views of the same version.
+    """
+
+    __slots__ = ('food_index', 'landmarks', 'lock')
+
+    def __init__(self) -> None:
+        self.food_index: Union[FoodDistanceIndex, None] = None
+        self.landmarks: Union[Landmarks, None] = None
+        # Held while building, so threads wanting the same index wait for
+        # it rather than each building their own.
+        self.lock = threading.RLock()
+
+
+def _newer(held, graph: MazeSnapshot) -> bool:
+    """
+    Whether an index built for `graph` should replace the `held` one: a
+    view pinned to an older version does not evict the current one.
+    """
+    return held is None or held.graph.version <= graph.version
+
+
 class QuokkaMaze:
     """
     Quokka Maze
@@ -67,14 +163,625 @@ class QuokkaMaze:
         way.
     * All vertices in the graph SHOULD BE UNIQUE! IT SHOULD NOT BE POSSIBLE
         TO ADD DUPLICATE VERTICES! (i.e the same vertex instance)
+    * Once a vertex is in the maze, change it through the maze. Queries run
+        on a snapshot of the maze, which does not see `Vertex.add_edge`,
+        `Vertex.rm_edge` or assignments to `has_food` until `refresh` is
+        called.
     """
 
     def __init__(self) -> None:
         """
         Initialises an empty graph with a list of empty vertices.
+
+        Every vertex is given a stable integer id, in the order the vertices
+        were added. `_ids` maps each vertex to its id and `_order` maps the id
+        back to the vertex.
+
+        `_log` is the published version of the graph, see
+        `snapshot.SnapshotLog`. Every successful mutation publishes the next
+        version's log in a single assignment, so structures derived from the
+        graph (such as the frozen CSR copy) know when they are stale, and
+        every query runs on the immutable `snapshot` of one whole version.
+        """
+        self._ids: Dict[Vertex, int] = {}
+        self._order: List[Vertex] = []
+        self.vertices = VertexView(self._ids, self._order)
+        self._log = SnapshotLog(
+            MazeSnapshot(CSRGraph.from_vertices(()), self._order, 0)
+        )
+        self._frozen: Union[CSRGraph, None] = None
+        self._indexes = _Indexes()
+        self._cache: Union[QueryCache, None] = None
+        self._stats: Union[QueryStats, None] = None
+
+    @classmethod
+    def from_edges(
+        cls,
+        edges: EdgeSource,
+        food: Iterable[int] = (),
+        n: Union[int, None] = None
+    ) -> 'QuokkaMaze':
+        """
+        Builds a maze from an edge list of integer vertex ids, in a single
+        pass over the edges. Vertex `i` of the edge list gets id `i` in the
+        maze. Self loops and repeated edges are dropped, so the result is a
+        simple graph.
+
+        :param edges - A path to an edge list file, an open text file, or an
+            iterable of `(u, v)` pairs, see `edgelist.read_edge_list`.
+        :param food - The ids of the vertices with food.
+        :param n - The number of vertices. If not given, it is one more than
+            the largest id used by `edges` or `food`.
+        :return the new maze.
+        :raises ValueError if an id is negative, or not less than `n`.
+        """
+        pairs = read_edge_list(edges)
+        food = set(food)
+        if n is None:
+            # The ids are only known after reading every edge.
+            pairs = list(pairs)
+            n = 1 + max(
+                [max(u, v) for u, v in pairs] + list(food),
+                default=-1
+            )
+
+        if any(not 0 <= i < n for i in food):
+            raise ValueError(f"food ids must be in [0, {n})")
+
+        maze = cls()
+        vertices = [Vertex(i in food) for i in range(n)]
+        maze._extend(vertices)
+
+        def resolve():
+            for u, v in pairs:
+                if not (0 <= u < n and 0 <= v < n):
+                    raise ValueError(f"edge ({u}, {v}) is out of [0, {n})")
+                yield vertices[u], vertices[v]
+
+        maze._link(resolve())
+        # The snapshot is only built once, with every edge in.
+        maze._rebuild()
+        return maze
+
+    def save(self, path: Union[str, os.PathLike]) -> None:
+        """
+        Saves the maze to a binary snapshot, see `storage`.
+        Vertex `i` of the snapshot is the vertex with id `i` in this maze.
+
+        :param path - Where to write the snapshot.
+        """
+        write_snapshot(self.freeze(), path)
+
+    @classmethod
+    def load(
+        cls,
+        path: Union[str, os.PathLike],
+        mmap: bool = True,
+        validate: bool = False
+    ) -> 'QuokkaMaze':
+        """
+        Loads a maze saved with `save`.
+
+        With `mmap`, the adjacency stays in the read-only mapped file and is
+        used as the frozen form of the maze until it is changed. Each vertex
+        only reads its own neighbours when they are first needed.
+
+        :param path - The snapshot to read.
+        :param mmap - Whether to map the file rather than read it.
+        :param validate - Whether to check every offset and target of the
+            file, which takes O(n + m). Pass it for files that are not
+            trusted, see `storage.load_snapshot`.
+        :return the loaded maze.
+        :raises ValueError if the file is not a valid snapshot.
+        """
+        return cls.from_csr(read_snapshot(path, mmap, validate))
+
+    @classmethod
+    def from_csr(cls, graph: CSRGraph) -> 'QuokkaMaze':
+        """
+        Builds a maze around a frozen graph with no vertices yet, such as one
+        read by `storage.load_snapshot`. The graph is used as the frozen form
+        of the maze until it is changed.
+
+        :param graph - The graph, its `vertices` are filled in.
+        :return the maze.
+        """
+        vertices = make_vertices(graph)
+
+        maze = cls()
+        maze._order.extend(vertices)
+        maze._ids.update(zip(vertices, range(len(vertices))))
+
+        graph.vertices = maze._order
+        graph.version = maze._log.version + 1
+        maze._frozen = graph
+        maze._log = SnapshotLog(
+            MazeSnapshot(graph, maze._order, graph.version)
+        )
+        return maze
+
+    def freeze(self) -> CSRGraph:
+        """
+        Returns a frozen, array backed copy of the graph, see `csr.CSRGraph`.
+        The copy is built on demand and reused until the graph changes.
+
+        Edges must be changed through `fix_edge` and `block_edge` (rather
+        than `Vertex.add_edge`) for the copy to notice the change, or the
+        maze must be `refresh`ed afterwards.
+
+        :return the CSR form of the current graph.
+        """
+        log = self._log
+        frozen = self._frozen
+        if frozen is None or frozen.version != log.version:
+            snapshot = log.snapshot()
+            if snapshot.changed:
+                frozen = CSRGraph.from_graph(snapshot)
+                frozen.version = snapshot.version
+            else:
+                frozen = snapshot.base
+            self._frozen = frozen
+        return frozen
+
+    def snapshot(self) -> MazeSnapshot:
+        """
+        Returns the immutable snapshot of the current version of the maze,
+        see `snapshot.MazeSnapshot`. It stays valid (and unchanged) however
+        the maze changes afterwards, so it can be searched without a lock.
+
+        The first call after some edits applies them to the last snapshot in
+        O(edits + degree of the changed vertices), sharing the rest.
+
+        :return the snapshot of the current version.
+        """
+        return self._log.snapshot()
+
+    def pin(self) -> 'PinnedMaze':
+        """
+        Returns a read-only view of the maze that answers every query on the
+        current version, whatever edits are made to the maze afterwards.
+        The view shares the caches and the indexes of the maze.
+
+        :return the pinned view.
+        """
+        log = self._log
+        view = PinnedMaze.__new__(PinnedMaze)
+        view.__dict__.update(self.__dict__)
+        view._log = log
+        view._frozen = None
+        return view
+
+    @instrumented('refresh')
+    def refresh(self) -> None:
+        """
+        Publishes a new version of the maze, rebuilt from its vertices, so
+        that queries see the changes made to the vertices directly (through
+        `Vertex.add_edge`, `Vertex.rm_edge` or `has_food`) rather than
+        through the maze. This takes O(n + m).
+        """
+        self._rebuild()
+
+    def _row(self, v: Vertex) -> Tuple[bool, Tuple[int, ...]]:
+        """
+        The snapshot row of a vertex: whether it has food, and the ids of
+        its neighbours in the maze.
+        """
+        ids = self._ids
+        return v.has_food, tuple([ids[w] for w in v._adj if w in ids])
+
+    def _rebuild(self) -> None:
+        """
+        Publishes the next version, with its snapshot built from scratch
+        from the vertices.
+        """
+        version = self._log.version + 1
+        base = CSRGraph.from_vertices(self._order)
+        base.version = version
+        self._log = SnapshotLog(MazeSnapshot(base, self._order, version))
+
+    def food_graph(self, k: int) -> FoodGraph:
+        """
+        Returns the food graph of the maze for `k`, see `food_graph.FoodGraph`.
+        Food graphs are built on demand and the most recently used few are
+        kept until the graph changes, see `food_index`. Once built,
+        `find_path` uses them to reject impossible queries early.
+
+        :param k - The maximum number of hops between locations with food.
+        :return the food graph for `k`.
+        """
+        return self._food_index_of(self.snapshot()).food_graph(k)
+
+    def food_index(self) -> FoodDistanceIndex:
         """
-        self.vertices = []
+        Returns the nearest food distances of the maze, and the structures
+        derived from them for each `k` (such as the food graphs), see
+        `food_distance.FoodDistanceIndex`. The index is built on demand and
+        kept until the graph changes; the queries use it to skip the states
+        that can not reach `t`.
 
+        :return the food distance index of the current graph.
+        """
+        return self._food_index_of(self.snapshot())
+
+    def _food_index_of(self, graph: MazeSnapshot) -> FoodDistanceIndex:
+        """
+        Returns the food distance index of a snapshot, building it if needed.
+        """
+        indexes = self._indexes
+        index = indexes.food_index
+        if index is not None and index.graph is graph:
+            return index
+        with indexes.lock:
+            index = indexes.food_index
+            if index is None or index.graph is not graph:
+                index = FoodDistanceIndex(graph)
+                if _newer(indexes.food_index, graph):
+                    indexes.food_index = index
+        return index
+
+    def landmarks(self) -> Landmarks:
+        """
+        Returns the landmark distances of the maze that the 'astar' searches
+        take their lower bounds from, see `landmarks.Landmarks`. They are
+        built on demand and kept until the graph changes.
+
+        :return the landmarks of the current graph.
+        """
+        return self._landmarks_of(self.snapshot())
+
+    def _landmarks_of(self, graph: MazeSnapshot) -> Landmarks:
+        """
+        Returns the landmarks of a snapshot, building them if needed.
+        """
+        indexes = self._indexes
+        landmarks = indexes.landmarks
+        if landmarks is not None and landmarks.graph is graph:
+            return landmarks
+        with indexes.lock:
+            landmarks = indexes.landmarks
+            if landmarks is None or landmarks.graph is not graph:
+                landmarks = Landmarks(
+                    graph,
+                    food_distance=self._food_index_of(graph).distance
+                )
+                if _newer(indexes.landmarks, graph):
+                    indexes.landmarks = landmarks
+        return landmarks
+
+    def _search_options(self, graph: MazeSnapshot, strategy: str) -> Dict:
+        """
+        The extra arguments that a search strategy takes.
+        """
+        if strategy == 'astar':
+            return {'landmarks': self._landmarks_of(graph)}
+        return {}
+
+    def _pin(self, s: Vertex, t: Vertex) -> Union[MazeSnapshot, None]:
+        """
+        Pins the snapshot that a validated query runs on, or returns None if
+        `s` or `t` was added after it.
+        """
+        graph = self.snapshot()
+        if self._ids[s] >= graph.n or self._ids[t] >= graph.n:
+            return None
+        return graph
+
+    @instrumented('can_reach')
+    def can_reach(self, s: Vertex, t: Vertex, k: int) -> bool:
+        """
+        Quickly determines whether the colony could get from `s` to `t` with
+        food at most `k` steps apart, if it were allowed to double back.
+
+        This is O(α(n)) when both `s` and `t` have food. A False answer means
+        `find_path(s, t, k)` returns None; a True answer almost always means it
+        finds a path, unless every route has to double back to reach food.
+
+        :param s - The start vertex for the quokka colony
+        :param t - The destination for the quokka colony
+        :param k - The maximum number of hops between locations with food.
+        :return true if `t` is reachable, else false.
+        """
+        if k < 0:
+            return False
+        if s not in self.vertices or t not in self.vertices:
+            return False
+        graph = self._pin(s, t)
+        if graph is None:
+            return False
+        food_graph = self._food_index_of(graph).food_graph(k)
+        return food_graph.reachable(self._ids[s], self._ids[t])
+
+    @instrumented('feasibility_matrix')
+    def feasibility_matrix(
+        self,
+        sources: Sequence[Vertex],
+        k: int,
+        targets: Union[Sequence[Vertex], None] = None
+    ) -> Union[List[List[bool]], None]:
+        """
+        Determines for many (s, t) pairs at once whether the colony could get
+        from `s` to `t` with food at most `k` steps apart, as `can_reach` does.
+
+        All the sources are searched together in one bit-parallel pass, see
+        `bitset.multi_source_reach`, so this is far cheaper than a query per
+        pair.
+
+        :param sources - The start vertices.
+        :param k - The maximum number of hops between locations with food.
+        :param targets - The destination vertices, or None for every vertex
+            of the maze, in id order.
+        :return a matrix with one row per source and one column per target,
+            or None if the input is invalid.
+        """
+        if k < 0:
+            return None
+        graph = self.snapshot()
+        sources = [self.vertex_id(v) for v in sources]
+        if targets is None:
+            targets = range(graph.n)
+        else:
+            targets = [self.vertex_id(v) for v in targets]
+        for i in [*sources, *targets]:
+            if i is None or i >= graph.n:
+                return None
+
+        reach = multi_source_reach(
+            graph,
+            sources,
+            k,
+            self._food_index_of(graph).food_graph(k)
+        )
+        columns = [reach[t] for t in targets]
+        return [
+            [bool(bits >> i & 1) for bits in columns]
+            for i in range(len(sources))
+        ]
+
+    @instrumented('find_paths_batch')
+    def find_paths_batch(
+        self,
+        queries: Iterable[Tuple[Vertex, Vertex, int]]
+    ) -> List[Union[List[Vertex], None]]:
+        """
+        Answers many `find_path` queries at once, all on the same version of
+        the maze.
+
+        The queries are grouped by their source and `k`, and every group is
+        answered by one breadth first search from its source (see
+        `search.shortest_walks`), so a group costs about as much as its
+        furthest query. The cache is not used.
+
+        :param queries - The (s, t, k) triples to answer.
+        :return the answer to each query, as `find_path` gives it, in the order
+            of `queries`.
+        """
+        graph = self.snapshot()
+        answers, groups = self._group_queries(graph, queries)
+        index = self._food_index_of(graph)
+
+        for (s_id, k), targets in groups.items():
+            food_graph = index.food_graph(k, build=False)
+            walks = shortest_walks(
+                graph,
+                s_id,
+                k,
+                [
+                    t_id for t_id in targets
+                    if food_graph is None or food_graph.reachable(s_id, t_id)
+                ]
+            )
+            for t_id in walks.targets():
+                path = self._path_from_walk(graph, walks.walk(t_id), k)
+                for i in targets[t_id]:
+                    answers[i] = None if path is None else list(path)
+        return answers
+
+    @instrumented('minimize_extra_food_batch')
+    def minimize_extra_food_batch(
+        self,
+        queries: Iterable[Tuple[Vertex, Vertex, int]]
+    ) -> List[Union[List[Vertex], None]]:
+        """
+        Answers many `minimize_extra_food` queries at once, all on the same
+        version of the maze.
+
+        As with `find_paths_batch`, the queries are grouped by their source
+        and `k`, and every group is answered by one 0-1 BFS from its source
+        (see `search.min_food_walks`). The cache is not used.
+
+        :param queries - The (s, t, k) triples to answer.
+        :return the answer to each query, as `minimize_extra_food` gives it, in
+            the order of `queries`.
+        """
+        graph = self.snapshot()
+        answers, groups = self._group_queries(graph, queries)
+
+        for (s_id, k), targets in groups.items():
+            walks = min_food_walks(graph, s_id, k, targets)
+            for t_id in walks.targets():
+                plan = self._plan_from_walk(graph, walks.walk(t_id), k)
+                for i in targets[t_id]:
+                    answers[i] = None if plan is None else list(plan[0])
+        return answers
+
+    @instrumented('find_paths_from')
+    def find_paths_from(self, s: Vertex, k: int) -> Union[PathTree, None]:
+        """
+        Finds the shortest simple path from `s` to every vertex at once, each
+        as `find_path(s, t, k)` gives it.
+
+        One breadth first search from `s` finds the shortest walk to every
+        vertex (see `search.shortest_walks`). The walk to a destination is
+        only turned into a simple path when it is asked for, see
+        `path_tree.PathTree`. The tree answers on the current version of the
+        maze, whatever edits are made afterwards.
+
+        :param s - The start vertex for the quokka colony.
+        :param k - The maximum number of hops between locations with food.
+        :return the tree of paths, or None if the input is invalid.
+        """
+        if k < 0 or s not in self.vertices:
+            return None
+        graph = self.snapshot()
+        s_id = self._ids[s]
+        if s_id >= graph.n:
+            return None
+
+        def resolve(walk):
+            path = self._path_from_walk(graph, walk, k)
+            return None if path is None else ([], path)
+
+        return PathTree(
+            s,
+            k,
+            self._ids_in(graph),
+            shortest_walks(graph, s_id, k),
+            resolve
+        )
+
+    @instrumented('min_extra_food_from')
+    def min_extra_food_from(self, s: Vertex, k: int) -> Union[PathTree, None]:
+        """
+        Finds the simple path from `s` to every vertex that needs the fewest
+        extra food at once, each as `minimize_extra_food_with_path(s, t, k)`
+        gives it.
+
+        One 0-1 BFS from `s` finds the best walk to every vertex (see
+        `search.min_food_walks`), and, as with `find_paths_from`, each walk is
+        only turned into a simple path when it is asked for.
+
+        :param s - The start vertex for the quokka colony.
+        :param k - The maximum number of hops between locations with food.
+        :return the tree of paths, whose `cost` is the fewest extra food, or
+            None if the input is invalid.
+        """
+        if k < 0 or s not in self.vertices:
+            return None
+        graph = self.snapshot()
+        s_id = self._ids[s]
+        if s_id >= graph.n:
+            return None
+
+        return PathTree(
+            s,
+            k,
+            self._ids_in(graph),
+            min_food_walks(graph, s_id, k),
+            lambda found: self._plan_from_walk(graph, found, k),
+            food=True
+        )
+
+    def _ids_in(self, graph: MazeSnapshot):
+        """
+        Returns a function giving the id of a vertex in a snapshot, or None
+        if the vertex is not in it.
+        """
+        ids = self._ids
+        n = graph.n
+
+        def id_in(v: Vertex) -> Union[int, None]:
+            i = ids.get(v)
+            return i if i is not None and i < n else None
+
+        return id_in
+
+    def _group_queries(
+        self,
+        graph: MazeSnapshot,
+        queries: Iterable[Tuple[Vertex, Vertex, int]]
+    ) -> Tuple[List[None], Dict[Tuple[int, int], Dict[int, List[int]]]]:
+        """
+        Validates a batch of (s, t, k) queries, and groups the valid ones by
+        their source id and `k`, then by their target id.
+
+        :return a None answer for every query, and the positions of the valid
+            queries in the groups.
+        """
+        answers = []
+        groups: Dict[Tuple[int, int], Dict[int, List[int]]] = {}
+        for i, (s, t, k) in enumerate(queries):
+            answers.append(None)
+            if k < 0 or s not in self.vertices or t not in self.vertices:
+                continue
+            s_id, t_id = self._ids[s], self._ids[t]
+            if s_id >= graph.n or t_id >= graph.n:
+                continue
+            targets = groups.setdefault((s_id, k), {})
+            targets.setdefault(t_id, []).append(i)
+        return answers, groups
+
+    def enable_cache(self, maxsize: int = 1024) -> None:
+        """
+        Turns on memoisation of `find_path`, `exists_path_with_extra_food`,
+        `find_location_of_extra_food` and `minimize_extra_food`.
+        Results are dropped whenever the graph changes, see `cache.QueryCache`.
+
+        :param maxsize - The maximum number of results to keep.
+        """
+        self._cache = QueryCache(maxsize)
+
+    def disable_cache(self) -> None:
+        """
+        Turns off memoisation and drops every cached result.
+        """
+        self._cache = None
+
+    def cache_info(self) -> Union[CacheInfo, None]:
+        """
+        Returns the hit/miss statistics of the cache, or None if disabled.
+        """
+        if self._cache is None:
+            return None
+        return self._cache.info()
+
+    def _cached(self, graph, key, compute):
+        """
+        Answers a validated query on a pinned snapshot, from the cache when
+        it is enabled.
+        """
+        if self._cache is None:
+            return compute()
+        return self._cache.lookup(key, graph.version, compute)
+
+    def enable_stats(self, hooks=()) -> QueryStats:
+        """
+        Turns on instrumentation of every public operation, see
+        `stats.QueryStats`. Stats are off by default and cost next to nothing
+        while off.
+
+        :param hooks - Callables run as `hook(name, seconds, counters)` after
+            every operation, e.g. to export to a metrics pipeline.
+        :return the stats object the operations are recorded in.
+        """
+        self._stats = QueryStats(hooks)
+        return self._stats
+
+    def disable_stats(self) -> None:
+        """
+        Turns off instrumentation and drops the recorded stats.
+        """
+        self._stats = None
+
+    def stats_info(self) -> Union[Dict[str, Dict], None]:
+        """
+        Returns the recorded stats per operation, or None if disabled.
+        """
+        if self._stats is None:
+            return None
+        return self._stats.as_dict()
+
+    def vertex_id(self, v: Vertex) -> Union[int, None]:
+        """
+        Returns the stable integer id of a vertex in this maze.
+
+        :param v - The vertex to look up.
+        :return the id of `v`, or None if `v` is not in the maze.
+        """
+        if v not in self.vertices:
+            return None
+        return self._ids[v]
+
+    @instrumented('add_vertex')
     def add_vertex(self, v: Vertex) -> bool:
         """
         Adds a vertex to the graph.
@@ -85,17 +792,22 @@ class QuokkaMaze:
         """
         # TODO implement me, please?
 
-        if v == None:
+        if not isinstance(v, Vertex):
             return False
-        if v not in self.vertices:
-            self.vertices.append(v)
-            return True
-        else:
-            while v in self.vertices:
-                self.vertices.remove(v)
-            self.vertices.append(v)
+        if v in self._ids:
             return False
+        ids = self._ids
+        ids[v] = len(self._order)
+        self._order.append(v)
+        # Neighbours linked to `v` before it was added gain it as well.
+        rows = {ids[v]: self._row(v)}
+        for w in v._adj:
+            if w in ids and v in w._adj:
+                rows[ids[w]] = self._row(w)
+        self._log = self._log.with_rows(rows, len(self._order))
+        return True
 
+    @instrumented('fix_edge')
     def fix_edge(self, u: Vertex, v: Vertex) -> bool:
         """
         Fixes the edge between two vertices, u and v.
@@ -107,25 +819,20 @@ class QuokkaMaze:
         """
 
         # TODO implement me please.
-        flag = 0
-        if v not in self.vertices:
-            flag =1
-        if u not in self.vertices:
-            flag =1
-        if u == None:
-            flag = 1
-        if v == None:
-            flag = 1
-        if flag == 1:
+        if u not in self.vertices or v not in self.vertices:
+            return False
+        if u is v:
+            # A simple graph has no self loops.
             return False
         if v in u.edges and u in v.edges:
             return False
-        v.rm_edge(u)
-        u.rm_edge(v)
-        v.add_edge(u)
+        # add_edge is idempotent, so this also repairs a one-sided edge.
         u.add_edge(v)
+        v.add_edge(u)
+        self._log = self._log.join(self._ids[u], self._ids[v])
         return True
 
+    @instrumented('block_edge')
     def block_edge(self, u: Vertex, v: Vertex) -> bool:
         """
         Blocks the edge between two vertices, u and v.
@@ -140,21 +847,85 @@ class QuokkaMaze:
         # TODO implement me, please!
         if u not in self.vertices or v not in self.vertices:
             return False
-        if u == None or v == None:
-            return False
         if v not in u.edges and u not in v.edges:
             return False
-        if v in u.edges:
-            u.rm_edge(v)
-        if u in v.edges:
-            v.rm_edge(u)
+        u.rm_edge(v)
+        v.rm_edge(u)
+        self._log = self._log.cut(self._ids[u], self._ids[v])
         return True
 
+    @instrumented('add_vertices_bulk')
+    def add_vertices_bulk(self, vertices: Iterable[Vertex]) -> int:
+        """
+        Adds many vertices to the graph at once, skipping the invalid ones and
+        those already in the graph. The snapshot of the new version is built
+        from scratch, so add vertices in a few large batches.
+
+        :param vertices - The vertices to add.
+        :return the number of vertices that were added.
+        """
+        added = self._extend(vertices)
+        if added:
+            self._rebuild()
+        return added
+
+    def _extend(self, vertices: Iterable[Vertex]) -> int:
+        """
+        Adds many vertices without publishing a new version.
+        """
+        ids = self._ids
+        order = self._order
+        added = 0
+        for v in vertices:
+            if isinstance(v, Vertex) and v not in ids:
+                ids[v] = len(order)
+                order.append(v)
+                added += 1
+        return added
+
+    @instrumented('add_edges_bulk')
+    def add_edges_bulk(self, edges: Iterable[Tuple[Vertex, Vertex]]) -> int:
+        """
+        Fixes many edges at once, skipping self loops, edges that already
+        exist and edges with an endpoint outside the graph. The snapshot of
+        the new version is built from scratch, so add edges in a few large
+        batches.
+
+        :param edges - The `(u, v)` pairs of vertices to join.
+        :return the number of edges that were added.
+        """
+        added = self._link(edges)
+        if added:
+            self._rebuild()
+        return added
+
+    def _link(self, edges: Iterable[Tuple[Vertex, Vertex]]) -> int:
+        """
+        Fixes many edges without publishing a new version.
+        """
+        ids = self._ids
+        added = 0
+        for u, v in edges:
+            if u is v or not isinstance(u, Vertex) or u not in ids:
+                continue
+            if not isinstance(v, Vertex) or v not in ids:
+                continue
+            # Reach into the adjacency directly, this is the hot loop when
+            # loading millions of edges.
+            if v in u._adj and u in v._adj:
+                continue
+            u._adj[v] = None
+            v._adj[u] = None
+            added += 1
+        return added
+
+    @instrumented('find_path')
     def find_path(
             self,
             s: Vertex,
             t: Vertex,
-            k: int
+            k: int,
+            strategy: str = 'bfs'
     ) -> Union[List[Vertex], None]:
         """
         find_path returns a SIMPLE path between `s` and `t` such that from any
@@ -165,6 +936,11 @@ class QuokkaMaze:
         :param t - The destination for the quokka colony
         :param k - The maximum number of hops between locations with food, so
         that the colony can survive!
+        :param strategy - How to search for the shortest walk: 'bfs' searches
+        from `s` only, 'bidirectional' searches from both ends at once, which
+        expands fewer states when `s` and `t` are far apart, and 'astar' is
+        guided towards `t` by landmark lower bounds. All of them find a path
+        of the same length.
         :returns
             * The list of vertices to form the simple path from `s` to `t`
             satisfying the conditions.
@@ -184,88 +960,195 @@ class QuokkaMaze:
 
             3/ find_path(s=A, t=C, k=4) -> returns: [A, B, C]
 
+        :raises ValueError if the strategy is unknown.
         """
 
         # TODO implement me please
+        if strategy not in WALKS:
+            raise ValueError(f"unknown strategy {strategy!r}")
         if k < 0:
             return None
         if s not in self.vertices:
             return None
         if t not in self.vertices:
             return None
-        path = []
-        visited =[]
-        simple_paths = []
-        shortest =[False,[]]
-        
-        flag = 0
-        self.dfs(s,t,path,visited,simple_paths)
-        for i in simple_paths:
-            flag = 0
-            for x in i:
-                if x not in self.vertices:
-                    flag =1
-                if i.count(x) >1:
-                    flag =1
-                if x == None:
-                    flag =1
-            if flag == 1:
-                continue
-            if self.is_reachable(i,k):
-                if shortest[0] == False:
-                    shortest[0] = True
-                    shortest[1] = i
-                else:
-                    if len(shortest[1]) > len(i):
-                        shortest[1] = i
-        
-        if shortest[0] ==True:
-            return shortest[1]
-        
-        return None
-
-    def dfs(self,s,t,path,visited,simple_paths):
-        visited.append(s)
-        path.append(s)
-        if s == t:
-            a = []
-            for i in path:
-                a.append(i)
-            simple_paths.append(a)
-            visited.remove(s)
-            path.pop()
-            return   
-        for i in s.edges:
-            if i in self.vertices:
-                if i !=  s:
-                    if i != None:
-                        if  i not in visited:
-                            self.dfs(i,t,path,visited,simple_paths)
-        path.pop()
-        visited.remove(s)
-        
-    def is_reachable(self,path,k):
-
-        length = len(path)
-        index =0
-        stamina =k
-        current = path[0]
-        while True:
-            if index == length-1:
-                return True
-            if stamina == 0:
-                return False
-            stamina -= 1
-            index+=1
-            if path[index] in current.edges:
-                current = path[index]
+
+        graph = self._pin(s, t)
+        if graph is None:
+            return None
+        return self._cached(
+            graph,
+            ('find_path', s, t, k, strategy),
+            lambda: self._find_path(graph, s, t, k, strategy)
+        )
+
+    def _find_path(self, graph, s, t, k, strategy='bfs'):
+        """
+        Answers a validated `find_path` query on a pinned snapshot.
+        """
+        s_id, t_id = self._ids[s], self._ids[t]
+        index = self._food_index_of(graph)
+        food_graph = index.food_graph(k, build=False)
+        if food_graph is not None:
+            if not food_graph.reachable(s_id, t_id):
+                return None
+
+        walk = WALKS[strategy](
+            graph,
+            s_id,
+            t_id,
+            k,
+            dead=index.dead_ends(t_id, k),
+            **self._search_options(graph, strategy)
+        )
+        return self._path_from_walk(graph, walk, k)
+
+    def _path_from_walk(self, graph, walk, k):
+        """
+        Turns the shortest walk of a query into its shortest simple path.
+        """
+        if walk is None:
+            # If not even a walk survives, no simple path can either.
+            return None
+        if is_simple(walk):
+            # The shortest walk is simple, so it is the shortest simple path.
+            return graph.to_vertices(walk)
+
+        # No simple path is shorter than the walk, so a path of its length
+        # is a shortest one.
+        found = best_simple_path(
+            graph, walk[0], walk[-1], k, lower=len(walk) - 1, guide=walk
+        )
+        if found is None:
+            return None
+        return graph.to_vertices(found[1])
+
+    @instrumented('min_k_for_path')
+    def min_k_for_path(
+        self,
+        s: Vertex,
+        t: Vertex
+    ) -> Union[Tuple[int, List[Vertex]], None]:
+        """
+        Finds the smallest `k` for which `find_path(s, t, k)` finds a path,
+        and that path.
+
+        A path that survives with `k` survives with any larger `k` too, so the
+        smallest `k` is found by binary search instead of trying every `k`:
+        first on whether a walk survives, which is cheap to answer and bounds
+        `k` from below, then on `find_path` itself from that bound up.
+
+        :param s - The start vertex for the quokka colony
+        :param t - The destination for the quokka colony
+        :returns
+            * (k, path), the smallest `k` and the shortest simple path that
+            survives with it.
+            OR
+            * None if `t` can not be reached from `s` at all, or the input is
+            invalid.
+
+        Example:
+        (* means the vertex has food)
+                    *       *
+            A---B---C---D---E
+
+            1/ min_k_for_path(s=A, t=E) -> returns: (2, [A, B, C, D, E])
+
+            2/ min_k_for_path(s=A, t=A) -> returns: (0, [A])
+        """
+        if s not in self.vertices or t not in self.vertices:
+            return None
+
+        graph = self._pin(s, t)
+        if graph is None:
+            return None
+        return self._cached(
+            graph,
+            ('min_k_for_path', s, t),
+            lambda: self._min_k_for_path(graph, s, t)
+        )
+
+    def _min_k_for_path(self, graph, s, t):
+        """
+        Answers a validated `min_k_for_path` query on a pinned snapshot.
+        """
+        s_id, t_id = self._ids[s], self._ids[t]
+        if s_id == t_id:
+            return 0, [s]
+        hops = hop_distances(graph, [s_id])[t_id]
+        if hops < 0:
+            return None
+
+        # A shortest path survives with `k` = its length, so the answer is at
+        # most `hops`, and at least the smallest `k` any walk survives with.
+        index = self._food_index_of(graph)
+        low, high = 1, hops
+        while low < high:
+            k = (low + high) // 2
+            dead = index.dead_ends(t_id, k)
+            if shortest_walk(graph, s_id, t_id, k, dead=dead) is None:
+                low = k + 1
             else:
-                return False
-            if current.has_food ==True:
-                stamina = k
-    
+                high = k
+
+        # Usually a simple path survives with the same `k` as a walk, so the
+        # search gallops up from `low` before narrowing down on the answer.
+        found = self._find_path(graph, s, t, low)
+        if found is not None:
+            return low, found
+        bad, good, path = low, hops, None
+        step = 1
+        while low + step < hops:
+            found = self._find_path(graph, s, t, low + step)
+            if found is not None:
+                good, path = low + step, found
+                break
+            bad = low + step
+            step *= 2
+        if path is None:
+            path = self._find_path(graph, s, t, hops)
+        while good - bad > 1:
+            k = (good + bad) // 2
+            found = self._find_path(graph, s, t, k)
+            if found is None:
+                bad = k
+            else:
+                good, path = k, found
+        return good, path
+
+    def iter_valid_paths(
+        self,
+        s: Vertex,
+        t: Vertex,
+        k: int,
+        x: int = 0
+    ) -> Iterator[List[Vertex]]:
+        """
+        Lazily yields the SIMPLE paths from `s` to `t` along which the colony
+        survives with food at most `k` steps apart, after placing food at no
+        more than `x` new locations. See `search.iter_valid_paths`.
 
+        The paths are taken from the graph as it was when iteration started.
 
+        :param s - The start vertex for the quokka colony
+        :param t - The destination for the quokka colony
+        :param k - The maximum number of hops between locations with food.
+        :param x - The number of extra foods that may be added.
+        :return an iterator over the paths, nothing if the input is invalid.
+        """
+        if k < 0 or x < 0:
+            return
+        if s not in self.vertices or t not in self.vertices:
+            return
+
+        graph = self._pin(s, t)
+        if graph is None:
+            return
+        ids = iter_valid_paths(graph, self._ids[s], self._ids[t], k, x)
+        for path in ids:
+            yield graph.to_vertices(path)
+
+    @instrumented('exists_path_with_extra_food')
     def exists_path_with_extra_food(
         self,
         s: Vertex,
@@ -312,40 +1195,109 @@ class QuokkaMaze:
             return False
         if t not in self.vertices:
             return False
-        path = []
-        visited =[]
-        simple_paths = []
-        self.dfs(s,t,path,visited,simple_paths)
-        
-        for i in simple_paths:
-            if self.is_reachable_with_extra_food(i,k,x):
-                return True
-        return False
 
-    def is_reachable_with_extra_food(self,path,k,x):
-
-
-        length = len(path)
-        food_left =x
-        stamina = k
-        index =0
-        while True:
-            if index == length-1:
-                return True
-            if stamina == 0:
-                if food_left >0:
-                    stamina = k
-                    food_left -= 1
-                else:
-                    return False
-            stamina -= 1
-            index+=1
-            current = path[index]
-            if current.has_food ==True:
-
-                stamina = k
-        
+        graph = self._pin(s, t)
+        if graph is None:
+            return False
+        return self._cached(
+            graph,
+            ('exists_path_with_extra_food', s, t, k, x),
+            lambda: self._exists_path_with_extra_food(graph, s, t, k, x)
+        )
+
+    def _exists_path_with_extra_food(self, graph, s, t, k, x):
+        """
+        Answers a validated `exists_path_with_extra_food` query.
+
+        The 0-1 BFS gives up as soon as the budget of `x` placements is used
+        up, so this is cheaper than finding the minimum.
+        """
+        s_id, t_id = self._ids[s], self._ids[t]
+        dead = self._food_index_of(graph).dead_ends(t_id, k)
+        found = min_food_walk(graph, s_id, t_id, k, budget=x, dead=dead)
+        if found is None:
+            return False
+        walk, placed = found
+        if is_simple(walk) or shortcut(graph, walk, k, x) is not None:
+            return True
+        if self._unfed_path(graph, walk, placed, k) is not None:
+            return True
+        if x == 0:
+            return False
+
+        # Any simple path needing at most `x` food will do.
+        found = best_simple_path(
+            graph,
+            s_id,
+            t_id,
+            k,
+            food=True,
+            lower=x,
+            upper=x + 1,
+            guide=walk
+        )
+        return found is not None
 
+    @instrumented('min_extra_food')
+    def min_extra_food(
+        self,
+        s: Vertex,
+        t: Vertex,
+        k: int
+    ) -> Union[int, None]:
+        """
+        Returns the smallest `x` such that placing food at `x` new locations
+        lets the colony get from `s` to `t` along a simple path with food at
+        most `k` steps apart.
+
+        The answer is found in O(log x) calls to `exists_path_with_extra_food`,
+        by doubling the budget until it suffices and then binary searching.
+
+        :param s - The start vertex for the quokka colony.
+        :param t - The destination vertex for the quokka colony.
+        :param k - The maximum number of hops between locations with food.
+        :returns:
+            * The smallest number of extra food locations needed.
+            * None if no path exists, or the input is invalid.
+        """
+        if k < 0:
+            return None
+        if s not in self.vertices or t not in self.vertices:
+            return None
+
+        graph = self._pin(s, t)
+        if graph is None:
+            return None
+        return self._cached(
+            graph,
+            ('min_extra_food', s, t, k),
+            lambda: self._min_extra_food(graph, s, t, k)
+        )
+
+    def _min_extra_food(self, graph, s, t, k):
+        """
+        Answers a validated `min_extra_food` query on a pinned snapshot.
+        """
+        # A simple path never needs more than one food per vertex.
+        limit = graph.n
+
+        # Every budget below `lo` is known to fail and `hi` is being tried.
+        lo, hi = 0, 0
+        while not self._exists_path_with_extra_food(graph, s, t, k, hi):
+            if hi >= limit:
+                return None
+            lo = hi + 1
+            hi = min(2 * hi + 1, limit)
+
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._exists_path_with_extra_food(graph, s, t, k, mid):
+                hi = mid
+            else:
+                lo = mid + 1
+        return hi
+
+    @instrumented('find_location_of_extra_food')
     def find_location_of_extra_food(
         self,
         s: Vertex,
@@ -386,49 +1338,37 @@ class QuokkaMaze:
                 (Any of the returned lists satisfy the criteria.)
         """
         # TODO implement me.
-        path = []
-        visited =[]
-        simple_paths = []
-        locations = [False,[]]
-        self.dfs(s,t,path,visited,simple_paths)
-        
-        
-        for i in simple_paths:
-            if self.get_location(i,k,x,locations)[0]:
-                return locations[1]
-        return None
-    def get_location(self,path,k,x,locations):
-
-
-        length = len(path)
-        food_left =x
-        stamina = k
-        index =0
-        current = path[0]
-        while True:
-            if index == length-1:
-                locations[0] = True
-                return locations
-            if stamina == 0:
-                if food_left >0:
-                    stamina = k
-                    food_left -= 1
-                    locations[1].append(current)
-                else:
-                    locations[1].clear()
-                    return locations
-            stamina -= 1
-            index+=1
-            current = path[index]
-            if current.has_food ==True:
-
-                stamina = k
+        if k < 0 or x < 0:
+            return None
+        if s not in self.vertices or t not in self.vertices:
+            return None
+
+        graph = self._pin(s, t)
+        if graph is None:
+            return None
+        return self._cached(
+            graph,
+            ('find_location_of_extra_food', s, t, k, x),
+            lambda: self._find_location_of_extra_food(graph, s, t, k, x)
+        )
 
+    def _find_location_of_extra_food(self, graph, s, t, k, x):
+        """
+        Answers a validated `find_location_of_extra_food` query on a pinned
+        snapshot.
+        """
+        plan = self._plan_extra_food(graph, s, t, k)
+        if plan is None or len(plan[0]) > x:
+            return None
+        return plan[0]
+
+    @instrumented('minimize_extra_food')
     def minimize_extra_food(
         self,
         s: Vertex,
         t: Vertex,
-        k: Vertex
+        k: int,
+        strategy: str = 'bfs'
     ) -> Union[List[Vertex], None]:
         """
         Returns the smallest x locations such that adding food at these x
@@ -439,6 +1379,9 @@ class QuokkaMaze:
         :param s - The start vertex for the quokka colony.
         :param t - The destination vertex for the quokka colony.
         :param k - The maximum number of hops between
+        :param strategy - How to search for the fewest extra food: 'bfs' is a
+        0-1 breadth first search, 'astar' is guided towards `t` by landmark
+        lower bounds. Both place the same number of extra food.
         :returns:
             * The minimum list of locations to place foods in at most K
             steps.
@@ -452,46 +1395,274 @@ class QuokkaMaze:
             1/ minimize_extra_food(A, E, 2) -> [C]
             2/ minimize_extra_food(A, E, 1) -> [B, C, D]
 
+        :raises ValueError if the strategy is unknown.
         """
         # TODO implement me
-        path = []
-        visited =[]
-        simple_paths = []
-        locations = []
-        smallest_locations = [False,[]]
-        self.dfs(s,t,path,visited,simple_paths)
-        
-        
-        for i in simple_paths:
-            self.get_location2(i,k,locations)
-            if smallest_locations[0] == False:
-                for i in locations:
-                    smallest_locations.append(i)
-                smallest_locations[0] = True 
-            elif len(smallest_locations[1])> len(locations):
-                smallest_locations[1].clear()
-                for i in locations:
-                    smallest_locations[1].append(i)
-            locations.clear()
-        if smallest_locations[0]:
-            return smallest_locations[1]
-        else:
+        if strategy not in FOOD_WALKS:
+            raise ValueError(f"unknown strategy {strategy!r}")
+        if k < 0:
+            return None
+        if s not in self.vertices or t not in self.vertices:
+            return None
+
+        graph = self._pin(s, t)
+        if graph is None:
+            return None
+        return self._cached(
+            graph,
+            ('minimize_extra_food', s, t, k, strategy),
+            lambda: self._minimize_extra_food(graph, s, t, k, strategy)
+        )
+
+    def _minimize_extra_food(self, graph, s, t, k, strategy='bfs'):
+        """
+        Answers a validated `minimize_extra_food` query on a pinned snapshot.
+        """
+        plan = self._plan_extra_food(graph, s, t, k, strategy)
+        if plan is None:
+            return None
+        return plan[0]
+
+    @instrumented('minimize_extra_food_with_path')
+    def minimize_extra_food_with_path(
+        self,
+        s: Vertex,
+        t: Vertex,
+        k: int
+    ) -> Union[Tuple[List[Vertex], List[Vertex]], None]:
+        """
+        Same as `minimize_extra_food`, but also returns the simple path that
+        the extra food is placed along.
+
+        :param s - The start vertex for the quokka colony.
+        :param t - The destination vertex for the quokka colony.
+        :param k - The maximum number of hops between locations with food.
+        :returns:
+            * A tuple of the minimum list of locations to place food on, and
+            the path from `s` to `t` through them.
+            * None if no path exists.
+        """
+        if k < 0:
             return None
-        
-    def get_location2(self,path,k,locations):
-
-        length = len(path)
-        stamina = k
-        index =0
-        current = path[0]
-        while True:
-            if index == length-1:
-                return locations
-            if stamina == 0:
-                locations.append(current)
-                stamina = k
-            stamina -= 1
-            index+=1
-            current = path[index]
-            if current.has_food == True:
-                stamina = k
+        if s not in self.vertices or t not in self.vertices:
+            return None
+
+        graph = self._pin(s, t)
+        if graph is None:
+            return None
+        return self._cached(
+            graph,
+            ('minimize_extra_food_with_path', s, t, k),
+            lambda: self._plan_extra_food(graph, s, t, k)
+        )
+
+    @instrumented('extra_food_profile')
+    def extra_food_profile(
+        self,
+        s: Vertex,
+        t: Vertex,
+        k_max: int,
+        placements: bool = False
+    ) -> Union[List[Union[int, List[Vertex], None]], None]:
+        """
+        Returns the answer of `minimize_extra_food(s, t, k)` for every `k`
+        from 0 to `k_max` at once.
+
+        The fewest extra food never grows with `k`, and is 0 from
+        `min_k_for_path(s, t)` on. So only a few `k` are solved: when two `k`
+        need the same amount of food, so does every `k` between them, and
+        the locations found for the smaller one serve them all.
+
+        :param s - The start vertex for the quokka colony.
+        :param t - The destination vertex for the quokka colony.
+        :param k_max - The largest number of hops between locations with food
+            to answer for.
+        :param placements - Whether to return the locations to place food on
+            for each `k`, rather than how many there are.
+        :returns:
+            * A list indexed by `k`, of the fewest extra food needed (or where
+            to place it), or None where no path exists.
+            * None if the input is invalid.
+
+        Example:
+        (* means the vertex has food)
+                            *
+            A---B---C---D---E
+
+            1/ extra_food_profile(A, E, 4) -> [None, 3, 1, 1, 0]
+            2/ extra_food_profile(A, E, 2, True) -> [None, [B, C, D], [C]]
+        """
+        if k_max < 0:
+            return None
+        if s not in self.vertices or t not in self.vertices:
+            return None
+
+        graph = self._pin(s, t)
+        if graph is None:
+            return None
+        plans = self._cached(
+            graph,
+            ('extra_food_profile', s, t, k_max),
+            lambda: self._extra_food_profile(graph, s, t, k_max)
+        )
+        if placements:
+            return [None if plan is None else list(plan) for plan in plans]
+        return [None if plan is None else len(plan) for plan in plans]
+
+    def _extra_food_profile(self, graph, s, t, k_max):
+        """
+        Finds the fewest extra food locations for every `k` up to `k_max`,
+        on a pinned snapshot.
+        """
+        plans: List[Union[List[Vertex], None]] = [None] * (k_max + 1)
+
+        def solve(k):
+            plan = self._plan_extra_food(graph, s, t, k)
+            return None if plan is None else plan[0]
+
+        plans[0] = solve(0)
+        least = self._min_k_for_path(graph, s, t)
+        if least is None:
+            # Food can not make up for a missing route.
+            return plans
+        for k in range(max(least[0], 1), k_max + 1):
+            plans[k] = []
+
+        # Only the `k` below the smallest one without extra food are solved,
+        # splitting each range until both of its ends need the same food.
+        high = min(least[0] - 1, k_max)
+        if high < 1:
+            return plans
+        plans[1] = solve(1)
+        plans[high] = solve(high)
+        ranges = [(1, high)]
+        while ranges:
+            low, high = ranges.pop()
+            if high - low <= 1:
+                continue
+            if len(plans[low]) == len(plans[high]):
+                # Food placed for `low` also lets the colony survive with any
+                # larger `k`.
+                for k in range(low + 1, high):
+                    plans[k] = plans[low]
+                continue
+            mid = (low + high) // 2
+            plans[mid] = solve(mid)
+            ranges.append((low, mid))
+            ranges.append((mid, high))
+        return plans
+
+    def _plan_extra_food(self, graph, s, t, k, strategy='bfs'):
+        """
+        Finds the fewest extra food locations for a validated query, and the
+        simple path they are placed along.
+
+        A 0-1 BFS (or A*) over the stamina states finds the best walk. When
+        the walk is simple it is also the best simple path, and when cutting
+        out its loops leaves a path needing no more food, so is that path.
+        Otherwise a branch and bound search finds the best simple path.
+
+        :return a tuple (locations, path), or None if no path exists.
+        """
+        found = FOOD_WALKS[strategy](
+            graph,
+            self._ids[s],
+            self._ids[t],
+            k,
+            **self._search_options(graph, strategy)
+        )
+        return self._plan_from_walk(graph, found, k)
+
+    def _plan_from_walk(self, graph, found, k):
+        """
+        Turns the best walk of a query, and its food, into the best simple
+        path, as a tuple (locations, path).
+        """
+        if found is None:
+            # If not even a walk survives, no simple path can either.
+            return None
+        walk, placed = found
+        if is_simple(walk):
+            return graph.to_vertices(placed), graph.to_vertices(walk)
+
+        path = shortcut(graph, walk, k, len(placed))
+        if path is None:
+            path = self._unfed_path(graph, walk, placed, k)
+        if path is None:
+            found = best_simple_path(
+                graph,
+                walk[0],
+                walk[-1],
+                k,
+                food=True,
+                lower=max(len(placed), 1),
+                guide=walk
+            )
+            if found is None:
+                return None
+            path = found[1]
+        placed = greedy_placements(graph, path, k)
+        return graph.to_vertices(placed), graph.to_vertices(path)
+
+    def _unfed_path(self, graph, walk, placed, k):
+        """
+        Finds a simple path needing no extra food, when the best walk of an
+        extra food query needs none and is not simple.
+
+        Such a path is what `find_path` looks for, and the search for the
+        fewest hops finds it much faster than the search for the fewest food,
+        which has no length to bound it by while no food is needed.
+
+        :return the ids of the path, or None if there is none, or the walk
+            needs food.
+        """
+        if placed:
+            return None
+        found = best_simple_path(graph, walk[0], walk[-1], k, guide=walk)
+        return None if found is None else found[1]
+
+
+class PinnedMaze(QuokkaMaze):
+    """
+    Pinned Maze
+    -----------
+
+    A read-only view of a quokka maze, made by `QuokkaMaze.pin`, that answers
+    every query on the version of the maze it was pinned to. Every edit is
+    refused.
+    """
+
+    def add_vertex(self, v: Vertex) -> bool:
+        """
+        Refused, the view is read-only.
+        """
+        return False
+
+    def fix_edge(self, u: Vertex, v: Vertex) -> bool:
+        """
+        Refused, the view is read-only.
+        """
+        return False
+
+    def block_edge(self, u: Vertex, v: Vertex) -> bool:
+        """
+        Refused, the view is read-only.
+        """
+        return False
+
+    def add_vertices_bulk(self, vertices: Iterable[Vertex]) -> int:
+        """
+        Refused, the view is read-only.
+        """
+        return 0
+
+    def refresh(self) -> None:
+        """
+        Does nothing, the view stays on its version.
+        """
+
+    def add_edges_bulk(self, edges: Iterable[Tuple[Vertex, Vertex]]) -> int:
+        """
+        Refused, the view is read-only.
+        """
+        return 0
@@ -0,0 +1,130 @@
+"""
+Landmarks
+=========
+
+Lower bounds on hop distances, for goal directed (A*) search.
+
+A handful of landmark vertices are picked far apart from each other, and the
+hop distance from each landmark to every vertex is stored. By the triangle
+inequality, `|d(L, v) - d(L, t)|` is a lower bound on `d(v, t)` for any
+landmark `L`, and the largest of these over all landmarks is a lower bound that
+never drops by more than one per step. A* with such a bound expands the states
+towards `t` first and still finds a shortest walk.
+
+The distance from every vertex to its nearest food is stored as well, so the
+search for the fewest extra food can tell when the colony has no way to reach
+food (or `t`) before its stamina runs out.
+"""
+
+from array import array
+from collections import deque
+from typing import Callable, Iterable, List, Union
+
+
+class Landmarks:
+    """
+    Landmarks
+    ---------
+
+    Hop distances from a few landmark vertices of `graph`, and from the
+    nearest food, precomputed with one breadth first search each.
+
+    Functions:
+        * bound_to(t) - a function giving a lower bound on the hops to `t`.
+    """
+
+    def __init__(
+        self,
+        graph,
+        count: int = 8,
+        food_distance: Union[array, None] = None
+    ) -> None:
+        """
+        Picks up to `count` landmarks by farthest point selection: each new
+        landmark is the vertex furthest from all the landmarks before it, and
+        vertices no landmark can reach come first.
+
+        :param graph - The graph, see `search` for the required interface.
+        :param count - The most landmarks to pick.
+        :param food_distance - The distances to the nearest food, if known.
+        """
+        self.graph = graph
+        self.vertices: List[int] = []
+        self.distances: List[array] = []
+
+        n = graph.n
+        if food_distance is None:
+            food_distance = hop_distances(
+                graph,
+                (v for v in range(n) if graph.has_food(v))
+            )
+        self.food_distance = food_distance
+
+        # nearest[v] is the distance from `v` to the closest landmark so far,
+        # or `n` if no landmark reaches it.
+        nearest = [n] * n
+        pick = 0
+        while n and len(self.vertices) < count:
+            dist = hop_distances(graph, [pick])
+            self.vertices.append(pick)
+            self.distances.append(dist)
+            nearest = [
+                d if 0 <= d < m else m
+                for d, m in zip(dist, nearest)
+            ]
+            pick = max(range(n), key=nearest.__getitem__)
+            if nearest[pick] == 0:
+                # Every vertex is a landmark.
+                break
+
+    def bound_to(self, t: int) -> Callable[[int], Union[int, None]]:
+        """
+        Returns a function giving a lower bound on the hops from a vertex to
+        `t`, or None if the vertex can not reach `t` at all.
+
+        :param t - The id of the destination vertex.
+        :return the bound function.
+        """
+        columns = [(dist, dist[t]) for dist in self.distances]
+
+        def bound(v: int) -> Union[int, None]:
+            best = 0
+            for dist, to_t in columns:
+                d = dist[v]
+                if (d < 0) != (to_t < 0):
+                    # One of them is reached by the landmark and the other is
+                    # not, so they are in different components.
+                    return None
+                if d >= 0:
+                    d = d - to_t if d > to_t else to_t - d
+                    if d > best:
+                        best = d
+            return best
+
+        return bound
+
+
+def hop_distances(graph, sources: Iterable[int]) -> array:
+    """
+    Runs a multi source breadth first search.
+
+    :param graph - The graph to search.
+    :param sources - The ids to measure the distance from.
+    :return the hop distance from the nearest source to every vertex, or -1
+        where no source can reach it.
+    """
+    neighbours = graph.neighbours
+    dist = array('i', [-1]) * graph.n
+    queue = deque()
+    for v in sources:
+        dist[v] = 0
+        queue.append(v)
+
+    while queue:
+        v = queue.popleft()
+        d = dist[v] + 1
+        for w in neighbours(v):
+            if dist[w] < 0:
+                dist[w] = d
+                queue.append(w)
+    return dist
@@ -0,0 +1,207 @@
+"""
+Parallel
+========
+
+Answers batches of quokka maze queries on a pool of processes.
+
+The queries are pure Python and hold the GIL, so threads can not run them side
+by side. Instead, the executor writes the current version of the maze once
+into a block of shared memory, in the snapshot format of `storage`, and every
+worker process builds its own `QuokkaMaze` around that block (see
+`QuokkaMaze.from_csr`), reading the adjacency straight from the shared pages.
+Only the queries and the answers, as integer ids, are sent between processes.
+
+    with ParallelExecutor(maze, workers=8) as pool:
+        paths = pool.find_paths(queries)
+
+Queries are sent in chunks, sorted so that queries with the same source and
+`k` land in the same chunk and share a search (see
+`QuokkaMaze.find_paths_batch`). The answers come back in the order of the
+queries, as vertices of the maze.
+
+The executor answers on the version of the maze it was made on: later edits to
+the maze are not seen until a new executor is made.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Iterable, List, Sequence, Tuple, Union
+
+from graph import QuokkaMaze
+from storage import dump_snapshot, load_snapshot
+from vertex import Vertex
+
+
+# A query by vertex ids, (s, t, k), and the answers sent back by a worker.
+IdQuery = Tuple[int, int, int]
+IdAnswer = Union[List[int], None]
+
+# The maze of a worker process, set up by `_attach`.
+_maze: Union[QuokkaMaze, None] = None
+_shm: Union[shared_memory.SharedMemory, None] = None
+
+
+class ParallelExecutor:
+    """
+    Parallel Executor
+    -----------------
+
+    A process pool answering queries on one version of a maze, which is shared
+    with the workers through shared memory.
+
+    Functions:
+        * find_paths(queries) - answers `find_path` queries.
+        * minimize_extra_food(queries) - answers `minimize_extra_food`
+            queries.
+        * close() - stops the workers and frees the shared memory.
+    """
+
+    def __init__(
+        self,
+        maze: QuokkaMaze,
+        workers: Union[int, None] = None,
+        chunksize: Union[int, None] = None
+    ) -> None:
+        """
+        Exports the maze and starts the workers.
+
+        :param maze - The maze to answer queries on.
+        :param workers - The number of processes, or None for one per core.
+        :param chunksize - The number of queries sent to a worker at a time,
+            or None to split every batch into a few chunks per worker.
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers <= 0:
+            raise ValueError("workers must be greater than 0")
+        if chunksize is not None and chunksize <= 0:
+            raise ValueError("chunksize must be greater than 0")
+
+        self.maze = maze
+        self.workers = workers
+        self.chunksize = chunksize
+        self.graph = maze.snapshot()
+
+        data = dump_snapshot(maze.freeze())
+        self._shm = shared_memory.SharedMemory(create=True, size=len(data))
+        self._shm.buf[:len(data)] = data
+        self._pool = ProcessPoolExecutor(
+            workers,
+            initializer=_attach,
+            initargs=(self._shm.name,)
+        )
+
+    def __enter__(self) -> 'ParallelExecutor':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Stops the workers and frees the shared memory. Calling it again does
+        nothing.
+        """
+        if self._shm is None:
+            return
+        self._pool.shutdown()
+        self._shm.close()
+        self._shm.unlink()
+        self._shm = None
+
+    def find_paths(
+        self,
+        queries: Iterable[Tuple[Vertex, Vertex, int]]
+    ) -> List[Union[List[Vertex], None]]:
+        """
+        Answers many `find_path` queries, see `QuokkaMaze.find_paths_batch`.
+
+        :param queries - The (s, t, k) triples to answer.
+        :return the answer to each query, in the order of `queries`.
+        """
+        return self._run('find_paths_batch', queries)
+
+    def minimize_extra_food(
+        self,
+        queries: Iterable[Tuple[Vertex, Vertex, int]]
+    ) -> List[Union[List[Vertex], None]]:
+        """
+        Answers many `minimize_extra_food` queries, see
+        `QuokkaMaze.minimize_extra_food_batch`.
+
+        :param queries - The (s, t, k) triples to answer.
+        :return the answer to each query, in the order of `queries`.
+        """
+        return self._run('minimize_extra_food_batch', queries)
+
+    def _run(
+        self,
+        op: str,
+        queries: Iterable[Tuple[Vertex, Vertex, int]]
+    ) -> List[Union[List[Vertex], None]]:
+        """
+        Translates the queries into ids, answers them in chunks on the
+        workers, and translates the answers back.
+        """
+        if self._shm is None:
+            raise ValueError("the executor is closed")
+
+        # Queries on vertices the workers do not have are answered with None.
+        n = self.graph.n
+        answers: List[Union[List[Vertex], None]] = []
+        todo: List[Tuple[IdQuery, int]] = []
+        for i, (s, t, k) in enumerate(queries):
+            answers.append(None)
+            s_id = self.maze.vertex_id(s)
+            t_id = self.maze.vertex_id(t)
+            if s_id is None or t_id is None or s_id >= n or t_id >= n:
+                continue
+            todo.append(((s_id, t_id, k), i))
+        if not todo:
+            return answers
+
+        todo.sort(key=lambda item: (item[0][0], item[0][2]))
+        size = self.chunksize
+        if size is None:
+            size = -(-len(todo) // (4 * self.workers))
+        chunks = [todo[i:i + size] for i in range(0, len(todo), size)]
+
+        results = self._pool.map(
+            _answer_chunk,
+            [op] * len(chunks),
+            [[query for query, _ in chunk] for chunk in chunks]
+        )
+        to_vertices = self.graph.to_vertices
+        for chunk, result in zip(chunks, results):
+            for (_, i), ids in zip(chunk, result):
+                if ids is not None:
+                    answers[i] = to_vertices(ids)
+        return answers
+
+
+def _attach(name: str) -> None:
+    """
+    Sets up a worker process: maps the shared snapshot and builds the maze.
+    """
+    global _maze, _shm
+    # The workers share the resource tracker of the executor's process, so
+    # the block is only unlinked once, by the executor.
+    _shm = shared_memory.SharedMemory(name)
+    # The executor wrote the snapshot itself, so it is not checked again.
+    _maze = QuokkaMaze.from_csr(load_snapshot(_shm.buf))
+
+
+def _answer_chunk(op: str, queries: Sequence[IdQuery]) -> List[IdAnswer]:
+    """
+    Answers a chunk of queries on the maze of this worker, by ids.
+    """
+    maze = _maze
+    vertices = maze.vertices
+    answers = getattr(maze, op)(
+        [(vertices[s], vertices[t], k) for s, t, k in queries]
+    )
+    return [
+        None if answer is None else [maze.vertex_id(v) for v in answer]
+        for answer in answers
+    ]
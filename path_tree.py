@@ -0,0 +1,152 @@
+"""
+Path Tree
+=========
+
+The best routes from one source to every destination of a quokka maze.
+
+A single search from the source (see `search.shortest_walks` and
+`search.min_food_walks`) finds the best walk to every vertex at once. The
+tree keeps its parent table, and only turns the walk to a destination into a
+simple path when that destination is asked for: most walks are already
+simple, and the few that are not go through the same exact search as a single
+query does. Each answer is kept, so asking again is free.
+"""
+
+from typing import Callable, Dict, Iterator, List, Tuple, Union
+
+from search import WalkTree
+from vertex import Vertex
+
+
+# The answer for one destination: the extra food locations and the path.
+Plan = Union[Tuple[List[Vertex], List[Vertex]], None]
+
+
+class PathTree:
+    """
+    Path Tree
+    ---------
+
+    The best simple paths from `source`, with food at most `k` steps apart,
+    to every vertex of one version of a maze, made by
+    `QuokkaMaze.find_paths_from` or `QuokkaMaze.min_extra_food_from`.
+
+    The cost of a path is its number of hops for `find_paths_from`, or the
+    number of extra food locations it needs for `min_extra_food_from`.
+
+    Attributes:
+        * self.source (Vertex) - where every path starts.
+        * self.k (int) - the maximum number of hops between food.
+
+    Functions:
+        * reachable(t) - whether there is a path to `t`.
+        * path(t) - the best path to `t`, built on first use.
+        * cost(t) - the cost of the best path to `t`.
+        * locations(t) - the extra food to place along the best path.
+        * destinations() - the vertices with a path, in id order.
+    """
+
+    def __init__(
+        self,
+        source: Vertex,
+        k: int,
+        ids: Callable[[Vertex], Union[int, None]],
+        walks: WalkTree,
+        resolve: Callable[[object], Plan],
+        food: bool = False
+    ) -> None:
+        """
+        Wraps the walks of a search from the source.
+
+        :param source - The start vertex.
+        :param k - The maximum number of hops between locations with food.
+        :param ids - Maps a vertex to its id in the searched version, or
+            None if it is not in it.
+        :param walks - The walks found by the search.
+        :param resolve - Turns a walk of `walks` into the best simple path,
+            as a tuple (locations, path), or None if there is none.
+        :param food - Whether the cost is the extra food rather than hops.
+        """
+        self.source = source
+        self.k = k
+        self._ids = ids
+        self._walks = walks
+        self._resolve = resolve
+        self._food = food
+        self._plans: Dict[int, Plan] = {}
+
+    def reachable(self, t: Vertex) -> bool:
+        """
+        Determines whether there is a simple path to `t`.
+
+        :param t - The destination.
+        :return true if there is a path, else false.
+        """
+        return self._plan(t) is not None
+
+    def path(self, t: Vertex) -> Union[List[Vertex], None]:
+        """
+        Returns the best simple path to `t`, as `find_path` (or
+        `minimize_extra_food_with_path`) would.
+
+        :param t - The destination.
+        :return the vertices of the path, or None if there is none.
+        """
+        plan = self._plan(t)
+        return None if plan is None else list(plan[1])
+
+    def cost(self, t: Vertex) -> Union[int, None]:
+        """
+        Returns the cost of the best simple path to `t`: its hops, or the
+        fewest extra food it needs.
+
+        :param t - The destination.
+        :return the cost, or None if there is no path.
+        """
+        plan = self._plan(t)
+        if plan is None:
+            return None
+        return len(plan[0]) if self._food else len(plan[1]) - 1
+
+    def locations(self, t: Vertex) -> Union[List[Vertex], None]:
+        """
+        Returns where to place extra food along the best path to `t`, as
+        `minimize_extra_food` would. Always empty for `find_paths_from`.
+
+        :param t - The destination.
+        :return the locations, or None if there is no path.
+        """
+        plan = self._plan(t)
+        return None if plan is None else list(plan[0])
+
+    def destinations(self) -> Iterator[Vertex]:
+        """
+        Lazily yields every vertex with a simple path from the source,
+        building the paths as it goes.
+        """
+        for t in sorted(self._walks.targets()):
+            plan = self._plan_of(t)
+            if plan is not None:
+                yield plan[1][-1]
+
+    def _plan(self, t: Vertex) -> Plan:
+        """
+        Returns the answer for a destination vertex.
+        """
+        t_id = self._ids(t)
+        if t_id is None:
+            return None
+        return self._plan_of(t_id)
+
+    def _plan_of(self, t_id: int) -> Plan:
+        """
+        Returns the answer for a destination id, building it on first use.
+        """
+        try:
+            return self._plans[t_id]
+        except KeyError:
+            pass
+        walk = self._walks.walk(t_id)
+        plan = None if walk is None else self._resolve(walk)
+        self._plans[t_id] = plan
+        return plan
@@ -0,0 +1,1248 @@
+"""
+Search
+======
+
+Stamina-aware search routines used by the quokka maze.
+
+Rather than enumerating every simple path, these routines search over layered
+states `(vertex, remaining stamina)`. A state `(v, r)` means the colony stands
+on `v` and may still take `r` steps before it must reach food. Moving to a
+neighbour `w` costs one step and is only allowed while `r >= 1`; on arrival the
+stamina becomes `k` if `w` has food, or `r - 1` otherwise.
+
+There are at most `k + 1` states per vertex, so a breadth first search over the
+states runs in O(n*k + m*k).
+
+The routines work on integer vertex ids. The graph passed in only needs to
+provide `n`, `neighbours(i)` and `has_food(i)`, as `csr.CSRGraph` does.
+
+Every routine reports the work it did to `stats.active_counters()`, when stats
+are enabled for the calling operation, and can skip the dead states that a
+`food_distance.FoodDistanceIndex` points out.
+"""
+
+import heapq
+from collections import deque
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Sequence,
+    Tuple,
+    Union
+)
+
+from stats import active_counters
+
+
+State = Tuple[int, int]
+DeadEnds = Union[Callable[[int, int], bool], None]
+# The cost and ids of a path, or None if there is none.
+Found = Union[Tuple[int, List[int]], None]
+# A move of `best_simple_path`, see its `order`.
+Move = Tuple[int, bool, int, int, int]
+
+
+def shortest_walk(
+    graph,
+    s: int,
+    t: int,
+    k: int,
+    dead: DeadEnds = None
+) -> Union[List[int], None]:
+    """
+    Finds the shortest walk from `s` to `t` such that from any location with
+    food we reach the next location with food in at most `k` steps.
+
+    The returned walk may revisit a vertex (e.g. a detour to a dead-end with
+    food), so callers that need a SIMPLE path must check the result.
+    If no walk exists, then no simple path exists either.
+
+    :param graph - The graph to search.
+    :param s - The id of the start vertex, assumed to have food.
+    :param t - The id of the destination vertex.
+    :param k - The maximum number of hops between locations with food.
+    :param dead - A test `dead(v, r)` for states that can not reach `t`, see
+        `food_distance.FoodDistanceIndex.dead_ends`, which are skipped.
+    :return the ids of the vertices of the walk, or None if `t` is unreachable.
+    """
+
+    if s == t:
+        return [s]
+
+    neighbours = graph.neighbours
+    has_food = graph.has_food
+
+    # best[v] is the most stamina we have arrived at `v` with so far. As states
+    # are discovered in order of distance, arriving again with less (or equal)
+    # stamina can never lead to a shorter walk, so it is skipped.
+    best = [-1] * graph.n
+    best[s] = k
+    parent: Dict[State, State] = {}
+    queue = deque([(s, k)])
+
+    counters = active_counters()
+    expanded = peak = 0
+    found = None
+
+    while queue and found is None:
+        if counters is not None and len(queue) > peak:
+            peak = len(queue)
+        state = queue.popleft()
+        expanded += 1
+        v, r = state
+        if r == 0:
+            continue
+        for w in neighbours(v):
+            nr = k if has_food(w) else r - 1
+            if best[w] >= nr:
+                continue
+            if dead is not None and dead(w, nr):
+                continue
+            best[w] = nr
+            parent[(w, nr)] = state
+            if w == t:
+                found = (w, nr)
+                break
+            queue.append((w, nr))
+
+    if counters is not None:
+        counters.add(expanded=expanded, frontier=peak)
+    if found is None:
+        return None
+    return _unwind(parent, found)
+
+
+class WalkTree:
+    """
+    Walk Tree
+    ---------
+
+    The parent table of a search from one source to many targets, from which
+    the best walk to each target reached is unwound on demand.
+
+    Functions:
+        * targets() - the ids of the targets reached.
+        * walk(t) - the walk to `t` (and, for the fewest extra food, the ids
+            to place food on).
+    """
+
+    __slots__ = ('_parent', '_reached', '_placements')
+
+    def __init__(
+        self,
+        parent: Dict[State, State],
+        reached: Dict[int, State],
+        placements: bool = False
+    ) -> None:
+        """
+        Wraps the tables a search built.
+
+        :param parent - The parent of every state the search reached.
+        :param reached - The best state of each target reached.
+        :param placements - Whether a step that stays on the same vertex
+            places food, as in `min_food_walk`.
+        """
+        self._parent = parent
+        self._reached = reached
+        self._placements = placements
+
+    def __contains__(self, t: int) -> bool:
+        return t in self._reached
+
+    def targets(self) -> Iterable[int]:
+        """
+        Returns the ids of the targets reached.
+        """
+        return self._reached.keys()
+
+    def walk(self, t: int):
+        """
+        Unwinds the walk to a target.
+
+        :param t - The id of the target.
+        :return the ids of the walk, or for the fewest extra food a tuple of
+            the walk and the ids to place food on, or None if `t` was not
+            reached.
+        """
+        state = self._reached.get(t)
+        if state is None:
+            return None
+        if self._placements:
+            return _unwind_placements(self._parent, state)
+        return _unwind(self._parent, state)
+
+
+def shortest_walks(
+    graph,
+    s: int,
+    k: int,
+    targets: Union[Iterable[int], None] = None
+) -> WalkTree:
+    """
+    Finds the shortest walks from `s` to many targets at once, with a single
+    breadth first search over the stamina states, as `shortest_walk` does for
+    one target. The search stops once every target is reached, and the walks
+    are unwound from the one parent table it builds.
+
+    :param graph - The graph to search.
+    :param s - The id of the start vertex, assumed to have food.
+    :param k - The maximum number of hops between locations with food.
+    :param targets - The ids of the destination vertices, or None for all.
+    :return the tree of the walks to the targets that are reachable.
+    """
+
+    remaining = set(range(graph.n) if targets is None else targets)
+    reached: Dict[int, State] = {}
+    if s in remaining:
+        remaining.discard(s)
+        reached[s] = (s, k)
+
+    neighbours = graph.neighbours
+    has_food = graph.has_food
+
+    # As in `shortest_walk`, best[v] is the most stamina we have arrived at
+    # `v` with so far, and the first arrival at `v` is along a shortest walk.
+    best = [-1] * graph.n
+    best[s] = k
+    parent: Dict[State, State] = {}
+    queue = deque([(s, k)])
+
+    counters = active_counters()
+    expanded = peak = 0
+
+    while queue and remaining:
+        if counters is not None and len(queue) > peak:
+            peak = len(queue)
+        state = queue.popleft()
+        expanded += 1
+        v, r = state
+        if r == 0:
+            continue
+        for w in neighbours(v):
+            nr = k if has_food(w) else r - 1
+            if best[w] >= nr:
+                continue
+            if best[w] < 0 and w in remaining:
+                remaining.discard(w)
+                reached[w] = (w, nr)
+            best[w] = nr
+            parent[(w, nr)] = state
+            queue.append((w, nr))
+
+    if counters is not None:
+        counters.add(expanded=expanded, frontier=peak)
+    return WalkTree(parent, reached)
+
+
+def bidirectional_walk(
+    graph,
+    s: int,
+    t: int,
+    k: int,
+    dead: DeadEnds = None
+) -> Union[List[int], None]:
+    """
+    Finds a shortest walk from `s` to `t`, like `shortest_walk`, by growing
+    one breadth first search from `s` and another from `t` and joining them
+    in the middle. On large sparse mazes this expands far fewer states when
+    `s` and `t` are far apart.
+
+    The backward search runs over states `(v, need)`, the least stamina the
+    colony must have on arrival at `v` to still reach `t`: `need` is 0 at `t`,
+    and stepping back from `v` to a neighbour needs 1 if `v` has food, or one
+    more than `v` needs otherwise. A forward state `(v, r)` and a backward
+    state `(v, need)` meet when `r >= need`.
+
+    :param graph - The graph to search.
+    :param s - The id of the start vertex, assumed to have food.
+    :param t - The id of the destination vertex.
+    :param k - The maximum number of hops between locations with food.
+    :param dead - A test `dead(v, r)` for states that can not reach `t`, see
+        `food_distance.FoodDistanceIndex.dead_ends`, which the forward search
+        skips.
+    :return the ids of the vertices of the walk, or None if `t` is unreachable.
+    """
+
+    if s == t:
+        return [s]
+
+    neighbours = graph.neighbours
+    has_food = graph.has_food
+
+    # As in `shortest_walk`, a state is skipped when an earlier one at the
+    # same vertex had as much stamina (forward) or needed as little (backward).
+    most = [-1] * graph.n
+    most[s] = k
+    least = [k + 1] * graph.n
+    least[t] = 0
+
+    # The states found at each vertex so far, as (stamina, depth) pairs.
+    ahead: Dict[int, List[Tuple[int, int]]] = {s: [(k, 0)]}
+    behind: Dict[int, List[Tuple[int, int]]] = {t: [(0, 0)]}
+    forward: Dict[State, State] = {}
+    backward: Dict[State, State] = {}
+    front = [(s, k)]
+    back = [(t, 0)]
+    front_depth = back_depth = 0
+
+    counters = active_counters()
+    expanded = peak = 0
+    best = None
+    meeting = None
+
+    # Every walk of length L is found once the two depths add up to L, so the
+    # search stops as soon as they reach the shortest walk found.
+    while front and back:
+        if best is not None and front_depth + back_depth >= best:
+            break
+        if counters is not None and len(front) + len(back) > peak:
+            peak = len(front) + len(back)
+
+        if len(front) <= len(back):
+            front_depth += 1
+            level = []
+            for state in front:
+                expanded += 1
+                v, r = state
+                if r == 0:
+                    continue
+                for w in neighbours(v):
+                    nr = k if has_food(w) else r - 1
+                    if most[w] >= nr:
+                        continue
+                    if dead is not None and dead(w, nr):
+                        continue
+                    most[w] = nr
+                    forward[(w, nr)] = state
+                    ahead.setdefault(w, []).append((nr, front_depth))
+                    level.append((w, nr))
+                    for need, depth in behind.get(w, ()):
+                        length = front_depth + depth
+                        if need <= nr and (best is None or length < best):
+                            best = length
+                            meeting = (w, nr, need)
+            front = level
+        else:
+            back_depth += 1
+            level = []
+            for state in back:
+                expanded += 1
+                v, need = state
+                before = 1 if has_food(v) else need + 1
+                if before > k:
+                    continue
+                for u in neighbours(v):
+                    if least[u] <= before:
+                        continue
+                    least[u] = before
+                    backward[(u, before)] = state
+                    behind.setdefault(u, []).append((before, back_depth))
+                    level.append((u, before))
+                    for r, depth in ahead.get(u, ()):
+                        length = back_depth + depth
+                        if before <= r and (best is None or length < best):
+                            best = length
+                            meeting = (u, r, before)
+            back = level
+
+    if counters is not None:
+        counters.add(expanded=expanded, frontier=peak)
+    if meeting is None:
+        return None
+
+    v, r, need = meeting
+    walk = _unwind(forward, (v, r))
+    state = (v, need)
+    while state in backward:
+        state = backward[state]
+        walk.append(state[0])
+    return walk
+
+
+def astar_walk(
+    graph,
+    s: int,
+    t: int,
+    k: int,
+    landmarks=None,
+    dead: DeadEnds = None
+) -> Union[List[int], None]:
+    """
+    Finds a shortest walk from `s` to `t`, like `shortest_walk`, with an A*
+    search guided by a lower bound on the hops left to `t`. States that can
+    not reach `t` at all are never expanded.
+
+    :param graph - The graph to search.
+    :param s - The id of the start vertex, assumed to have food.
+    :param t - The id of the destination vertex.
+    :param k - The maximum number of hops between locations with food.
+    :param landmarks - The `landmarks.Landmarks` of `graph` to take the lower
+        bound from. Without them the search is uninformed.
+    :param dead - A test `dead(v, r)` for states that can not reach `t`, see
+        `food_distance.FoodDistanceIndex.dead_ends`, which are skipped.
+    :return the ids of the vertices of the walk, or None if `t` is unreachable.
+    """
+
+    if s == t:
+        return [s]
+
+    bound = landmarks.bound_to(t) if landmarks is not None else _no_bound
+    h = bound(s)
+    if h is None:
+        return None
+
+    neighbours = graph.neighbours
+    has_food = graph.has_food
+
+    # The bound only depends on the vertex, so the states of a vertex are
+    # popped in order of distance and, as in `shortest_walk`, a state with
+    # no more stamina than one already popped there is dominated.
+    popped = [-1] * graph.n
+    steps: Dict[State, int] = {(s, k): 0}
+    parent: Dict[State, State] = {}
+    # Ties on the estimate go to the deepest state, which is closest to `t`.
+    heap = [(h, 0, s, k)]
+
+    counters = active_counters()
+    expanded = peak = 0
+    found = None
+
+    while heap:
+        if counters is not None and len(heap) > peak:
+            peak = len(heap)
+        _, g, v, r = heapq.heappop(heap)
+        g = -g
+        if popped[v] >= r or g > steps[(v, r)]:
+            continue
+        popped[v] = r
+        expanded += 1
+        if v == t:
+            found = (v, r)
+            break
+        if r == 0:
+            continue
+
+        g += 1
+        for w in neighbours(v):
+            nr = k if has_food(w) else r - 1
+            if popped[w] >= nr:
+                continue
+            state = (w, nr)
+            if steps.get(state, g + 1) <= g:
+                continue
+            if dead is not None and dead(w, nr):
+                continue
+            h = bound(w)
+            if h is None:
+                continue
+            steps[state] = g
+            parent[state] = (v, r)
+            heapq.heappush(heap, (g + h, -g, w, nr))
+
+    if counters is not None:
+        counters.add(expanded=expanded, frontier=peak)
+    if found is None:
+        return None
+    return _unwind(parent, found)
+
+
+# The shortest walk searches, by the name `QuokkaMaze.find_path` takes.
+WALKS = {
+    'bfs': shortest_walk,
+    'bidirectional': bidirectional_walk,
+    'astar': astar_walk,
+}
+
+
+def min_food_walk(
+    graph,
+    s: int,
+    t: int,
+    k: int,
+    budget: Union[int, None] = None,
+    dead: DeadEnds = None
+) -> Union[Tuple[List[int], List[int]], None]:
+    """
+    Finds a walk from `s` to `t` that needs the fewest extra food locations,
+    such that from any location with food we reach the next location with
+    food in at most `k` steps.
+
+    This is a 0-1 BFS over the stamina states: moving costs 0 and placing food
+    on the current vertex costs 1. Food is only placed once the stamina has run
+    out, which is optimal along any fixed walk (placing it later never hurts).
+
+    As with `shortest_walk`, the walk may revisit a vertex.
+
+    With a `budget`, the search gives up as soon as every remaining state
+    needs more than `budget` extra food, so small budgets are cheap to check.
+
+    :param graph - The graph to search.
+    :param s - The id of the start vertex, assumed to have food.
+    :param t - The id of the destination vertex.
+    :param k - The maximum number of hops between locations with food.
+    :param budget - The most extra food to place, or None for no limit.
+    :param dead - A test `dead(v, r)` for states that can not reach `t`, see
+        `food_distance.FoodDistanceIndex.dead_ends`. Such states are skipped
+        once the budget is used up, as placing food can not rescue them.
+    :return a tuple of the walk and the ids to place food on, or None if `t`
+        is unreachable (within the budget).
+    """
+
+    if s == t:
+        return [s], []
+    if k <= 0:
+        # Food on the current vertex does not let the colony move anywhere.
+        return None
+
+    neighbours = graph.neighbours
+    has_food = graph.has_food
+    if budget is None:
+        dead = None
+
+    # States are popped in order of cost, so once `(v, r)` is popped any later
+    # state of `v` with no more stamina is dominated and can be skipped.
+    popped = [-1] * graph.n
+    cost: Dict[State, int] = {(s, k): 0}
+    parent: Dict[State, State] = {}
+    queue = deque([(0, s, k)])
+
+    counters = active_counters()
+    expanded = peak = 0
+    found = None
+
+    while queue:
+        if counters is not None and len(queue) > peak:
+            peak = len(queue)
+        c, v, r = queue.popleft()
+        if c > cost[(v, r)] or popped[v] >= r:
+            continue
+        popped[v] = r
+        expanded += 1
+        if v == t:
+            found = (v, r)
+            break
+
+        if r == 0:
+            if budget is not None and c >= budget:
+                continue
+            state = (v, k)
+            if popped[v] < k and cost.get(state, c + 2) > c + 1:
+                cost[state] = c + 1
+                parent[state] = (v, r)
+                queue.append((c + 1, v, k))
+            continue
+
+        for w in neighbours(v):
+            nr = k if has_food(w) else r - 1
+            if popped[w] >= nr:
+                continue
+            if dead is not None and c >= budget and dead(w, nr):
+                continue
+            state = (w, nr)
+            if cost.get(state, c + 1) > c:
+                cost[state] = c
+                parent[state] = (v, r)
+                queue.appendleft((c, w, nr))
+
+    if counters is not None:
+        counters.add(expanded=expanded, frontier=peak)
+    if found is None:
+        return None
+    return _unwind_placements(parent, found)
+
+
+def min_food_walks(
+    graph,
+    s: int,
+    k: int,
+    targets: Union[Iterable[int], None] = None
+) -> WalkTree:
+    """
+    Finds the walks from `s` to many targets at once that need the fewest
+    extra food, with a single 0-1 BFS over the stamina states, as
+    `min_food_walk` does for one target. The search stops once every target
+    is reached, and the walks are unwound from the one parent table it builds.
+
+    :param graph - The graph to search.
+    :param s - The id of the start vertex, assumed to have food.
+    :param k - The maximum number of hops between locations with food.
+    :param targets - The ids of the destination vertices, or None for all.
+    :return the tree of the walks to the targets that are reachable, each
+        with the ids to place food on.
+    """
+
+    remaining = set(range(graph.n) if targets is None else targets)
+    reached: Dict[int, State] = {}
+    if s in remaining:
+        remaining.discard(s)
+        reached[s] = (s, k)
+    if k <= 0:
+        # Food on the current vertex does not let the colony move anywhere.
+        remaining.clear()
+
+    neighbours = graph.neighbours
+    has_food = graph.has_food
+
+    # As in `min_food_walk`, the first state of `v` popped is the cheapest.
+    popped = [-1] * graph.n
+    cost: Dict[State, int] = {(s, k): 0}
+    parent: Dict[State, State] = {}
+    queue = deque([(0, s, k)])
+
+    counters = active_counters()
+    expanded = peak = 0
+
+    while queue and remaining:
+        if counters is not None and len(queue) > peak:
+            peak = len(queue)
+        c, v, r = queue.popleft()
+        if c > cost[(v, r)] or popped[v] >= r:
+            continue
+        if popped[v] < 0 and v in remaining:
+            remaining.discard(v)
+            reached[v] = (v, r)
+        popped[v] = r
+        expanded += 1
+
+        if r == 0:
+            state = (v, k)
+            if popped[v] < k and cost.get(state, c + 2) > c + 1:
+                cost[state] = c + 1
+                parent[state] = (v, r)
+                queue.append((c + 1, v, k))
+            continue
+
+        for w in neighbours(v):
+            nr = k if has_food(w) else r - 1
+            if popped[w] >= nr:
+                continue
+            state = (w, nr)
+            if cost.get(state, c + 1) > c:
+                cost[state] = c
+                parent[state] = (v, r)
+                queue.appendleft((c, w, nr))
+
+    if counters is not None:
+        counters.add(expanded=expanded, frontier=peak)
+    return WalkTree(parent, reached, placements=True)
+
+
+def astar_min_food_walk(
+    graph,
+    s: int,
+    t: int,
+    k: int,
+    landmarks=None,
+    budget: Union[int, None] = None,
+    dead: DeadEnds = None
+) -> Union[Tuple[List[int], List[int]], None]:
+    """
+    Finds a walk from `s` to `t` that needs the fewest extra food locations,
+    like `min_food_walk`, with an A* search.
+
+    A state `(v, r)` needs at least one more placement when the stamina can
+    neither reach `t` nor the nearest food: `r` is below both the lower bound
+    on the hops to `t` and the hop distance to the nearest food. Counting
+    `ceil((d(v, t) - r) / k)` placements instead would overestimate whenever
+    there is food along the way, so only this one placement is counted. Ties
+    are broken by the steps taken plus the hops left, which keeps the search
+    heading for `t`.
+
+    :param graph - The graph to search.
+    :param s - The id of the start vertex, assumed to have food.
+    :param t - The id of the destination vertex.
+    :param k - The maximum number of hops between locations with food.
+    :param landmarks - The `landmarks.Landmarks` of `graph` to take the lower
+        bounds from. Without them the search is uninformed.
+    :param budget - The most extra food to place, or None for no limit.
+    :param dead - A test `dead(v, r)` for states that can not reach `t`, see
+        `food_distance.FoodDistanceIndex.dead_ends`. Such states are skipped
+        once the budget is used up, as placing food can not rescue them.
+    :return a tuple of the walk and the ids to place food on, or None if `t`
+        is unreachable (within the budget).
+    """
+
+    if s == t:
+        return [s], []
+    if k <= 0:
+        return None
+    if budget is None:
+        dead = None
+
+    if landmarks is None:
+        bound = _no_bound
+        food_distance = None
+    else:
+        bound = landmarks.bound_to(t)
+        food_distance = landmarks.food_distance
+
+    def estimate(v: int, r: int, h: int) -> int:
+        if r >= h or food_distance is None:
+            return 0
+        d = food_distance[v]
+        return 1 if d < 0 or r < d else 0
+
+    h = bound(s)
+    if h is None:
+        return None
+    limit = graph.n if budget is None else budget
+
+    neighbours = graph.neighbours
+    has_food = graph.has_food
+
+    # The estimate depends on the stamina, so states are not popped in order
+    # of placements as in `min_food_walk`. Instead each vertex keeps the
+    # (placements, stamina) of the states expanded there, and a state with
+    # no fewer placements and no more stamina than one of them is dominated.
+    settled: Dict[int, List[Tuple[int, int]]] = {}
+    cost: Dict[State, Tuple[int, int]] = {(s, k): (0, 0)}
+    parent: Dict[State, State] = {}
+    heap = [(estimate(s, k, h), h, 0, 0, s, k)]
+
+    def dominated(v: int, r: int, c: int) -> bool:
+        for pc, pr in settled.get(v, ()):
+            if pc <= c and pr >= r:
+                return True
+        return False
+
+    counters = active_counters()
+    expanded = peak = 0
+    found = None
+
+    while heap:
+        if counters is not None and len(heap) > peak:
+            peak = len(heap)
+        _, _, c, g, v, r = heapq.heappop(heap)
+        state = (v, r)
+        if (c, g) > cost[state] or dominated(v, r, c):
+            continue
+        settled.setdefault(v, []).append((c, r))
+        expanded += 1
+        if v == t:
+            found = state
+            break
+
+        if r == 0:
+            if c >= limit:
+                continue
+            moves = [(v, k, c + 1, g)]
+        else:
+            moves = [
+                (w, k if has_food(w) else r - 1, c, g + 1)
+                for w in neighbours(v)
+            ]
+
+        for w, nr, nc, ng in moves:
+            nstate = (w, nr)
+            if cost.get(nstate, (nc + 1,)) <= (nc, ng):
+                continue
+            if dominated(w, nr, nc):
+                continue
+            if dead is not None and nc >= limit and dead(w, nr):
+                continue
+            h = bound(w)
+            if h is None:
+                continue
+            f = nc + estimate(w, nr, h)
+            if f > limit:
+                continue
+            cost[nstate] = (nc, ng)
+            parent[nstate] = state
+            heapq.heappush(heap, (f, ng + h, nc, ng, w, nr))
+
+    if counters is not None:
+        counters.add(expanded=expanded, frontier=peak)
+    if found is None:
+        return None
+    return _unwind_placements(parent, found)
+
+
+# The fewest extra food searches, by the name
+# `QuokkaMaze.minimize_extra_food` takes.
+FOOD_WALKS = {
+    'bfs': min_food_walk,
+    'astar': astar_min_food_walk,
+}
+
+
+def iter_valid_paths(
+    graph,
+    s: int,
+    t: int,
+    k: int,
+    x: Union[int, None] = 0,
+    dead: DeadEnds = None
+) -> Iterator[List[int]]:
+    """
+    Lazily yields every SIMPLE path from `s` to `t` along which the colony
+    survives with food at most `k` steps apart, after placing food at no more
+    than `x` new locations.
+
+    The depth first search uses an explicit stack, so long corridors do not
+    hit the recursion limit, and it abandons a branch as soon as the stamina
+    and the food budget are both used up. Food is placed greedily, only once
+    the stamina has run out, which never needs more food than any other
+    placement along the same path (see `greedy_placements`).
+
+    :param graph - The graph to search.
+    :param s - The id of the start vertex, assumed to have food.
+    :param t - The id of the destination vertex.
+    :param k - The maximum number of hops between locations with food.
+    :param x - The most extra food to place, or None for no limit.
+    :param dead - A test `dead(v, r)` for states that can not reach `t`, see
+        `food_distance.FoodDistanceIndex.dead_ends`. Such branches are cut
+        once the food budget is used up.
+    :return an iterator over the paths, as lists of ids.
+    """
+
+    if s == t:
+        yield [s]
+        return
+    if k <= 0:
+        return
+
+    neighbours = graph.neighbours
+    has_food = graph.has_food
+    if x is None:
+        x = graph.n
+
+    path = [s]
+    on_path = {s}
+    # Each frame holds the stamina and food used on arrival at the vertex at
+    # the same depth of `path`, and the neighbours still to try from it.
+    stack = [(k, 0, iter(neighbours(s)))]
+
+    counters = active_counters()
+
+    while stack:
+        if counters is not None and len(stack) > counters.peak_frontier:
+            counters.peak_frontier = len(stack)
+        r, used, todo = stack[-1]
+        w = next(todo, None)
+        if w is None:
+            stack.pop()
+            on_path.discard(path.pop())
+            continue
+        if w in on_path:
+            continue
+
+        if r == 0:
+            if used == x:
+                # Out of stamina and out of food, nothing here survives.
+                stack.pop()
+                on_path.discard(path.pop())
+                continue
+            r, used = k, used + 1
+        nr = k if has_food(w) else r - 1
+        if dead is not None and used == x and dead(w, nr):
+            continue
+
+        if w == t:
+            if counters is not None:
+                counters.paths += 1
+            yield path + [w]
+            continue
+
+        if counters is not None:
+            counters.expanded += 1
+        path.append(w)
+        on_path.add(w)
+        stack.append((nr, used, iter(neighbours(w))))
+
+
+def shortcut(
+    graph,
+    walk: Sequence[int],
+    k: int,
+    budget: int = 0
+) -> Union[List[int], None]:
+    """
+    Cuts every loop out of a walk, and returns the simple path left if the
+    colony still survives along it with at most `budget` extra food.
+
+    Cutting a loop can remove the food the colony ate on it, so the path left
+    is checked again (see `greedy_placements`). It never survives when the
+    walk was a shortest one, but a walk with the fewest extra food often has
+    loops that cost nothing.
+
+    :param graph - The graph the walk is in.
+    :param walk - The ids of the walk.
+    :param k - The maximum number of hops between locations with food, > 0.
+    :param budget - The most extra food the path may need.
+    :return the ids of the simple path, or None if it does not survive.
+    """
+
+    last = {v: i for i, v in enumerate(walk)}
+    path = []
+    i = 0
+    while i < len(walk):
+        v = walk[i]
+        path.append(v)
+        # Skip to the last visit of `v`, which drops every loop through it.
+        i = last[v] + 1
+
+    if len(greedy_placements(graph, path, k)) > budget:
+        return None
+    counters = active_counters()
+    if counters is not None:
+        counters.add(shortcuts=1)
+    return path
+
+
+def best_simple_path(
+    graph,
+    s: int,
+    t: int,
+    k: int,
+    food: bool = False,
+    lower: int = 0,
+    upper: Union[int, None] = None,
+    guide: Sequence[int] = ()
+) -> Union[Tuple[int, List[int]], None]:
+    """
+    Finds the best SIMPLE path from `s` to `t` by branch and bound: the one
+    with the fewest hops along which the colony survives, or with `food` the
+    one needing the fewest extra food.
+
+    The bound is the cost of the best WALK on from each stamina state, which
+    one backward search over the states finds (see `_walk_costs_to`). The
+    depth first search tries the cheapest neighbours first, and cuts a branch
+    once even a walk from it would cost too much. What is too much starts at
+    the `lower` bound and goes up one at a time (iterative deepening), so the
+    first path found is the best one. Among equally cheap neighbours, the one
+    the walk goes on to is tried first, so the search starts out along the
+    walk and only strays from it where the walk doubles back.
+
+    With `food`, the cost alone does not bound the length of a branch, as
+    large areas need no food at all. So within each bound on the food, the
+    length is deepened too, from the hops of the shortest walk placing no
+    more food than the bound allows (see `_walk_hops_to`), and a branch is
+    cut once even such a walk from it would be too long.
+
+    :param graph - The graph to search.
+    :param s - The id of the start vertex, assumed to have food.
+    :param t - The id of the destination vertex.
+    :param k - The maximum number of hops between locations with food.
+    :param food - Whether to minimise the extra food rather than the hops.
+    :param lower - The cost the deepening starts from. When it is a lower
+        bound (such as the cost of the best walk) the path found is the best,
+        otherwise it is any path costing no more than `lower`.
+    :param upper - Only paths costing less than `upper` are looked for, or
+        None for no limit.
+    :param guide - The ids of the best walk, if known.
+    :return a tuple of the cost and the ids of the path, or None if no path
+        costs less than `upper`.
+    """
+
+    counters = active_counters()
+    if counters is not None:
+        counters.add(fallbacks=1)
+
+    if s == t:
+        return 0, [s]
+    if k <= 0:
+        return None
+
+    neighbours = graph.neighbours
+    has_food = graph.has_food
+    width = k + 1
+    # togo[v * width + r] is the cost of the best walk from `(v, r)` to `t`.
+    togo = _walk_costs_to(graph, t, k, food)
+    if togo[s * width + k] < 0:
+        return None
+    # Where the walk goes on to from each vertex, after its last visit.
+    follow = dict(zip(guide, guide[1:]))
+
+    # With `food`, a branch is also cut once it is too long, as many paths
+    # cost little or no food: layers[b] holds the hops of the shortest walk
+    # from each stamina state to `t` placing at most `b` extra food.
+    layers: List[List[int]] = []
+
+    def order(v: int, r: int, hop: Union[List[int], None]) -> List[Move]:
+        # The moves from `(v, r)` that can still reach `t`, cheapest first, as
+        # (cost to go, off the walk, hops to go, neighbour, stamina on
+        # arrival), given the hops to go for the food left to place.
+        ahead = follow.get(v)
+        moves = []
+        for w in neighbours(v):
+            nr = k if has_food(w) else r - 1
+            c = togo[w * width + nr]
+            if c >= 0:
+                h = 0 if hop is None else hop[w * width + nr]
+                moves.append((c, w != ahead, h, w, nr))
+        moves.sort()
+        return moves
+
+    expanded = peak = paths = 0
+
+    def search(bound: int, reach: int) -> Tuple[Found, int]:
+        # Finds a path costing less than `bound` (and with `food`, of at most
+        # `reach` hops), and the fewest hops that a branch cut for its length
+        # would have needed, or -1 if none was.
+        nonlocal expanded, peak, paths
+
+        def hop(used: int) -> Union[List[int], None]:
+            return layers[bound - 1 - used] if food else None
+
+        path = [s]
+        on_path = {s}
+        beyond = -1
+        # Each frame holds the food used on arrival at the vertex at the same
+        # depth of `path`, and the moves still to try from it. Food is placed
+        # greedily, once the stamina runs out, as in `iter_valid_paths`.
+        stack = [(0, iter(order(s, k, hop(0))))]
+
+        while stack:
+            if len(stack) > peak:
+                peak = len(stack)
+            used, todo = stack[-1]
+            move = next(todo, None)
+            if move is None:
+                stack.pop()
+                on_path.discard(path.pop())
+                continue
+            c, _, h, w, nr = move
+            if w in on_path:
+                continue
+            cost = used + c if food else len(path) + c
+            if cost >= bound:
+                # The moves are sorted, so none of the rest is cheap enough.
+                stack.pop()
+                on_path.discard(path.pop())
+                continue
+            if len(path) + h > reach:
+                if beyond < 0 or len(path) + h < beyond:
+                    beyond = len(path) + h
+                continue
+
+            if w == t:
+                paths += 1
+                return (cost, path + [w]), -1
+
+            expanded += 1
+            path.append(w)
+            on_path.add(w)
+            if nr == 0:
+                # Only a walk placing food here goes on from `(w, 0)`.
+                used, nr = used + 1, k
+            stack.append((used, iter(order(w, nr, hop(used)))))
+        return None, beyond
+
+    # Deepen the bound one step at a time, so the first path found is the
+    # cheapest, and no branch wanders further than the bound allows. With
+    # `food`, the length is deepened in turn within each bound, to the next
+    # length a cut branch needed, so the path found is also the shortest of
+    # the cheapest.
+    lower = max(lower, togo[s * width + k])
+    limit = graph.n if upper is None else upper
+    found = None
+
+    for bound in range(lower + 1, limit + 1):
+        reach = graph.n
+        if food:
+            while len(layers) < bound:
+                layers.append(_walk_hops_to(
+                    graph, t, k, layers[-1] if layers else None
+                ))
+            reach = layers[bound - 1][s * width + k]
+        while found is None and reach >= 0:
+            found, reach = search(bound, reach)
+        if found is not None:
+            break
+
+    if counters is not None:
+        counters.add(expanded=expanded, paths=paths, frontier=peak)
+    return found
+
+
+def _walk_costs_to(graph, t: int, k: int, food: bool) -> List[int]:
+    """
+    Finds the cost of the best walk from every stamina state to `t`, in hops
+    or with `food` in extra food, with a breadth first (or 0-1) search
+    backwards over the states.
+
+    :return the cost from `(v, r)` at index `v * (k + 1) + r`, or -1 where
+        `t` can not be reached.
+    """
+
+    neighbours = graph.neighbours
+    has_food = graph.has_food
+    width = k + 1
+    cost = [-1] * (graph.n * width)
+    queue = deque()
+    for r in range(width):
+        cost[t * width + r] = 0
+        queue.append(t * width + r)
+
+    while queue:
+        i = queue.popleft()
+        w, nr = divmod(i, width)
+        c = cost[i]
+        if food and nr == k and not 0 <= cost[i - k] <= c + 1:
+            # Standing on `w` out of stamina, placing food costs one more.
+            cost[i - k] = c + 1
+            queue.append(i - k)
+        step = c if food else c + 1
+        if has_food(w):
+            if nr != k:
+                continue
+            stamina = range(1, width)
+        elif nr < k:
+            stamina = (nr + 1,)
+        else:
+            continue
+        for v in neighbours(w):
+            for r in stamina:
+                j = v * width + r
+                if not 0 <= cost[j] <= step:
+                    cost[j] = step
+                    if food:
+                        queue.appendleft(j)
+                    else:
+                        queue.append(j)
+    return cost
+
+
+def _walk_hops_to(
+    graph,
+    t: int,
+    k: int,
+    fewer: Union[List[int], None]
+) -> List[int]:
+    """
+    Finds the hops of the shortest walk from every stamina state to `t` that
+    places at most `b` extra food, with a breadth first search backwards over
+    the states.
+
+    A walk out of stamina on `v` places food there and goes on from `(v, k)`
+    with one fewer to place, so `(v, 0)` starts out at the hops from `(v, k)`
+    for `b - 1`, and these starts are merged into the search in order.
+
+    :param fewer - The result for `b - 1`, or None for `b` = 0.
+    :return the hops from `(v, r)` at index `v * (k + 1) + r`, or -1 where
+        `t` can not be reached.
+    """
+
+    neighbours = graph.neighbours
+    has_food = graph.has_food
+    width = k + 1
+    hops = [-1] * (graph.n * width)
+    starts = [(0, t * width + r) for r in range(width)]
+    if fewer is not None:
+        starts.extend(
+            (fewer[i + k], i)
+            for i in range(0, len(fewer), width)
+            if fewer[i + k] >= 0
+        )
+        starts.sort()
+
+    queue = deque()
+    at = 0
+    while at < len(starts) or queue:
+        if at < len(starts) and (
+            not queue or starts[at][0] <= hops[queue[0]]
+        ):
+            h, i = starts[at]
+            at += 1
+            if hops[i] >= 0:
+                continue
+            hops[i] = h
+        else:
+            i = queue.popleft()
+        w, nr = divmod(i, width)
+        if has_food(w):
+            if nr != k:
+                continue
+            stamina = range(1, width)
+        elif nr < k:
+            stamina = (nr + 1,)
+        else:
+            continue
+        h = hops[i] + 1
+        for v in neighbours(w):
+            for r in stamina:
+                j = v * width + r
+                if hops[j] < 0:
+                    hops[j] = h
+                    queue.append(j)
+    return hops
+
+
+def greedy_placements(graph, path: Sequence[int], k: int) -> List[int]:
+    """
+    Places food along a path only where the stamina runs out, which needs the
+    fewest extra food of any placement along that path.
+
+    :param graph - The graph the path is in.
+    :param path - The ids of the path.
+    :param k - The maximum number of hops between locations with food, > 0.
+    :return the ids of the vertices to place food on.
+    """
+
+    placed = []
+    r = k
+    for v, w in zip(path, path[1:]):
+        if r == 0:
+            placed.append(v)
+            r = k
+        r = k if graph.has_food(w) else r - 1
+    return placed
+
+
+def is_simple(path: Sequence) -> bool:
+    """
+    Checks whether a walk never visits the same vertex twice.
+
+    :param path - The walk to check.
+    :return true if every vertex appears at most once, else false.
+    """
+
+    return len(set(path)) == len(path)
+
+
+def _no_bound(v: int) -> int:
+    """
+    The lower bound of an uninformed search.
+    """
+
+    return 0
+
+
+def _unwind_placements(
+    parent: Dict[State, State],
+    state: State
+) -> Tuple[List[int], List[int]]:
+    """
+    Follows the parent pointers of a 0-1 BFS back to the start, and returns the
+    walk along with the vertices where food was placed. A placement is the step
+    that stays on the same vertex.
+    """
+
+    walk = [state[0]]
+    placed = []
+    while state in parent:
+        prev = parent[state]
+        if prev[0] == state[0]:
+            placed.append(state[0])
+        else:
+            walk.append(prev[0])
+        state = prev
+    walk.reverse()
+    placed.reverse()
+    return walk, placed
+
+
+def _unwind(parent: Dict[State, State], state: State) -> List[int]:
+    """
+    Follows the parent pointers back to the start and returns the walk.
+    """
+
+    walk = [state[0]]
+    while state in parent:
+        state = parent[state]
+        walk.append(state[0])
+    walk.reverse()
+    return walk
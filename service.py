@@ -0,0 +1,567 @@
+"""
+Service
+=======
+
+An asyncio query service around a quokka maze, speaking JSON lines over a
+unix socket or stdin/stdout:
+
+    python -m service --snapshot maze.qmaz --socket /tmp/quokka.sock
+
+Each request is one JSON object per line, with vertices referred to by their
+integer id in the maze (see `QuokkaMaze.vertex_id`):
+
+    {"id": 1, "op": "find_path", "s": 0, "t": 7, "k": 3}
+    {"id": 2, "op": "block_edge", "u": 3, "v": 4}
+
+and each response is one JSON object per line, carrying the same `id`. Paths
+and food locations come back as lists of ids:
+
+    {"id": 1, "ok": true, "result": [0, 2, 5, 7]}
+    {"id": 2, "ok": false, "error": "timeout", "message": "..."}
+
+Requests are answered concurrently and responses are written as soon as they
+are ready, so they may be out of order, and a query sent before an edit may
+already see it. Wait for the response to an edit before sending queries that
+must (or must not) see it.
+
+Queries run on a pool of worker threads, in batches: whatever arrives within
+`batch_delay` seconds (up to `batch_size` queries) is answered by one worker
+job, on the version of the maze pinned when the job starts (see
+`QuokkaMaze.pin`). So `fix_edge` and `block_edge` never wait for a running
+batch, only for batches that are pinning the maze (a readers-writer lock,
+which lets a waiting writer go first so edits are not starved).
+
+Queries wait in a bounded queue. Once it is full, and each connection has
+`max_pending` requests in flight, the service stops reading from the
+connection until there is room again. A query that takes longer than its
+`timeout` gets a "timeout" error; its worker still finishes the batch, as
+threads can not be interrupted, but queries that have not started yet are
+skipped. Meanwhile the other workers go on answering, and edits go ahead.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Tuple, Union
+
+from graph import QuokkaMaze
+from vertex import Vertex
+
+
+# The queries, and the request fields each takes, in order.
+QUERIES: Dict[str, Tuple[str, ...]] = {
+    'find_path': ('s', 't', 'k', 'strategy?'),
+    'can_reach': ('s', 't', 'k'),
+    'exists_path_with_extra_food': ('s', 't', 'k', 'x'),
+    'find_location_of_extra_food': ('s', 't', 'k', 'x'),
+    'minimize_extra_food': ('s', 't', 'k', 'strategy?'),
+    'min_extra_food': ('s', 't', 'k'),
+}
+
+# The edits, which need the maze to themselves.
+EDITS: Dict[str, Tuple[str, ...]] = {
+    'fix_edge': ('u', 'v'),
+    'block_edge': ('u', 'v'),
+}
+
+_VERTEX_FIELDS = ('s', 't', 'u', 'v')
+
+
+class BadRequest(Exception):
+    """
+    Raised for a request that is not valid JSON or not a known operation.
+    """
+
+
+class ReadWriteLock:
+    """
+    Read Write Lock
+    ---------------
+
+    An asyncio lock held by any number of readers, or by one writer.
+
+    A writer waiting for the lock blocks new readers, so a steady stream of
+    queries can not hold off an edit forever.
+
+    Functions:
+        * read() - an async context manager holding the lock for reading.
+        * write() - an async context manager holding the lock for writing.
+    """
+
+    def __init__(self) -> None:
+        self._readers = 0
+        self._writing = False
+        self._waiting_writers = 0
+        self._changed = asyncio.Condition()
+
+    @contextlib.asynccontextmanager
+    async def read(self):
+        async with self._changed:
+            await self._changed.wait_for(
+                lambda: not self._writing and not self._waiting_writers
+            )
+            self._readers += 1
+        try:
+            yield
+        finally:
+            async with self._changed:
+                self._readers -= 1
+                self._changed.notify_all()
+
+    @contextlib.asynccontextmanager
+    async def write(self):
+        async with self._changed:
+            self._waiting_writers += 1
+            try:
+                await self._changed.wait_for(
+                    lambda: not self._writing and not self._readers
+                )
+            finally:
+                self._waiting_writers -= 1
+            self._writing = True
+        try:
+            yield
+        finally:
+            async with self._changed:
+                self._writing = False
+                self._changed.notify_all()
+
+
+class QueryService:
+    """
+    Query Service
+    -------------
+
+    Answers JSON requests against one maze, see the module docs.
+
+    Functions:
+        * handle(request) - answers one decoded request.
+        * serve(reader, writer) - answers the requests of one connection.
+        * close() - stops the batcher and the worker pool.
+    """
+
+    def __init__(
+        self,
+        maze: QuokkaMaze,
+        workers: int = 4,
+        batch_size: int = 32,
+        batch_delay: float = 0.001,
+        max_pending: int = 1024,
+        timeout: Union[float, None] = 10.0
+    ) -> None:
+        """
+        Initialises the service. It starts on the first request.
+
+        :param maze - The maze to answer queries on.
+        :param workers - The number of worker threads.
+        :param batch_size - The most queries answered by one worker job.
+        :param batch_delay - How long (in seconds) to wait for more queries
+            to fill a batch.
+        :param max_pending - The most queries waiting for a worker, and the
+            most requests in flight on one connection.
+        :param timeout - The default seconds a request may take, or None for
+            no limit. A request can ask for less with its own "timeout".
+        """
+        self.maze = maze
+        self.workers = workers
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.max_pending = max_pending
+        self.timeout = timeout
+
+        self._lock: Union[ReadWriteLock, None] = None
+        self._queue: Union[asyncio.Queue, None] = None
+        self._executor: Union[ThreadPoolExecutor, None] = None
+        self._slots: Union[asyncio.Semaphore, None] = None
+        self._batcher: Union[asyncio.Task, None] = None
+        self._batches = set()
+
+    def _start(self) -> None:
+        """
+        Creates the queue, lock and workers on the running event loop.
+        """
+        if self._batcher is not None:
+            return
+        self._lock = ReadWriteLock()
+        self._queue = asyncio.Queue(self.max_pending)
+        self._executor = ThreadPoolExecutor(
+            self.workers,
+            thread_name_prefix='quokka'
+        )
+        self._slots = asyncio.Semaphore(self.workers)
+        self._batcher = asyncio.get_running_loop().create_task(
+            self._batch_queries()
+        )
+
+    async def close(self) -> None:
+        """
+        Stops the batcher and waits for the running batches and workers.
+        """
+        if self._batcher is None:
+            return
+        self._batcher.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._batcher
+        if self._batches:
+            await asyncio.gather(*self._batches, return_exceptions=True)
+        self._executor.shutdown(wait=True)
+        self._batcher = None
+
+    async def handle(self, request: Any) -> Dict:
+        """
+        Answers one decoded request.
+
+        :param request - The request, see the module docs.
+        :return the response.
+        """
+        self._start()
+        rid = request.get('id') if isinstance(request, dict) else None
+        try:
+            op, args, timeout = self._parse(request)
+            if op in EDITS:
+                result = await asyncio.wait_for(self._edit(op, args), timeout)
+            else:
+                result = await asyncio.wait_for(self._query(op, args), timeout)
+        except BadRequest as e:
+            return _failure(rid, 'bad_request', str(e))
+        except asyncio.TimeoutError:
+            return _failure(rid, 'timeout', f"no answer within {timeout}s")
+        except Exception as e:
+            return _failure(rid, 'error', f"{type(e).__name__}: {e}")
+        return {'id': rid, 'ok': True, 'result': self._encode(result)}
+
+    async def serve(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter
+    ) -> None:
+        """
+        Answers the JSON lines of one connection until it closes.
+
+        :param reader - Where the requests come from.
+        :param writer - Where the responses go.
+        """
+        in_flight = asyncio.Semaphore(self.max_pending)
+        tasks = set()
+
+        async def respond(line: bytes) -> None:
+            try:
+                try:
+                    request = json.loads(line)
+                except ValueError as e:
+                    response = _failure(None, 'bad_request', f"bad JSON: {e}")
+                else:
+                    response = await self.handle(request)
+                writer.write(json.dumps(response).encode() + b'\n')
+                await writer.drain()
+            finally:
+                in_flight.release()
+
+        try:
+            while True:
+                # Stop reading while the connection has too much in flight.
+                await in_flight.acquire()
+                line = await reader.readline()
+                if not line:
+                    in_flight.release()
+                    break
+                if not line.strip():
+                    in_flight.release()
+                    continue
+                task = asyncio.get_running_loop().create_task(respond(line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            writer.close()
+            with contextlib.suppress(Exception):
+                await writer.wait_closed()
+
+    def _parse(self, request: Any) -> Tuple[str, List, Union[float, None]]:
+        """
+        Checks a request, and resolves its vertex ids.
+
+        :return a tuple of the operation, its arguments and the timeout.
+        :raises BadRequest if the request is not valid.
+        """
+        if not isinstance(request, dict):
+            raise BadRequest("a request must be a JSON object")
+        op = request.get('op')
+        fields = QUERIES.get(op) or EDITS.get(op)
+        if fields is None:
+            raise BadRequest(f"unknown op {op!r}")
+
+        args = []
+        for field in fields:
+            optional = field.endswith('?')
+            field = field.rstrip('?')
+            if field not in request:
+                if optional:
+                    break
+                raise BadRequest(f"{op} needs {field!r}")
+            value = request[field]
+            if field == 'strategy':
+                if not isinstance(value, str):
+                    raise BadRequest("strategy must be a string")
+            elif isinstance(value, bool) or not isinstance(value, int):
+                raise BadRequest(f"{field!r} must be an integer")
+            elif field in _VERTEX_FIELDS:
+                if not 0 <= value < len(self.maze.vertices):
+                    raise BadRequest(f"no vertex with id {value}")
+                value = self.maze.vertices[value]
+            args.append(value)
+
+        timeout = request.get('timeout', self.timeout)
+        if timeout is not None:
+            if isinstance(timeout, bool) or \
+                    not isinstance(timeout, (int, float)) or timeout < 0:
+                raise BadRequest("timeout must be a non-negative number")
+            if self.timeout is not None:
+                timeout = min(timeout, self.timeout)
+        return op, args, timeout
+
+    async def _edit(self, op: str, args: List) -> Any:
+        """
+        Runs an edit once no query batch is pinning the maze.
+        """
+        async with self._lock.write():
+            return getattr(self.maze, op)(*args)
+
+    async def _query(self, op: str, args: List) -> Any:
+        """
+        Queues a query for the batcher and waits for its answer. Waiting for
+        room in the queue is what pushes back on the connections.
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((op, args, future))
+        return await future
+
+    async def _batch_queries(self) -> None:
+        """
+        Takes the queued queries in batches and hands each batch to a worker.
+        """
+        loop = asyncio.get_running_loop()
+        queue = self._queue
+        while True:
+            # Only take queries off the queue when a worker is free, so a
+            # full queue pushes back on the connections.
+            await self._slots.acquire()
+            batch = [await queue.get()]
+            deadline = loop.time() + self.batch_delay
+            while len(batch) < self.batch_size:
+                if queue.empty():
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(
+                            await asyncio.wait_for(queue.get(), remaining)
+                        )
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    batch.append(queue.get_nowait())
+
+            task = loop.create_task(self._run_batch(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _run_batch(self, batch: List) -> None:
+        """
+        Answers a batch of queries on a worker, on the version of the maze
+        pinned under the lock for reading.
+        """
+        try:
+            batch = [item for item in batch if not item[2].done()]
+            if not batch:
+                return
+            # The lock is only held to pin the maze, as a query that times
+            # out goes on running on its worker, and must not hold up edits.
+            async with self._lock.read():
+                maze = self.maze.pin()
+            loop = asyncio.get_running_loop()
+            results = await loop.run_in_executor(
+                self._executor,
+                _answer_batch,
+                maze,
+                batch
+            )
+            for (_, _, future), (ok, value) in zip(batch, results):
+                if future.done():
+                    continue
+                if ok:
+                    future.set_result(value)
+                else:
+                    future.set_exception(value)
+        except BaseException as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            raise
+        finally:
+            self._slots.release()
+
+    def _encode(self, result: Any) -> Any:
+        """
+        Replaces the vertices in a result by their ids.
+        """
+        if isinstance(result, Vertex):
+            return self.maze.vertex_id(result)
+        if isinstance(result, (list, tuple)):
+            return [self._encode(r) for r in result]
+        return result
+
+
+def _answer_batch(
+    maze: QuokkaMaze,
+    batch: List[Tuple[str, List, asyncio.Future]]
+) -> List[Tuple[bool, Any]]:
+    """
+    Answers a batch of queries on a worker thread, skipping the ones that
+    timed out while waiting.
+    """
+    results = []
+    for op, args, future in batch:
+        if future.done():
+            results.append((False, asyncio.CancelledError()))
+            continue
+        try:
+            results.append((True, getattr(maze, op)(*args)))
+        except Exception as e:
+            results.append((False, e))
+    return results
+
+
+def _failure(rid: Any, error: str, message: str) -> Dict:
+    """
+    Builds an error response.
+    """
+    return {'id': rid, 'ok': False, 'error': error, 'message': message}
+
+
+async def serve_unix(service: QueryService, path: str) -> None:
+    """
+    Serves requests on a unix socket until cancelled.
+
+    :param service - The service to answer with.
+    :param path - The path of the socket.
+    """
+    server = await asyncio.start_unix_server(service.serve, path)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+
+async def serve_stdio(service: QueryService) -> None:
+    """
+    Serves requests from stdin, answering on stdout, until stdin closes.
+    Stdin must be a pipe or terminal; stdout may also be a regular file.
+
+    :param service - The service to answer with.
+    """
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    await loop.connect_read_pipe(
+        lambda: asyncio.StreamReaderProtocol(reader),
+        sys.stdin
+    )
+    try:
+        transport, protocol = await loop.connect_write_pipe(
+            asyncio.streams.FlowControlMixin,
+            sys.stdout
+        )
+    except ValueError:
+        # Regular files can not be watched by the event loop, but writing to
+        # them does not block for long either.
+        writer = _FileWriter(sys.stdout.buffer)
+    else:
+        writer = asyncio.StreamWriter(transport, protocol, reader, loop)
+    try:
+        await service.serve(reader, writer)
+    finally:
+        await service.close()
+
+
+class _FileWriter:
+    """
+    The parts of `asyncio.StreamWriter` that `QueryService.serve` uses, over
+    a plain binary file.
+    """
+
+    def __init__(self, f) -> None:
+        self._file = f
+
+    def write(self, data: bytes) -> None:
+        self._file.write(data)
+
+    async def drain(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.flush()
+
+    async def wait_closed(self) -> None:
+        pass
+
+
+def _load(args: argparse.Namespace) -> QuokkaMaze:
+    """
+    Loads the maze named on the command line.
+    """
+    if args.snapshot:
+        return QuokkaMaze.load(args.snapshot)
+    food = []
+    if args.food:
+        with open(args.food) as f:
+            food = [int(line) for line in f if line.strip()]
+    return QuokkaMaze.from_edges(args.edges, food)
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Serve QuokkaMaze queries as JSON lines."
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--snapshot', help="a maze saved with save()")
+    source.add_argument('--edges', help="an edge list file")
+    parser.add_argument('--food', help="a file of food ids, one per line, "
+                                       "for --edges")
+    where = parser.add_mutually_exclusive_group(required=True)
+    where.add_argument('--socket', help="the unix socket to listen on")
+    where.add_argument('--stdio', action='store_true',
+                       help="answer stdin on stdout")
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--batch-delay', type=float, default=0.001,
+                        help="seconds to wait to fill a batch")
+    parser.add_argument('--max-pending', type=int, default=1024)
+    parser.add_argument('--timeout', type=float, default=10.0,
+                        help="seconds per request, 0 for no limit")
+    args = parser.parse_args(argv)
+
+    service = QueryService(
+        _load(args),
+        workers=args.workers,
+        batch_size=args.batch_size,
+        batch_delay=args.batch_delay,
+        max_pending=args.max_pending,
+        timeout=args.timeout or None
+    )
+    try:
+        if args.stdio:
+            asyncio.run(serve_stdio(service))
+        else:
+            asyncio.run(serve_unix(service, args.socket))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,350 @@
+"""
+Snapshot
+========
+
+Immutable, versioned views of a quokka maze.
+
+A snapshot is a frozen CSR graph (see `csr.CSRGraph`) plus the rows that have
+changed since it was built. The changed rows are kept in a persistent trie,
+indexed by vertex id with 32 children per node: changing a row copies only
+the nodes on the path to it, O(log n) of them, and every other node is shared
+with the snapshot it was derived from. So a new snapshot costs O(changed rows),
+never a copy of the whole maze.
+
+As nothing in a snapshot is ever changed after it is built, any number of
+threads can search a snapshot while the maze moves on to newer versions,
+without taking a lock. Once a lot of rows have changed, the snapshot is
+compacted into a fresh CSR graph to keep lookups fast.
+
+A maze publishes its current version as a `SnapshotLog`: the last snapshot
+that was built and the edits made since, as ids. An edit publishes a new log
+in O(1), and the next snapshot is only built when it is first read, from the
+snapshot and the edits alone, never from the live vertices. So a reader sees
+either all of an edit or none of it.
+"""
+
+import threading
+from typing import Dict, Iterable, List, Sequence, Tuple, Union
+
+from csr import CSRGraph
+from vertex import Vertex
+
+
+# A changed row: whether the vertex has food, and the ids of its neighbours.
+Row = Tuple[bool, Tuple[int, ...]]
+
+# A snapshot is compacted into a fresh CSR graph once more than this many rows
+# (or an eighth of the rows, if more) have changed since it was built, or more
+# than half of the rows if that is fewer, as when a maze is first built up.
+_COMPACT_AFTER = 1024
+
+# The kinds of edit in a log: an edge joined, an edge cut, and rows replaced.
+_JOIN = 0
+_CUT = 1
+_ROWS = 2
+
+_BITS = 5
+_WIDTH = 1 << _BITS
+_MASK = _WIDTH - 1
+
+
+class MazeSnapshot:
+    """
+    Maze Snapshot
+    -------------
+
+    One version of a maze, providing the graph interface the searches use
+    (see `search`).
+
+    Attributes:
+        * self.base (CSRGraph) - the frozen graph the snapshot starts from.
+        * self.n (int) - the number of vertices.
+        * self.version (int) - the version of the maze.
+        * self.vertices (Sequence[Vertex]) - maps ids back to vertices.
+        * self.changed (int) - the number of rows that differ from `base`.
+
+    Functions:
+        * neighbours(i) - the ids of the neighbours of vertex `i`.
+        * has_food(i) - whether vertex `i` has food.
+        * to_vertices(ids) - translates ids back into vertices.
+        * with_rows(rows, n, version) - a new snapshot with rows replaced.
+    """
+
+    __slots__ = ('base', 'n', 'version', 'vertices', 'changed',
+                 'neighbours', 'has_food', '_root', '_shift')
+
+    def __init__(
+        self,
+        base: CSRGraph,
+        vertices: Sequence[Vertex],
+        version: int,
+        n: Union[int, None] = None,
+        root: Union[tuple, None] = None,
+        shift: int = 0,
+        changed: int = 0
+    ) -> None:
+        """
+        Wraps a frozen graph, and the trie of rows changed since.
+
+        :param base - The frozen graph.
+        :param vertices - Maps ids back to vertices, at least `n` of them.
+        :param version - The version of the maze.
+        :param n - The number of vertices, if more than `base` has.
+        :param root - The root of the trie of changed rows.
+        :param shift - The bit shift of the root level of the trie.
+        :param changed - The number of rows in the trie.
+        """
+        self.base = base
+        self.n = base.n if n is None else n
+        self.version = version
+        self.vertices = vertices
+        self.changed = changed
+        self._root = root
+        self._shift = shift
+
+        if root is None:
+            # Nothing changed, so the lookups go straight to the base graph.
+            self.neighbours = base.neighbours
+            self.has_food = base.has_food
+            return
+
+        base_neighbours = base.neighbours
+        base_has_food = base.has_food
+
+        def neighbours(i: int) -> Sequence[int]:
+            row = _lookup(root, shift, i)
+            if row is None:
+                return base_neighbours(i)
+            return row[1]
+
+        def has_food(i: int) -> bool:
+            row = _lookup(root, shift, i)
+            if row is None:
+                return base_has_food(i)
+            return row[0]
+
+        self.neighbours = neighbours
+        self.has_food = has_food
+
+    def with_rows(
+        self,
+        rows: Dict[int, Row],
+        n: int,
+        version: int
+    ) -> 'MazeSnapshot':
+        """
+        Returns a new snapshot with some rows replaced, sharing everything
+        else with this one. This snapshot is left as it was.
+
+        :param rows - The new rows, by vertex id.
+        :param n - The number of vertices of the new snapshot, at least `n`.
+        :param version - The version of the new snapshot.
+        :return the new snapshot.
+        """
+        root = self._root
+        shift = self._shift
+        changed = self.changed
+        for i, row in rows.items():
+            while i >> shift >= _WIDTH:
+                # Grow the trie by a level to make room for id `i`.
+                root = (root,) + (None,) * (_WIDTH - 1)
+                shift += _BITS
+            if _lookup(root, shift, i) is None:
+                changed += 1
+            root = _assoc(root, shift, i, row)
+        return MazeSnapshot(
+            self.base,
+            self.vertices,
+            version,
+            n,
+            root,
+            shift,
+            changed
+        )
+
+    def to_vertices(self, ids: Iterable[int]) -> List[Vertex]:
+        """
+        Translates a sequence of ids back into vertices.
+        """
+        vertices = self.vertices
+        return [vertices[i] for i in ids]
+
+
+class SnapshotLog:
+    """
+    Snapshot Log
+    ------------
+
+    One published version of a maze: the last snapshot that was built, and
+    the edits made since. A log is never changed once published, an edit
+    publishes a new one, so the version and the edits are always read
+    together.
+
+    Attributes:
+        * self.version (int) - the version of the maze.
+        * self.n (int) - the number of vertices.
+
+    Functions:
+        * snapshot() - the snapshot of this version, built on first use.
+        * join(i, j) - a new log with the edge between `i` and `j` joined.
+        * cut(i, j) - a new log with the edge between `i` and `j` cut.
+        * with_rows(rows, n) - a new log with some rows replaced.
+    """
+
+    __slots__ = ('version', 'n', '_base', '_edits', '_built', '_lock')
+
+    def __init__(
+        self,
+        base: MazeSnapshot,
+        edits: Union[tuple, None] = None,
+        n: Union[int, None] = None,
+        version: Union[int, None] = None
+    ) -> None:
+        """
+        Starts a log from a snapshot.
+
+        :param base - The last snapshot that was built.
+        :param edits - The edits made since, newest first, as nested
+            `(edit, older)` pairs.
+        :param n - The number of vertices after the edits.
+        :param version - The version after the edits.
+        """
+        self.version = base.version if version is None else version
+        self.n = base.n if n is None else n
+        self._base = base
+        self._edits = edits
+        self._built = base if edits is None else None
+        self._lock = threading.Lock()
+
+    def snapshot(self) -> MazeSnapshot:
+        """
+        Returns the snapshot of this version, applying the edits to the base
+        snapshot the first time it is asked for.
+        """
+        built = self._built
+        if built is None:
+            with self._lock:
+                built = self._built
+                if built is None:
+                    built = self._built = _apply(
+                        self._base, self._edits, self.n, self.version
+                    )
+        return built
+
+    def join(self, i: int, j: int) -> 'SnapshotLog':
+        """
+        Returns the log of the next version, with `i` and `j` joined.
+        """
+        return self._then((_JOIN, i, j), self.n)
+
+    def cut(self, i: int, j: int) -> 'SnapshotLog':
+        """
+        Returns the log of the next version, with `i` and `j` apart.
+        """
+        return self._then((_CUT, i, j), self.n)
+
+    def with_rows(self, rows: Dict[int, Row], n: int) -> 'SnapshotLog':
+        """
+        Returns the log of the next version, with some rows replaced and `n`
+        vertices.
+        """
+        return self._then((_ROWS, rows), n)
+
+    def _then(self, edit: tuple, n: int) -> 'SnapshotLog':
+        """
+        Returns the log of the next version, with one more edit. Starts from
+        this version's snapshot if it was built, so edits are only replayed
+        once.
+        """
+        built = self._built
+        if built is not None:
+            return SnapshotLog(built, (edit, None), n, self.version + 1)
+        return SnapshotLog(
+            self._base, (edit, self._edits), n, self.version + 1
+        )
+
+
+def _apply(
+    base: MazeSnapshot,
+    edits: tuple,
+    n: int,
+    version: int
+) -> MazeSnapshot:
+    """
+    Builds the snapshot that results from applying a chain of edits to a
+    snapshot, in O(edits + degree of the changed vertices).
+    """
+    ordered = []
+    while edits is not None:
+        edit, edits = edits
+        ordered.append(edit)
+
+    # The food flag and neighbours of each changed row, the neighbours as
+    # dict keys to keep their order and edit them in O(1).
+    rows: Dict[int, list] = {}
+
+    def row(i: int) -> list:
+        found = rows.get(i)
+        if found is None:
+            if i < base.n:
+                found = [base.has_food(i), dict.fromkeys(base.neighbours(i))]
+            else:
+                found = [False, {}]
+            rows[i] = found
+        return found
+
+    for edit in reversed(ordered):
+        kind = edit[0]
+        if kind == _JOIN:
+            _, i, j = edit
+            row(i)[1][j] = None
+            row(j)[1][i] = None
+        elif kind == _CUT:
+            _, i, j = edit
+            row(i)[1].pop(j, None)
+            row(j)[1].pop(i, None)
+        else:
+            for i, (food, neighbours) in edit[1].items():
+                rows[i] = [food, dict.fromkeys(neighbours)]
+
+    snapshot = base.with_rows(
+        {i: (food, tuple(adj)) for i, (food, adj) in rows.items()},
+        n,
+        version
+    )
+    limit = min(max(_COMPACT_AFTER, n >> 3), n >> 1)
+    if snapshot.changed > limit:
+        # Lookups through the trie are slower than through the CSR arrays,
+        # so start over from a fresh base every so often.
+        compact = CSRGraph.from_graph(snapshot)
+        compact.version = version
+        snapshot = MazeSnapshot(compact, base.vertices, version)
+    return snapshot
+
+
+def _lookup(node: Union[tuple, None], shift: int, i: int) -> Union[Row, None]:
+    """
+    Finds the row of vertex `i` in a trie, or None if it has not changed.
+    """
+    if i >> shift >= _WIDTH:
+        return None
+    while node is not None and shift:
+        node = node[(i >> shift) & _MASK]
+        shift -= _BITS
+    if node is None:
+        return None
+    return node[i & _MASK]
+
+
+def _assoc(node: Union[tuple, None], shift: int, i: int, row: Row) -> tuple:
+    """
+    Returns a copy of a trie with the row of vertex `i` set, copying only the
+    nodes on the path to it.
+    """
+    children = list(node) if node is not None else [None] * _WIDTH
+    slot = (i >> shift) & _MASK
+    if shift:
+        children[slot] = _assoc(children[slot], shift - _BITS, i, row)
+    else:
+        children[slot] = row
+    return tuple(children)
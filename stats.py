@@ -0,0 +1,222 @@
+"""
+Stats
+=====
+
+Opt-in instrumentation for the quokka maze.
+
+When stats are enabled on a maze (`QuokkaMaze.enable_stats`), every public
+operation records its call count, a latency histogram, and what the search
+routines did on its behalf: states expanded, simple paths enumerated, the
+peak frontier size, and how often a walk had to be shortcut or handed over to
+the exact simple path search. Hooks are called after every operation, so the
+numbers can be exported elsewhere.
+
+When stats are disabled, an operation only pays for one attribute check, and
+each search routine for one thread-local lookup.
+"""
+
+import functools
+import threading
+import time
+from typing import Callable, Dict, List, Union
+
+
+# Upper bounds (in seconds) of the latency histogram buckets.
+BUCKETS = (1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1.0, 10.0, float('inf'))
+
+Hook = Callable[[str, float, 'SearchCounters'], None]
+
+_local = threading.local()
+
+
+class SearchCounters:
+    """
+    Search Counters
+    ---------------
+
+    What the search routines did during a single operation.
+
+    Attributes:
+        * self.expanded (int) - states (or vertices) taken off a frontier.
+        * self.paths (int) - simple paths enumerated.
+        * self.peak_frontier (int) - the largest frontier (queue or stack).
+        * self.shortcuts (int) - walks turned into simple paths by cutting
+            out their loops.
+        * self.fallbacks (int) - branch and bound simple path searches.
+    """
+
+    __slots__ = ('expanded', 'paths', 'peak_frontier', 'shortcuts',
+                 'fallbacks')
+
+    def __init__(self) -> None:
+        self.expanded = 0
+        self.paths = 0
+        self.peak_frontier = 0
+        self.shortcuts = 0
+        self.fallbacks = 0
+
+    def add(
+        self,
+        expanded: int = 0,
+        paths: int = 0,
+        frontier: int = 0,
+        shortcuts: int = 0,
+        fallbacks: int = 0
+    ) -> None:
+        """
+        Adds the work of one search routine.
+
+        :param expanded - The number of states expanded.
+        :param paths - The number of simple paths enumerated.
+        :param frontier - The peak frontier size of the routine.
+        :param shortcuts - The number of walks shortcut into simple paths.
+        :param fallbacks - The number of exact simple path searches.
+        """
+        self.expanded += expanded
+        self.paths += paths
+        self.shortcuts += shortcuts
+        self.fallbacks += fallbacks
+        if frontier > self.peak_frontier:
+            self.peak_frontier = frontier
+
+
+def active_counters() -> Union[SearchCounters, None]:
+    """
+    Returns the counters of the operation running on this thread, or None if
+    stats are disabled.
+    """
+    return getattr(_local, 'counters', None)
+
+
+class OperationStats:
+    """
+    Operation Stats
+    ---------------
+
+    The totals of every call of one operation.
+    """
+
+    __slots__ = ('calls', 'total_s', 'histogram', 'expanded', 'paths',
+                 'peak_frontier', 'shortcuts', 'fallbacks')
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.total_s = 0.0
+        self.histogram = [0] * len(BUCKETS)
+        self.expanded = 0
+        self.paths = 0
+        self.peak_frontier = 0
+        self.shortcuts = 0
+        self.fallbacks = 0
+
+    def record(self, seconds: float, counters: SearchCounters) -> None:
+        """
+        Adds one call.
+        """
+        self.calls += 1
+        self.total_s += seconds
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.histogram[i] += 1
+                break
+        self.expanded += counters.expanded
+        self.paths += counters.paths
+        self.shortcuts += counters.shortcuts
+        self.fallbacks += counters.fallbacks
+        if counters.peak_frontier > self.peak_frontier:
+            self.peak_frontier = counters.peak_frontier
+
+    def as_dict(self) -> Dict:
+        """
+        Returns the totals as plain data.
+        """
+        return {
+            'calls': self.calls,
+            'total_s': self.total_s,
+            'histogram': dict(zip(map(str, BUCKETS), self.histogram)),
+            'expanded': self.expanded,
+            'paths': self.paths,
+            'peak_frontier': self.peak_frontier,
+            'shortcuts': self.shortcuts,
+            'fallbacks': self.fallbacks,
+        }
+
+
+class QueryStats:
+    """
+    Query Stats
+    -----------
+
+    The per operation stats of a maze.
+
+    Functions:
+        * add_hook(hook) - calls `hook(name, seconds, counters)` after every
+            operation.
+        * as_dict() - returns the stats of every operation as plain data.
+        * reset() - forgets every recorded call.
+    """
+
+    def __init__(self, hooks: List[Hook] = ()) -> None:
+        self.operations: Dict[str, OperationStats] = {}
+        self.hooks: List[Hook] = list(hooks)
+        self._lock = threading.Lock()
+
+    def add_hook(self, hook: Hook) -> None:
+        """
+        Adds a hook to be called after every operation.
+        """
+        self.hooks.append(hook)
+
+    def call(self, name: str, method, maze, args, kwargs):
+        """
+        Runs and records one operation.
+        """
+        counters = SearchCounters()
+        outer = getattr(_local, 'counters', None)
+        _local.counters = counters
+        start = time.perf_counter()
+        try:
+            return method(maze, *args, **kwargs)
+        finally:
+            seconds = time.perf_counter() - start
+            _local.counters = outer
+            with self._lock:
+                stats = self.operations.get(name)
+                if stats is None:
+                    stats = self.operations[name] = OperationStats()
+                stats.record(seconds, counters)
+            for hook in self.hooks:
+                hook(name, seconds, counters)
+
+    def as_dict(self) -> Dict[str, Dict]:
+        """
+        Returns the stats of every operation as plain data.
+        """
+        with self._lock:
+            return {
+                name: stats.as_dict()
+                for name, stats in self.operations.items()
+            }
+
+    def reset(self) -> None:
+        """
+        Forgets every recorded call.
+        """
+        with self._lock:
+            self.operations.clear()
+
+
+def instrumented(name: str):
+    """
+    Decorates a `QuokkaMaze` method so that it is recorded as operation
+    `name` when the maze has stats enabled.
+    """
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            stats = self._stats
+            if stats is None:
+                return method(self, *args, **kwargs)
+            return stats.call(name, method, self, args, kwargs)
+        return wrapper
+    return decorate
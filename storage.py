@@ -0,0 +1,244 @@
+"""
+Storage
+=======
+
+A versioned binary snapshot format for quokka mazes.
+
+A snapshot is the CSR form of the maze (see `csr.CSRGraph`), written in
+little-endian byte order:
+
+    offset  size          field
+    0       4             magic, b'QMAZ'
+    4       2             format version (currently 1)
+    6       1             bytes per target id (4 or 8)
+    7       1             reserved, 0
+    8       8             n, the number of vertices
+    16      8             the number of targets (twice the number of edges)
+    24      ceil(n / 8)   the food bitmap, zero padded to a multiple of 8
+    ...     8 * (n + 1)   the row offsets
+    ...     w * targets   the target ids
+
+Loading with `use_mmap` maps the file read-only and reads the offsets, targets
+and food bitmap straight from the mapped pages, so several processes loading
+the same file share one copy in the page cache. The same layout can be put in
+any buffer (see `dump_snapshot` and `load_snapshot`), such as a block of
+shared memory.
+"""
+
+import gc
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import List, Union
+
+from csr import CSRGraph
+from vertex import Vertex
+
+
+MAGIC = b'QMAZ'
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct('<4sHBBQQ')
+_TYPECODES = {4: 'i', 8: 'q'}
+
+
+def write_snapshot(graph: CSRGraph, path: Union[str, os.PathLike]) -> None:
+    """
+    Writes a frozen graph to a snapshot file.
+
+    :param graph - The graph to write.
+    :param path - Where to write the snapshot.
+    """
+    with open(path, 'wb') as f:
+        f.write(dump_snapshot(graph))
+
+
+def dump_snapshot(graph: CSRGraph) -> bytes:
+    """
+    Encodes a frozen graph in the snapshot format.
+
+    :param graph - The graph to encode.
+    :return the snapshot.
+    """
+    offsets = array('q', graph.offsets)
+    width = 4 if graph.n < 2 ** 31 else 8
+    targets = array(_TYPECODES[width], graph.targets)
+    if sys.byteorder != 'little':
+        offsets.byteswap()
+        targets.byteswap()
+
+    food = bytes(graph.food)
+    return b''.join([
+        _HEADER.pack(MAGIC, FORMAT_VERSION, width, 0, graph.n, len(targets)),
+        food,
+        bytes(_padding(len(food))),
+        offsets.tobytes(),
+        targets.tobytes(),
+    ])
+
+
+def read_snapshot(
+    path: Union[str, os.PathLike],
+    use_mmap: bool = True,
+    validate: bool = False
+) -> CSRGraph:
+    """
+    Reads a snapshot file back into a frozen graph. The `vertices` of the
+    returned graph are left empty for the caller to fill in.
+
+    :param path - The snapshot to read.
+    :param use_mmap - Whether to map the file rather than read it. Ignored on
+        big-endian machines, where the data has to be converted.
+    :param validate - Whether to check every offset and target, see
+        `load_snapshot`.
+    :return the graph.
+    :raises ValueError if the file is not a valid snapshot.
+    """
+    with open(path, 'rb') as f:
+        if use_mmap and sys.byteorder == 'little':
+            try:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files can not be mapped.
+                data = f.read()
+        else:
+            data = f.read()
+    return load_snapshot(data, validate)
+
+
+def load_snapshot(data, validate: bool = False) -> CSRGraph:
+    """
+    Decodes a snapshot held in a buffer. On little-endian machines the graph
+    reads straight from the buffer, which must outlive it.
+
+    Loading only checks the header, the size and that the offsets span the
+    targets, so a mapped file loads in O(1). A corrupt row is only found out
+    when it is searched, e.g. as an IndexError; pass `validate` for files
+    that are not trusted, to check every offset and target in O(n + m).
+
+    :param data - The snapshot, any object supporting the buffer protocol.
+    :param validate - Whether to check every offset and target.
+    :return the graph, with its `vertices` left empty.
+    :raises ValueError if the buffer is not a valid snapshot.
+    """
+    buf = memoryview(data)
+    if len(buf) < _HEADER.size:
+        raise ValueError("snapshot is truncated")
+    magic, version, width, _, n, m = _HEADER.unpack_from(buf)
+    if magic != MAGIC:
+        raise ValueError("not a quokka maze snapshot")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"unsupported snapshot version {version}")
+    if width not in _TYPECODES:
+        raise ValueError(f"unsupported target width {width}")
+
+    food_size = (n + 7) >> 3
+    start = _HEADER.size
+    food_end = start + food_size
+    offsets_start = food_end + _padding(food_size)
+    targets_start = offsets_start + 8 * (n + 1)
+    end = targets_start + width * m
+    if len(buf) != end:
+        raise ValueError("snapshot is truncated")
+
+    food = buf[start:food_end]
+    offsets = buf[offsets_start:targets_start].cast('q')
+    targets = buf[targets_start:end].cast(_TYPECODES[width])
+    if sys.byteorder != 'little':
+        offsets = array('q', offsets)
+        targets = array(_TYPECODES[width], targets)
+        offsets.byteswap()
+        targets.byteswap()
+    if offsets[0] != 0 or offsets[n] != m:
+        raise ValueError("snapshot offsets do not span the targets")
+    if validate:
+        _check_rows(n, offsets, targets)
+
+    return CSRGraph(offsets, targets, food, [])
+
+
+def _check_rows(n: int, offsets, targets) -> None:
+    """
+    Checks that the offsets of a decoded snapshot are in order, and that
+    every target is a vertex id.
+
+    :raises ValueError if they are not.
+    """
+    if any(a > b for a, b in zip(offsets, offsets[1:])):
+        raise ValueError("snapshot offsets are not in order")
+    if len(targets) and (min(targets) < 0 or max(targets) >= n):
+        raise ValueError("snapshot has a target that is not a vertex id")
+
+
+class MappedVertex(Vertex):
+    """
+    A vertex of a loaded snapshot. Its neighbours are only read from the
+    snapshot when they are first needed, so loading does not have to build
+    an adjacency dict for every vertex.
+    """
+
+    __slots__ = ('_graph', '_index')
+
+    def __init__(self, graph: CSRGraph, index: int, has_food: bool) -> None:
+        """
+        Initialises the vertex with id `index` of a loaded graph.
+
+        :param graph - The loaded graph.
+        :param index - The id of this vertex in `graph`.
+        :param has_food - Whether this vertex has food.
+        """
+        self.has_food = has_food
+        self._graph = graph
+        self._index = index
+
+    @property
+    def _adj(self):
+        """
+        The adjacency dict, read from the snapshot on first access.
+        """
+        try:
+            return _ADJ.__get__(self, Vertex)
+        except AttributeError:
+            graph = self._graph
+            vertices = graph.vertices
+            neighbours = graph.neighbours(self._index)
+            adj = dict.fromkeys(vertices[i] for i in neighbours)
+            _ADJ.__set__(self, adj)
+            return adj
+
+
+def make_vertices(graph: CSRGraph) -> List[MappedVertex]:
+    """
+    Creates the vertices of a loaded graph, in id order.
+
+    :param graph - The loaded graph.
+    :return the vertices.
+    """
+    food = graph.food
+    flags = [bool(food[i >> 3] >> (i & 7) & 1) for i in range(graph.n)]
+
+    # The vertices can not form reference cycles yet, so there is nothing for
+    # the garbage collector to find while creating millions of them.
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return [
+            MappedVertex(graph, i, has_food)
+            for i, has_food in enumerate(flags)
+        ]
+    finally:
+        if enabled:
+            gc.enable()
+
+
+# The slot that plain vertices keep their adjacency dict in.
+_ADJ = Vertex.__dict__['_adj']
+
+
+def _padding(size: int) -> int:
+    """
+    The number of bytes needed to pad `size` to a multiple of 8.
+    """
+    return -size % 8
@@ -0,0 +1,97 @@
+"""
+Helpers
+=======
+
+Maze factories and reference answers shared by the tests.
+"""
+
+from vertex import Vertex
+from graph import QuokkaMaze
+from search import greedy_placements, iter_valid_paths
+
+
+def build_maze(food, edges):
+    """
+    Builds a maze from a list of food flags and a list of index pairs.
+    """
+
+    vs = [Vertex(f) for f in food]
+    m = QuokkaMaze()
+    for v in vs:
+        m.add_vertex(v)
+    for a, b in edges:
+        m.fix_edge(vs[a], vs[b])
+    return m, vs
+
+
+def random_maze(rng, n_max=10, p=0.3, food_density=0.3):
+    """
+    Builds a small random maze, of 2 to `n_max` vertices, each with food with
+    probability `food_density`, and each pair joined with probability `p`.
+    """
+
+    n = rng.randint(2, n_max)
+    food = [rng.random() < food_density for _ in range(n)]
+    edges = [
+        (a, b)
+        for a in range(n)
+        for b in range(a + 1, n)
+        if rng.random() < p
+    ]
+    return build_maze(food, edges)
+
+
+def is_reachable(path, k):
+    """
+    Checks that consecutive vertices of `path` are joined, and that the
+    quokkas never go more than `k` hops without food along it.
+    """
+
+    stamina = k
+    for prev, v in zip(path, path[1:]):
+        if stamina == 0 or v not in prev.edges:
+            return False
+        stamina = k if v.has_food else stamina - 1
+    return True
+
+
+def shortest_simple_path(maze, s, t, k):
+    """
+    Enumerates the simple paths from `s` to `t` and returns the shortest
+    one that satisfies the food constraint.
+
+    Much slower than `find_path`, which it is a reference for.
+    """
+
+    graph = maze.snapshot()
+    shortest = None
+    for path in iter_valid_paths(
+        graph, maze.vertex_id(s), maze.vertex_id(t), k
+    ):
+        if shortest is None or len(path) < len(shortest):
+            shortest = path
+    if shortest is None:
+        return None
+    return graph.to_vertices(shortest)
+
+
+def fewest_food_simple_path(maze, s, t, k):
+    """
+    Enumerates the simple paths from `s` to `t` and returns the one needing
+    the fewest extra food, as a tuple (locations, path).
+
+    Much slower than `minimize_extra_food`, which it is a reference for.
+    """
+
+    graph = maze.snapshot()
+    best = None
+    paths = iter_valid_paths(
+        graph, maze.vertex_id(s), maze.vertex_id(t), k, None
+    )
+    for path in paths:
+        placed = greedy_placements(graph, path, k)
+        if best is None or len(placed) < len(best[0]):
+            best = (placed, path)
+    if best is None:
+        return None
+    return graph.to_vertices(best[0]), graph.to_vertices(best[1])
@@ -0,0 +1,65 @@
+import json
+import unittest
+
+from benchmarks import generators
+from benchmarks.run import QUERIES, run
+
+
+class TestGenerators(unittest.TestCase):
+
+    def test_seeded_and_simple(self):
+        """
+        Are the generated mazes reproducible simple graphs?
+        """
+
+        for name, generate in generators.GENERATORS.items():
+            edges = generate(200, 3)
+            self.assertEqual(edges, generate(200, 3), name)
+            self.assertTrue(all(u != v for u, v in edges), name)
+            undirected = {frozenset(e) for e in edges}
+            self.assertEqual(len(undirected), len(edges), name)
+
+        self.assertEqual(len(generators.corridor(10)), 9)
+        self.assertEqual(len(generators.grid(16)), 24)
+        self.assertEqual(
+            generators.place_food(100, 0.3, 1),
+            generators.place_food(100, 0.3, 1)
+        )
+        self.assertEqual(generators.place_food(50, 1.0), list(range(50)))
+
+    def test_build(self):
+        """
+        Does build give a maze with the requested food density?
+        """
+
+        maze = generators.build('grid', 100, food_density=0.0)
+        self.assertEqual(len(maze.vertices), 100)
+        self.assertFalse(any(v.has_food for v in maze.vertices))
+
+
+class TestRun(unittest.TestCase):
+
+    def test_report(self):
+        """
+        Does a small run cover every operation and serialise to JSON?
+        """
+
+        report = run(['corridor', 'scale_free'], [30], [2], queries=3)
+        report = json.loads(json.dumps(report))
+
+        operations = {r['operation'] for r in report['results']}
+        self.assertEqual(
+            operations,
+            {'add_vertex', 'fix_edge', 'block_edge', *QUERIES}
+        )
+        for result in report['results']:
+            self.assertEqual(result['timeouts'], 0)
+            self.assertGreaterEqual(result['max_s'], result['mean_s'])
+            self.assertGreaterEqual(result['mean_s'], result['min_s'])
+
+        # Edits are timed one call at a time too, not averaged over a batch.
+        for result in report['results']:
+            if result['operation'] == 'add_vertex':
+                self.assertEqual(result['calls'], result['n'])
+                self.assertGreater(result['max_s'], result['min_s'])
+        self.assertEqual(report['meta']['queries'], 3)
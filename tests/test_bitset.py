@@ -0,0 +1,79 @@
+import random
+import unittest
+
+from vertex import Vertex
+from bitset import multi_source_reach, spread
+from search import shortest_walk
+from tests.helpers import build_maze
+
+
+class TestFeasibilityMatrix(unittest.TestCase):
+
+    def test_corridor(self):
+        """
+        Is every pair of a small corridor answered?
+        """
+
+        #           *
+        # A -- B -- C -- D -- E
+        m, (A, B, C, D, E) = build_maze(
+            [False, False, True, False, False],
+            [(0, 1), (1, 2), (2, 3), (3, 4)]
+        )
+
+        self.assertEqual(m.feasibility_matrix([A, E], 2), [
+            [True, True, True, True, True],
+            [True, True, True, True, True],
+        ])
+        self.assertEqual(m.feasibility_matrix([A, D], 1, [B, C, E]), [
+            [True, False, False],
+            [True, True, True],
+        ])
+        self.assertEqual(m.feasibility_matrix([], 1), [])
+
+    def test_invalid_arguments(self):
+        """
+        Are negative k and vertices outside the maze rejected?
+        """
+
+        m, (A, B) = build_maze([True, True], [(0, 1)])
+
+        self.assertIsNone(m.feasibility_matrix([A], -1))
+        self.assertIsNone(m.feasibility_matrix([A, Vertex(True)], 1))
+        self.assertIsNone(m.feasibility_matrix([A], 1, [B, None]))
+
+    def test_matches_single_source_search(self):
+        """
+        Does every bit agree with a separate search per pair?
+        """
+
+        rng = random.Random(18)
+        for _ in range(200):
+            n = rng.randint(1, 14)
+            food = [rng.random() < 0.3 for _ in range(n)]
+            edges = [
+                (a, b)
+                for a in range(n)
+                for b in range(a + 1, n)
+                if rng.random() < 0.25
+            ]
+            m, vs = build_maze(food, edges)
+            graph = m.freeze()
+            k = rng.randint(0, 4)
+            sources = [rng.randrange(n) for _ in range(rng.randint(1, 70))]
+
+            reach = multi_source_reach(graph, sources, k)
+            for i, s in enumerate(sources):
+                for t in range(n):
+                    expected = shortest_walk(graph, s, t, k) is not None
+                    self.assertEqual(bool(reach[t] >> i & 1), expected)
+
+    def test_spread_is_bounded(self):
+        """
+        Do the bits stop after `depth` steps?
+        """
+
+        m, vs = build_maze([False] * 6, [(i, i + 1) for i in range(5)])
+
+        bits = spread(m.freeze(), {0: 0b01, 5: 0b10}, 2)
+        self.assertEqual(bits, [0b01, 0b01, 0b01, 0b10, 0b10, 0b10])
@@ -0,0 +1,83 @@
+import io
+import os
+import tempfile
+import unittest
+
+from vertex import Vertex
+from graph import QuokkaMaze
+
+
+class TestBulkConstruction(unittest.TestCase):
+
+    def test_from_pairs(self):
+        """
+        Are duplicate edges and self loops dropped?
+        """
+
+        m = QuokkaMaze.from_edges(
+            [(0, 1), (1, 0), (1, 2), (2, 2), (2, 3), (1, 2)],
+            food=[2]
+        )
+        A, B, C, D = m.vertices
+
+        self.assertEqual(len(m.vertices), 4)
+        self.assertEqual(list(B.edges), [A, C])
+        self.assertEqual(list(C.edges), [B, D])
+        self.assertEqual(len(m.freeze().targets), 6)
+        self.assertEqual([v.has_food for v in m.vertices],
+                         [False, False, True, False])
+        self.assertEqual(m.find_path(A, D, 2), [A, B, C, D])
+
+    def test_from_file(self):
+        """
+        Can an edge list be streamed from a file?
+        """
+
+        text = "# a triangle and a tail\n0 1\n1 2\n\n2 0\n2 3\n"
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'maze.txt')
+            with open(path, 'w') as f:
+                f.write(text)
+            m = QuokkaMaze.from_edges(path, food=[0], n=6)
+
+        self.assertEqual(len(m.vertices), 6)
+        self.assertEqual(len(m.vertices[2].edges), 3)
+        self.assertEqual(len(m.vertices[5].edges), 0)
+
+        m2 = QuokkaMaze.from_edges(io.StringIO(text))
+        self.assertEqual(len(m2.vertices), 4)
+
+    def test_rejects_bad_input(self):
+        """
+        Are malformed lines and out of range ids reported?
+        """
+
+        with self.assertRaises(ValueError):
+            QuokkaMaze.from_edges(io.StringIO("0 1 2\n"))
+        with self.assertRaises(ValueError):
+            QuokkaMaze.from_edges(io.StringIO("0 x\n"))
+        with self.assertRaises(ValueError):
+            QuokkaMaze.from_edges([(0, 5)], n=3)
+        with self.assertRaises(ValueError):
+            QuokkaMaze.from_edges([(0, -1)])
+        with self.assertRaises(ValueError):
+            QuokkaMaze.from_edges([(0, 1)], food=[7], n=2)
+
+    def test_bulk_adds(self):
+        """
+        Do the bulk adds skip invalid and duplicate entries?
+        """
+
+        A, B, C = Vertex(True), Vertex(False), Vertex(True)
+        outsider = Vertex(True)
+
+        m = QuokkaMaze()
+
+        self.assertEqual(m.add_vertices_bulk([A, B, None, A, C]), 3)
+        self.assertEqual(
+            m.add_edges_bulk([(A, B), (B, A), (B, C), (A, A), (A, outsider)]),
+            2
+        )
+        self.assertEqual(list(B.edges), [A, C])
+        self.assertEqual(len(A.edges), 1)
+        self.assertEqual(m.add_edges_bulk([]), 0)
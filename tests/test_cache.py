@@ -0,0 +1,86 @@
+import unittest
+
+from vertex import Vertex
+from graph import QuokkaMaze
+from cache import QueryCache
+
+
+class TestQueryCache(unittest.TestCase):
+
+    def setUp(self):
+        #      *
+        # A -- B -- C
+        self.A = Vertex(False)
+        self.B = Vertex(True)
+        self.C = Vertex(False)
+
+        self.m = QuokkaMaze()
+        for v in (self.A, self.B, self.C):
+            self.m.add_vertex(v)
+        self.m.fix_edge(self.A, self.B)
+        self.m.fix_edge(self.B, self.C)
+
+    def test_disabled_by_default(self):
+        """
+        The cache is opt-in.
+        """
+
+        self.assertIsNone(self.m.cache_info())
+
+    def test_repeated_queries_hit(self):
+        """
+        Are repeated queries answered from the cache?
+        """
+
+        self.m.enable_cache()
+
+        first = self.m.find_path(self.A, self.C, 1)
+        first.append(self.A)
+        second = self.m.find_path(self.A, self.C, 1)
+
+        self.assertEqual(second, [self.A, self.B, self.C])
+        self.assertEqual(self.m.cache_info().hits, 1)
+        self.assertEqual(self.m.cache_info().misses, 1)
+
+        self.m.find_path(self.A, self.C, 2)
+        self.assertEqual(self.m.cache_info().misses, 2)
+
+        # Invalid queries are never cached.
+        self.assertIsNone(self.m.find_path(self.A, self.C, -1))
+        self.assertEqual(self.m.cache_info().currsize, 2)
+
+    def test_mutation_invalidates(self):
+        """
+        Does fixing or blocking an edge drop the cached results?
+        """
+
+        self.m.enable_cache()
+
+        self.assertIsNotNone(self.m.find_path(self.A, self.C, 1))
+        self.m.block_edge(self.A, self.B)
+        self.assertIsNone(self.m.find_path(self.A, self.C, 1))
+        self.m.fix_edge(self.A, self.C)
+        self.assertEqual(self.m.find_path(self.A, self.C, 1), [self.A, self.C])
+
+        info = self.m.cache_info()
+        self.assertEqual(info.hits, 0)
+        self.assertEqual(info.invalidations, 2)
+
+    def test_lru_eviction(self):
+        """
+        Is the least recently used entry evicted first?
+        """
+
+        cache = QueryCache(maxsize=2)
+
+        cache.lookup('a', 0, lambda: 1)
+        cache.lookup('b', 0, lambda: 2)
+        cache.lookup('a', 0, lambda: 1)
+        cache.lookup('c', 0, lambda: 3)
+
+        self.assertEqual(cache.lookup('a', 0, lambda: -1), 1)
+        self.assertEqual(cache.lookup('b', 0, lambda: -2), -2)
+        self.assertEqual(cache.info().currsize, 2)
+
+        with self.assertRaises(ValueError):
+            QueryCache(maxsize=0)
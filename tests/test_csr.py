@@ -0,0 +1,63 @@
+import unittest
+
+from vertex import Vertex
+from graph import QuokkaMaze
+
+
+class TestCSRGraph(unittest.TestCase):
+
+    def setUp(self):
+        #      *         *
+        # A -- B -- C -- D    E (not in maze) -- A
+        self.vs = [Vertex(i in (1, 3)) for i in range(4)]
+        self.outsider = Vertex(True)
+
+        self.m = QuokkaMaze()
+        for v in self.vs:
+            self.m.add_vertex(v)
+
+        A, B, C, D = self.vs
+        self.m.fix_edge(A, B)
+        self.m.fix_edge(B, C)
+        self.m.fix_edge(C, D)
+        A.add_edge(self.outsider)
+
+    def test_layout(self):
+        """
+        Are the offsets, targets and food bitmap built from the maze?
+        """
+
+        g = self.m.freeze()
+
+        self.assertEqual(g.n, 4)
+        self.assertEqual(list(g.neighbours(0)), [1])
+        self.assertEqual(sorted(g.neighbours(1)), [0, 2])
+        self.assertEqual(g.degree(2), 2)
+        self.assertEqual(len(g.targets), 6)
+        self.assertEqual(
+            [g.has_food(i) for i in range(4)],
+            [False, True, False, True]
+        )
+        self.assertEqual(g.to_vertices([3, 0]), [self.vs[3], self.vs[0]])
+
+    def test_freeze_is_cached_until_mutation(self):
+        """
+        Is the frozen copy reused, and rebuilt once the maze changes?
+        """
+
+        g = self.m.freeze()
+        self.assertIs(self.m.freeze(), g)
+
+        self.m.block_edge(self.vs[1], self.vs[2])
+        g2 = self.m.freeze()
+
+        self.assertIsNot(g2, g)
+        self.assertEqual(list(g2.neighbours(1)), [0])
+        self.assertIsNone(self.m.find_path(self.vs[0], self.vs[3], 5))
+
+    def test_vertex_has_slots(self):
+        """
+        Vertices should not carry a per-instance __dict__.
+        """
+
+        self.assertFalse(hasattr(self.vs[0], '__dict__'))
@@ -0,0 +1,291 @@
+import random
+import time
+import unittest
+
+from benchmarks.generators import build
+from vertex import Vertex
+from tests.helpers import (
+    build_maze,
+    fewest_food_simple_path,
+    random_maze,
+)
+
+
+def survives(path, k, extra):
+    """
+    Checks that a simple path has food at most k steps apart, once food is
+    placed on the `extra` vertices.
+    """
+
+    if len(set(path)) != len(path):
+        return False
+    for u, v in zip(path, path[1:]):
+        if v not in u.edges:
+            return False
+    stamina = k
+    for v in path[1:]:
+        if stamina == 0:
+            return False
+        stamina -= 1
+        if v.has_food or v in extra:
+            stamina = k
+    return True
+
+
+class TestMinimizeExtraFood(unittest.TestCase):
+
+    def test_returns_path_with_placements(self):
+        """
+        Is the path returned along with the food placements?
+        """
+
+        #                     *
+        # A -- B -- C -- D -- E
+        m, (A, B, C, D, E) = build_maze(
+            [False, False, False, False, True],
+            [(0, 1), (1, 2), (2, 3), (3, 4)]
+        )
+
+        locations, path = m.minimize_extra_food_with_path(A, E, 2)
+        self.assertEqual(path, [A, B, C, D, E])
+        self.assertEqual(len(locations), 1)
+        self.assertTrue(survives(path, 2, locations))
+
+        self.assertEqual(m.minimize_extra_food(A, E, 1), [B, C, D])
+        self.assertEqual(m.minimize_extra_food(A, E, 4), [])
+        self.assertIsNone(m.minimize_extra_food(A, E, 0))
+        self.assertIsNone(m.minimize_extra_food(A, E, -1))
+
+    def test_prefers_route_with_food(self):
+        """
+        Is a longer route past existing food preferred to placing food?
+        """
+
+        #      B -- C
+        #     /      \
+        #    A        F
+        #     \      /
+        #      D*-- E*
+        m, (A, B, C, D, E, F) = build_maze(
+            [False, False, False, True, True, False],
+            [(0, 1), (1, 2), (2, 5), (0, 3), (3, 4), (4, 5)]
+        )
+
+        self.assertEqual(m.minimize_extra_food(A, F, 1), [])
+        self.assertTrue(m.exists_path_with_extra_food(A, F, 1, 0))
+        self.assertEqual(m.find_location_of_extra_food(A, F, 1, 0), [])
+
+    def test_matches_exhaustive_search(self):
+        """
+        Does the 0-1 BFS agree with enumerating every simple path?
+        """
+
+        rng = random.Random(7)
+        for _ in range(200):
+            m, vs = random_maze(rng, n_max=8, p=0.35, food_density=0.25)
+            s, t = rng.sample(vs, 2)
+            k = rng.randint(1, 3)
+
+            expected = fewest_food_simple_path(m, s, t, k)
+            got = m.minimize_extra_food_with_path(s, t, k)
+
+            if expected is None:
+                self.assertIsNone(got)
+                continue
+
+            locations, path = got
+            self.assertEqual(len(locations), len(expected[0]))
+            self.assertEqual(path[0], s)
+            self.assertEqual(path[-1], t)
+            self.assertTrue(survives(path, k, locations))
+
+            x = len(locations)
+            self.assertTrue(m.exists_path_with_extra_food(s, t, k, x))
+            if x > 0:
+                self.assertFalse(m.exists_path_with_extra_food(s, t, k, x - 1))
+                self.assertIsNone(
+                    m.find_location_of_extra_food(s, t, k, x - 1)
+                )
+
+
+class TestMinimizeExtraFoodBatch(unittest.TestCase):
+
+    def test_matches_single_queries(self):
+        """
+        Does the batch give the answer of every query, in input order?
+        """
+
+        rng = random.Random(2021)
+        for _ in range(50):
+            m, vs = random_maze(rng, n_max=10, p=0.3, food_density=0.25)
+            queries = [
+                (rng.choice(vs[:3]), rng.choice(vs), rng.randint(0, 3))
+                for _ in range(20)
+            ]
+
+            got = m.minimize_extra_food_batch(queries)
+            self.assertEqual(len(got), len(queries))
+            for (s, t, k), locations in zip(queries, got):
+                expected = m.minimize_extra_food(s, t, k)
+                if expected is None:
+                    self.assertIsNone(locations)
+                else:
+                    self.assertEqual(len(locations), len(expected))
+
+    def test_corridor(self):
+        """
+        Are the documented examples answered, whatever the order?
+        """
+
+        #                     *
+        # A -- B -- C -- D -- E
+        m, (A, B, C, D, E) = build_maze(
+            [False, False, False, False, True],
+            [(0, 1), (1, 2), (2, 3), (3, 4)]
+        )
+
+        self.assertEqual(
+            m.minimize_extra_food_batch([(A, E, 1), (A, E, 4), (A, A, 1)]),
+            [[B, C, D], [], []]
+        )
+
+
+class TestMinExtraFood(unittest.TestCase):
+
+    def test_corridor(self):
+        """
+        Is the threshold found on a long corridor without food?
+        """
+
+        m, vs = build_maze([False] * 40, [(i, i + 1) for i in range(39)])
+
+        self.assertEqual(m.min_extra_food(vs[0], vs[39], 1), 38)
+        self.assertEqual(m.min_extra_food(vs[0], vs[39], 4), 9)
+        self.assertEqual(m.min_extra_food(vs[0], vs[39], 39), 0)
+        self.assertEqual(m.min_extra_food(vs[0], vs[0], 0), 0)
+        self.assertIsNone(m.min_extra_food(vs[0], vs[39], 0))
+        self.assertIsNone(m.min_extra_food(vs[0], vs[39], -1))
+
+    def test_disconnected(self):
+        """
+        No budget helps when there is no path.
+        """
+
+        m, (A, B) = build_maze([False, False], [])
+
+        self.assertIsNone(m.min_extra_food(A, B, 3))
+        self.assertFalse(m.exists_path_with_extra_food(A, B, 3, 5))
+
+    def test_matches_minimize(self):
+        """
+        Does the threshold search agree with minimize_extra_food?
+        """
+
+        rng = random.Random(11)
+        for _ in range(150):
+            m, vs = random_maze(rng, n_max=10, p=0.25, food_density=0.25)
+            s, t = rng.sample(vs, 2)
+            k = rng.randint(1, 3)
+
+            locations = m.minimize_extra_food(s, t, k)
+            expected = None if locations is None else len(locations)
+            self.assertEqual(m.min_extra_food(s, t, k), expected)
+
+
+class TestExtraFoodProfile(unittest.TestCase):
+
+    def test_example(self):
+        """
+        Is the fewest extra food found for every k?
+        """
+
+        #                   *
+        # A -- B -- C -- D -- E    F
+        m, (A, B, C, D, E, F) = build_maze(
+            [False, False, False, False, True, False],
+            [(0, 1), (1, 2), (2, 3), (3, 4)]
+        )
+
+        self.assertEqual(m.extra_food_profile(A, E, 4), [None, 3, 1, 1, 0])
+        got = m.extra_food_profile(A, E, 2, placements=True)
+        self.assertEqual(got[:2], [None, [B, C, D]])
+        self.assertEqual(len(got[2]), 1)
+        self.assertEqual(m.extra_food_profile(A, F, 2), [None, None, None])
+        self.assertIsNone(m.extra_food_profile(A, E, -1))
+        self.assertIsNone(m.extra_food_profile(A, Vertex(True), 1))
+
+    def test_matches_single_queries(self):
+        """
+        Does the profile agree with `minimize_extra_food` for every k?
+        """
+
+        rng = random.Random(2025)
+        for _ in range(100):
+            n = rng.randint(2, 10)
+            food = [rng.random() < 0.3 for _ in range(n)]
+            edges = [
+                (a, b)
+                for a in range(n)
+                for b in range(a + 1, n)
+                if rng.random() < 0.3
+            ]
+            m, vs = build_maze(food, edges)
+            s, t = rng.sample(vs, 2)
+            k_max = rng.randint(0, n)
+
+            counts = m.extra_food_profile(s, t, k_max)
+            plans = m.extra_food_profile(s, t, k_max, placements=True)
+            self.assertEqual(len(counts), k_max + 1)
+            for k in range(k_max + 1):
+                expected = m.minimize_extra_food(s, t, k)
+                if expected is None:
+                    self.assertIsNone(counts[k])
+                    self.assertIsNone(plans[k])
+                    continue
+                self.assertEqual(counts[k], len(expected))
+                self.assertEqual(len(plans[k]), len(expected))
+
+                # The colony survives once food is placed at the locations.
+                placed = [f or v in plans[k] for f, v in zip(food, vs)]
+                fed, fed_vs = build_maze(placed, edges)
+                self.assertIsNotNone(
+                    fed.find_path(fed_vs[vs.index(s)], fed_vs[vs.index(t)], k)
+                )
+
+
+class TestLargeMazes(unittest.TestCase):
+
+    # Benchmark grid queries whose best walk doubles back, as (n, seed, s,
+    # t, k): each took minutes when the exact search was bounded by food
+    # alone.
+    QUERIES = [
+        (400, 0, 120, 155, 4),
+        (900, 0, 238, 694, 4),
+        (900, 1, 847, 25, 3),
+    ]
+
+    # Seconds allowed per query, generous for slow machines.
+    BUDGET = 2.0
+
+    def test_grid_queries_finish(self):
+        """
+        Are the extra food queries answered in time when the walk is not
+        simple?
+        """
+
+        for n, seed, s, t, k in self.QUERIES:
+            maze = build('grid', n, 0.2, seed)
+            s, t = maze.vertices[s], maze.vertices[t]
+
+            start = time.perf_counter()
+            locations, path = maze.minimize_extra_food_with_path(s, t, k)
+            x = len(locations)
+            self.assertTrue(maze.exists_path_with_extra_food(s, t, k, x))
+            found = maze.find_location_of_extra_food(s, t, k, x)
+            elapsed = time.perf_counter() - start
+
+            self.assertLess(elapsed, self.BUDGET, (n, seed, k))
+            self.assertTrue(survives(path, k, locations))
+            self.assertEqual(len(found), x)
+            if maze.find_path(s, t, k) is not None:
+                self.assertEqual(locations, [])
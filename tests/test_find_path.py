@@ -0,0 +1,457 @@
+import random
+import unittest
+
+from vertex import Vertex
+from search import (
+    best_simple_path,
+    greedy_placements,
+    iter_valid_paths,
+    shortcut
+)
+from tests.helpers import build_maze, is_reachable, shortest_simple_path
+
+
+def should_be_equal(got, expected, func, message="Incorrect result returned"):
+    """
+    Simple Assert Helper Function
+    """
+
+    assert expected == got, \
+        f"[{func}] MSG: {message} [Expected: {expected}, got: {got}]"
+
+
+def check_path_should_match(
+    got,
+    expected,
+    func="maze.find_path",
+    message="Returned incorrect path"
+):
+    """
+    Checks the equality of the path returned.
+    """
+
+    assert got is not None, "Returned a `None` response when it shouldn't be."
+
+    should_be_equal(
+        len(got),
+        len(expected),
+        func,
+        "Path length did not match expected!"
+    )
+
+    for idx in range(len(expected)):
+        should_be_equal(
+            got[idx],
+            expected[idx],
+            func,
+            message + f"(index: {idx} failed)"
+        )
+
+
+class TestFindPath(unittest.TestCase):
+
+    def test_shortest_path_through_cycle(self):
+        """
+        Does find_path prefer the shorter side of a cycle?
+        """
+
+        #   B -- C
+        #  /      \
+        # A        F
+        #  \      /
+        #   D -- E -- G -- H
+        m, (A, B, C, D, E, F, G, H) = build_maze(
+            [True] * 8,
+            [(0, 1), (1, 2), (2, 5), (0, 3), (3, 4), (4, 5), (4, 6), (6, 7)]
+        )
+
+        check_path_should_match(m.find_path(A, H, 1), [A, D, E, G, H])
+        check_path_should_match(m.find_path(A, A, 0), [A])
+
+    def test_walk_detour_is_not_a_simple_path(self):
+        """
+        A walk that has to double back to a food spur is not a simple path.
+        """
+
+        #           F*
+        #           |
+        # A -- B -- C -- D -- E
+        m, (A, B, C, D, E, F) = build_maze(
+            [False, False, False, False, False, True],
+            [(0, 1), (1, 2), (2, 3), (3, 4), (2, 5)]
+        )
+
+        self.assertIsNone(m.find_path(A, E, 3))
+        check_path_should_match(m.find_path(A, E, 4), [A, B, C, D, E])
+
+    def test_invalid_arguments(self):
+        """
+        Are invalid vertices and negative k rejected?
+        """
+
+        m, (A, B) = build_maze([True, True], [(0, 1)])
+
+        self.assertIsNone(m.find_path(A, B, -1))
+        self.assertIsNone(m.find_path(A, Vertex(True), 1))
+        self.assertIsNone(m.find_path(None, B, 1))
+
+    def test_matches_exhaustive_search(self):
+        """
+        Does the state search agree with enumerating every simple path?
+        """
+
+        rng = random.Random(2823)
+        for _ in range(200):
+            n = rng.randint(2, 8)
+            food = [rng.random() < 0.3 for _ in range(n)]
+            edges = [
+                (a, b)
+                for a in range(n)
+                for b in range(a + 1, n)
+                if rng.random() < 0.35
+            ]
+            m, vs = build_maze(food, edges)
+            s, t = rng.sample(vs, 2)
+            k = rng.randint(0, 3)
+
+            got = m.find_path(s, t, k)
+            expected = shortest_simple_path(m, s, t, k)
+
+            if expected is None:
+                self.assertIsNone(got)
+            else:
+                self.assertIsNotNone(got)
+                self.assertEqual(len(got), len(expected))
+                self.assertEqual(len(set(got)), len(got))
+                self.assertTrue(is_reachable(got, k))
+
+
+def all_simple_paths(s, t):
+    """
+    Reference enumeration of every simple path from s to t.
+    """
+
+    paths = []
+
+    def walk(path):
+        if path[-1] is t:
+            paths.append(list(path))
+            return
+        for w in path[-1].edges:
+            if w not in path:
+                path.append(w)
+                walk(path)
+                path.pop()
+
+    walk([s])
+    return paths
+
+
+def food_needed(path, k):
+    """
+    The fewest extra food needed along a path, or None if k is too small.
+    """
+
+    if len(path) == 1:
+        return 0
+    if k == 0:
+        return None
+    needed = 0
+    stamina = k
+    for v in path[1:]:
+        if stamina == 0:
+            needed += 1
+            stamina = k
+        stamina -= 1
+        if v.has_food:
+            stamina = k
+    return needed
+
+
+class TestIterValidPaths(unittest.TestCase):
+
+    def test_matches_reference_enumeration(self):
+        """
+        Are exactly the surviving simple paths yielded?
+        """
+
+        rng = random.Random(9)
+        for _ in range(150):
+            n = rng.randint(2, 7)
+            food = [rng.random() < 0.3 for _ in range(n)]
+            edges = [
+                (a, b)
+                for a in range(n)
+                for b in range(a + 1, n)
+                if rng.random() < 0.4
+            ]
+            m, vs = build_maze(food, edges)
+            s, t = rng.sample(vs, 2)
+            k = rng.randint(0, 3)
+            x = rng.randint(0, 2)
+
+            expected = sorted(
+                [m.vertex_id(v) for v in p]
+                for p in all_simple_paths(s, t)
+                if food_needed(p, k) is not None and food_needed(p, k) <= x
+            )
+            got = sorted(
+                [m.vertex_id(v) for v in p]
+                for p in m.iter_valid_paths(s, t, k, x)
+            )
+            self.assertEqual(got, expected)
+
+    def test_is_lazy_and_not_recursive(self):
+        """
+        Can a long corridor be walked without hitting the recursion limit?
+        """
+
+        n = 5000
+        m, vs = build_maze(
+            [i % 3 == 0 for i in range(n)],
+            [(i, i + 1) for i in range(n - 1)]
+        )
+
+        paths = m.iter_valid_paths(vs[0], vs[-1], 3)
+        self.assertEqual(len(next(paths)), n)
+        self.assertIsNone(next(paths, None))
+
+        self.assertEqual(list(m.iter_valid_paths(vs[0], vs[-1], 2)), [])
+        self.assertEqual(list(m.iter_valid_paths(vs[0], vs[-1], 3, -1)), [])
+
+
+class TestBidirectional(unittest.TestCase):
+
+    def test_meets_in_the_middle(self):
+        """
+        Are the two halves joined into one ordered path?
+        """
+
+        #           *
+        # A -- B -- C -- D -- E -- F
+        m, vs = build_maze(
+            [False, False, True, False, False, False],
+            [(i, i + 1) for i in range(5)]
+        )
+        A, F = vs[0], vs[-1]
+
+        check_path_should_match(m.find_path(A, F, 3, 'bidirectional'), vs)
+        self.assertIsNone(m.find_path(A, F, 2, 'bidirectional'))
+        check_path_should_match(m.find_path(A, A, 0, 'bidirectional'), [A])
+
+    def test_unknown_strategy(self):
+        """
+        Is an unknown strategy rejected?
+        """
+
+        m, (A, B) = build_maze([True, True], [(0, 1)])
+
+        with self.assertRaises(ValueError):
+            m.find_path(A, B, 1, 'sideways')
+
+    def test_matches_breadth_first_search(self):
+        """
+        Does it find paths of the same length as the one-sided search?
+        """
+
+        rng = random.Random(14)
+        for _ in range(300):
+            n = rng.randint(2, 12)
+            food = [rng.random() < 0.3 for _ in range(n)]
+            edges = [
+                (a, b)
+                for a in range(n)
+                for b in range(a + 1, n)
+                if rng.random() < 0.3
+            ]
+            m, vs = build_maze(food, edges)
+            s, t = rng.sample(vs, 2)
+            k = rng.randint(0, 4)
+
+            expected = m.find_path(s, t, k)
+            got = m.find_path(s, t, k, 'bidirectional')
+
+            if expected is None:
+                self.assertIsNone(got)
+            else:
+                self.assertEqual(len(got), len(expected))
+                self.assertEqual((got[0], got[-1]), (s, t))
+                self.assertEqual(len(set(got)), len(got))
+                self.assertTrue(is_reachable(got, k))
+
+
+class TestExactSolver(unittest.TestCase):
+
+    def test_branch_and_bound_matches_enumeration(self):
+        """
+        Does the branch and bound search find the best simple path?
+        """
+
+        rng = random.Random(2020)
+        for _ in range(200):
+            n = rng.randint(2, 9)
+            food = [rng.random() < 0.3 for _ in range(n)]
+            edges = [
+                (a, b)
+                for a in range(n)
+                for b in range(a + 1, n)
+                if rng.random() < 0.4
+            ]
+            m, vs = build_maze(food, edges)
+            graph = m.snapshot()
+            s, t = rng.sample(range(n), 2)
+            k = rng.randint(1, 3)
+
+            hops = [len(p) - 1 for p in iter_valid_paths(graph, s, t, k, 0)]
+            got = best_simple_path(graph, s, t, k)
+            if not hops:
+                self.assertIsNone(got)
+            else:
+                self.assertEqual(got[0], min(hops))
+                self.assertEqual(len(got[1]) - 1, got[0])
+
+            foods = [
+                (len(greedy_placements(graph, p, k)), len(p))
+                for p in iter_valid_paths(graph, s, t, k, None)
+            ]
+            got = best_simple_path(graph, s, t, k, food=True)
+            if not foods:
+                self.assertIsNone(got)
+            else:
+                # The fewest food, and the fewest hops among those.
+                self.assertEqual((got[0], len(got[1])), min(foods))
+                self.assertEqual(
+                    len(greedy_placements(graph, got[1], k)),
+                    got[0]
+                )
+                self.assertIsNone(
+                    best_simple_path(graph, s, t, k, True, upper=got[0])
+                )
+
+    def test_shortcut_rechecks_the_food(self):
+        """
+        Is a shortcut walk only accepted when the colony still survives?
+        """
+
+        #      C*
+        #      |
+        # A -- B -- D
+        m, (A, B, C, D) = build_maze(
+            [False, False, True, False],
+            [(0, 1), (1, 2), (1, 3)]
+        )
+        graph = m.snapshot()
+        walk = [0, 1, 2, 1, 3]
+
+        self.assertIsNone(shortcut(graph, walk, 1))
+        self.assertEqual(shortcut(graph, walk, 1, 1), [0, 1, 3])
+        self.assertEqual(shortcut(graph, walk, 2), [0, 1, 3])
+
+
+class TestFindPathsBatch(unittest.TestCase):
+
+    def test_matches_single_queries(self):
+        """
+        Does the batch give the answer of every query, in input order?
+        """
+
+        rng = random.Random(2021)
+        for _ in range(50):
+            n = rng.randint(2, 10)
+            food = [rng.random() < 0.3 for _ in range(n)]
+            edges = [
+                (a, b)
+                for a in range(n)
+                for b in range(a + 1, n)
+                if rng.random() < 0.3
+            ]
+            m, vs = build_maze(food, edges)
+            queries = [
+                (rng.choice(vs[:3]), rng.choice(vs), rng.randint(0, 3))
+                for _ in range(20)
+            ]
+
+            got = m.find_paths_batch(queries)
+            self.assertEqual(len(got), len(queries))
+            for (s, t, k), path in zip(queries, got):
+                expected = m.find_path(s, t, k)
+                if expected is None:
+                    self.assertIsNone(path)
+                else:
+                    self.assertEqual(len(path), len(expected))
+                    self.assertEqual((path[0], path[-1]), (s, t))
+                    self.assertEqual(len(set(path)), len(path))
+                    self.assertTrue(is_reachable(path, k))
+
+    def test_invalid_queries(self):
+        """
+        Are invalid queries answered with None, without failing the batch?
+        """
+
+        #      *
+        # A -- B -- C
+        m, (A, B, C) = build_maze([False, True, False], [(0, 1), (1, 2)])
+
+        got = m.find_paths_batch([
+            (A, C, 1),
+            (A, C, -1),
+            (A, Vertex(True), 1),
+            (A, C, 1),
+            (C, A, 0),
+        ])
+        self.assertEqual(got, [[A, B, C], None, None, [A, B, C], None])
+        self.assertIsNot(got[0], got[3])
+        self.assertEqual(m.find_paths_batch([]), [])
+
+
+class TestMinKForPath(unittest.TestCase):
+
+    def test_example(self):
+        """
+        Is the smallest k found, with the path that survives it?
+        """
+
+        #           *       *
+        # A -- B -- C -- D -- E    F
+        m, (A, B, C, D, E, F) = build_maze(
+            [False, False, True, False, True, False],
+            [(0, 1), (1, 2), (2, 3), (3, 4)]
+        )
+
+        self.assertEqual(m.min_k_for_path(A, E), (2, [A, B, C, D, E]))
+        self.assertEqual(m.min_k_for_path(A, A), (0, [A]))
+        self.assertIsNone(m.min_k_for_path(A, F))
+        self.assertIsNone(m.min_k_for_path(A, Vertex(True)))
+
+    def test_matches_sweep(self):
+        """
+        Is the answer the first k of a sweep over `find_path`?
+        """
+
+        rng = random.Random(2024)
+        for _ in range(100):
+            n = rng.randint(2, 10)
+            food = [rng.random() < 0.3 for _ in range(n)]
+            edges = [
+                (a, b)
+                for a in range(n)
+                for b in range(a + 1, n)
+                if rng.random() < 0.3
+            ]
+            m, vs = build_maze(food, edges)
+            s, t = rng.sample(vs, 2)
+
+            expected = None
+            for k in range(n):
+                path = m.find_path(s, t, k)
+                if path is not None:
+                    expected = k, path
+                    break
+
+            got = m.min_k_for_path(s, t)
+            if expected is None:
+                self.assertIsNone(got)
+            else:
+                self.assertEqual(got[0], expected[0])
+                self.assertEqual(len(got[1]), len(expected[1]))
+                self.assertTrue(is_reachable(got[1], got[0]))
@@ -0,0 +1,105 @@
+import random
+import unittest
+
+from food_distance import FoodDistanceIndex
+from search import (
+    WALKS,
+    iter_valid_paths,
+    min_food_walk
+)
+from tests.helpers import build_maze, random_maze
+
+
+class TestFoodDistanceIndex(unittest.TestCase):
+
+    def test_distances(self):
+        """
+        Is the distance to the nearest food found for every vertex?
+        """
+
+        #      *              *
+        # A -- B -- C -- D -- E    F
+        m, vs = build_maze(
+            [False, True, False, False, True, False],
+            [(0, 1), (1, 2), (2, 3), (3, 4)]
+        )
+
+        index = m.food_index()
+        self.assertIs(m.food_index(), index)
+        self.assertEqual(list(index.distance), [1, 0, 1, 1, 0, -1])
+
+        m.fix_edge(vs[4], vs[5])
+        self.assertIsNot(m.food_index(), index)
+        self.assertEqual(m.food_index().distance[5], 1)
+
+    def test_least_recently_used_is_evicted(self):
+        """
+        Are only the `maxsize` most recently used structures kept?
+        """
+
+        m, vs = build_maze([True, False, True], [(0, 1), (1, 2)])
+        index = FoodDistanceIndex(m.snapshot(), maxsize=2)
+
+        one = index.food_graph(1)
+        two = index.food_graph(2)
+        self.assertIs(index.food_graph(1), one)
+        index.food_graph(3)
+
+        # 2 was used least recently, so it made room for 3.
+        self.assertIs(index.food_graph(1), one)
+        self.assertIsNone(index.food_graph(2, build=False))
+        self.assertIsNot(index.food_graph(2), two)
+
+        with self.assertRaises(ValueError):
+            FoodDistanceIndex(m.snapshot(), maxsize=0)
+
+    def test_dead_ends(self):
+        """
+        Is a state dead exactly when neither food nor `t` is in reach?
+        """
+
+        #                *
+        # A -- B -- C -- D    E
+        m, vs = build_maze(
+            [False, False, False, True, False],
+            [(0, 1), (1, 2), (2, 3)]
+        )
+
+        dead = m.food_index().dead_ends(1, 3)
+        self.assertFalse(dead(0, 1))   # B is one step away.
+        self.assertTrue(dead(0, 0))
+        self.assertFalse(dead(2, 1))   # So is the food on D.
+        self.assertTrue(dead(4, 3))    # E reaches nothing.
+        self.assertFalse(dead(3, 0))   # D has food itself.
+
+    def test_pruning_changes_no_answer(self):
+        """
+        Do the searches give the same answers with and without pruning?
+        """
+
+        rng = random.Random(1919)
+        for _ in range(200):
+            m, vs = random_maze(rng, n_max=12, p=0.25)
+            graph = m.snapshot()
+            s, t = rng.sample(range(graph.n), 2)
+            k = rng.randint(0, 4)
+            dead = m.food_index().dead_ends(t, k)
+
+            for strategy, walk in WALKS.items():
+                expected = walk(graph, s, t, k)
+                got = walk(graph, s, t, k, dead=dead)
+                if expected is None:
+                    self.assertIsNone(got, strategy)
+                else:
+                    self.assertEqual(len(got), len(expected), strategy)
+
+            x = rng.randint(0, 2)
+            expected = min_food_walk(graph, s, t, k, budget=x)
+            got = min_food_walk(graph, s, t, k, budget=x, dead=dead)
+            self.assertEqual(expected is None, got is None)
+            if expected is not None:
+                self.assertEqual(len(got[1]), len(expected[1]))
+
+            expected = sorted(iter_valid_paths(graph, s, t, k, x))
+            got = sorted(iter_valid_paths(graph, s, t, k, x, dead=dead))
+            self.assertEqual(got, expected)
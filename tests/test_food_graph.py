@@ -0,0 +1,71 @@
+import random
+import unittest
+
+from search import shortest_walk
+from tests.helpers import build_maze
+
+
+class TestFoodGraph(unittest.TestCase):
+
+    def test_components(self):
+        """
+        Are food vertices within k hops put in the same component?
+        """
+
+        # *              *    *
+        # A -- B -- C -- D -- E
+        m, (A, B, C, D, E) = build_maze(
+            [True, False, False, True, True],
+            [(0, 1), (1, 2), (2, 3), (3, 4)]
+        )
+
+        fg = m.food_graph(2)
+        self.assertEqual(fg.component(3), fg.component(4))
+        self.assertNotEqual(fg.component(0), fg.component(3))
+        self.assertIsNone(fg.component(1))
+
+        self.assertTrue(m.food_graph(3).component(0) is not None)
+        self.assertEqual(
+            m.food_graph(3).component(0),
+            m.food_graph(3).component(4)
+        )
+
+        self.assertFalse(m.can_reach(A, E, 2))
+        self.assertTrue(m.can_reach(A, E, 3))
+        self.assertTrue(m.can_reach(B, E, 2))
+        self.assertFalse(m.can_reach(A, E, -1))
+
+    def test_rebuilt_after_mutation(self):
+        """
+        Is a cached food graph discarded once an edge changes?
+        """
+
+        m, (A, B, C) = build_maze([True, False, True], [(0, 1), (1, 2)])
+
+        self.assertTrue(m.can_reach(A, C, 2))
+        m.block_edge(A, B)
+        self.assertFalse(m.can_reach(A, C, 2))
+        self.assertIsNone(m.find_path(A, C, 2))
+
+    def test_matches_state_search(self):
+        """
+        Does the food graph agree with the stamina state search on walks?
+        """
+
+        rng = random.Random(5)
+        for _ in range(150):
+            n = rng.randint(2, 12)
+            food = [rng.random() < 0.3 for _ in range(n)]
+            edges = [
+                (a, b)
+                for a in range(n)
+                for b in range(a + 1, n)
+                if rng.random() < 0.25
+            ]
+            m, vs = build_maze(food, edges)
+            k = rng.randint(0, 4)
+            fg = m.food_graph(k)
+            for s in range(n):
+                for t in range(n):
+                    expected = shortest_walk(m.freeze(), s, t, k) is not None
+                    self.assertEqual(fg.reachable(s, t), expected)
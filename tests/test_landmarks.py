@@ -0,0 +1,100 @@
+import random
+import unittest
+
+from landmarks import hop_distances
+from tests.helpers import build_maze, is_reachable, random_maze
+
+
+class TestLandmarks(unittest.TestCase):
+
+    def test_bounds_are_admissible(self):
+        """
+        Is the bound never more than the true distance, and None exactly
+        when there is no path?
+        """
+
+        rng = random.Random(15)
+        for _ in range(100):
+            m, vs = random_maze(rng, n_max=14, p=0.25)
+            graph = m.freeze()
+            landmarks = m.landmarks()
+            t = rng.randrange(graph.n)
+
+            dist = hop_distances(graph, [t])
+            bound = landmarks.bound_to(t)
+            for v in range(graph.n):
+                if dist[v] < 0:
+                    # Landmarks may not cover every component.
+                    self.assertTrue(bound(v) is None or bound(v) == 0)
+                else:
+                    self.assertLessEqual(bound(v), dist[v])
+            for u in range(graph.n):
+                for w in graph.neighbours(u):
+                    if bound(u) is not None and bound(w) is not None:
+                        self.assertLessEqual(abs(bound(u) - bound(w)), 1)
+
+    def test_rebuilt_when_graph_changes(self):
+        """
+        Are the landmarks kept until the graph changes?
+        """
+
+        #         *
+        # A -- B -- C
+        m, (A, B, C) = build_maze([False, False, True], [(0, 1), (1, 2)])
+
+        landmarks = m.landmarks()
+        self.assertIs(m.landmarks(), landmarks)
+        self.assertEqual(list(landmarks.food_distance), [2, 1, 0])
+
+        m.block_edge(B, C)
+        self.assertIsNot(m.landmarks(), landmarks)
+        self.assertEqual(list(m.landmarks().food_distance), [-1, -1, 0])
+
+
+class TestAStar(unittest.TestCase):
+
+    def test_matches_uninformed_search(self):
+        """
+        Does the A* mode agree with the default searches?
+        """
+
+        rng = random.Random(1515)
+        for _ in range(200):
+            m, vs = random_maze(rng, n_max=14, p=0.25)
+            s, t = rng.sample(vs, 2)
+            k = rng.randint(0, 4)
+
+            expected = m.find_path(s, t, k)
+            got = m.find_path(s, t, k, 'astar')
+            if expected is None:
+                self.assertIsNone(got)
+            else:
+                self.assertEqual(len(got), len(expected))
+                self.assertEqual((got[0], got[-1]), (s, t))
+                self.assertTrue(is_reachable(got, k))
+
+            expected = m.minimize_extra_food(s, t, k)
+            got = m.minimize_extra_food(s, t, k, 'astar')
+            if expected is None:
+                self.assertIsNone(got)
+            else:
+                self.assertEqual(len(got), len(expected))
+
+    def test_corridor(self):
+        """
+        Are the documented examples answered by the A* mode?
+        """
+
+        #                     *
+        # A -- B -- C -- D -- E
+        m, (A, B, C, D, E) = build_maze(
+            [False, False, False, False, True],
+            [(0, 1), (1, 2), (2, 3), (3, 4)]
+        )
+
+        self.assertEqual(m.find_path(A, E, 4, 'astar'), [A, B, C, D, E])
+        self.assertIsNone(m.find_path(A, E, 3, 'astar'))
+        self.assertEqual(m.minimize_extra_food(A, E, 1, 'astar'), [B, C, D])
+        self.assertEqual(len(m.minimize_extra_food(A, E, 2, 'astar')), 1)
+        with self.assertRaises(ValueError):
+            m.minimize_extra_food(A, E, 2, 'dijkstra')
@@ -0,0 +1,67 @@
+import random
+import unittest
+
+from vertex import Vertex
+from parallel import ParallelExecutor
+from tests.helpers import build_maze
+
+
+class TestParallelExecutor(unittest.TestCase):
+
+    def test_matches_batch_queries(self):
+        """
+        Do the workers give the answers of the batch queries, in order?
+        """
+
+        rng = random.Random(2022)
+        n = 40
+        food = [rng.random() < 0.3 for _ in range(n)]
+        edges = [
+            (a, b)
+            for a in range(n)
+            for b in range(a + 1, n)
+            if rng.random() < 0.08
+        ]
+        m, vs = build_maze(food, edges)
+        queries = [
+            (rng.choice(vs[:5]), rng.choice(vs), rng.randint(0, 3))
+            for _ in range(60)
+        ]
+
+        with ParallelExecutor(m, workers=2, chunksize=7) as pool:
+            self.assertEqual(
+                pool.find_paths(queries),
+                m.find_paths_batch(queries)
+            )
+            self.assertEqual(
+                pool.minimize_extra_food(queries),
+                m.minimize_extra_food_batch(queries)
+            )
+
+    def test_version_is_pinned(self):
+        """
+        Are queries answered on the version the executor was made on, and
+        invalid ones with None?
+        """
+
+        #      *
+        # A -- B -- C
+        m, (A, B, C) = build_maze([False, True, False], [(0, 1), (1, 2)])
+
+        pool = ParallelExecutor(m, workers=1)
+        m.block_edge(B, C)
+        D = Vertex(True)
+        m.add_vertex(D)
+
+        self.assertEqual(
+            pool.find_paths([(A, C, 1), (A, D, 1), (A, C, -1), (A, B, 0)]),
+            [[A, B, C], None, None, None]
+        )
+        self.assertEqual(pool.find_paths([]), [])
+
+        pool.close()
+        pool.close()
+        with self.assertRaises(ValueError):
+            pool.find_paths([(A, C, 1)])
+        with self.assertRaises(ValueError):
+            ParallelExecutor(m, workers=0)
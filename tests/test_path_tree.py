@@ -0,0 +1,79 @@
+import random
+import unittest
+
+from vertex import Vertex
+from tests.helpers import build_maze, is_reachable, random_maze
+
+
+class TestPathTree(unittest.TestCase):
+
+    def test_matches_single_queries(self):
+        """
+        Does the tree give the answer of every single query?
+        """
+
+        rng = random.Random(2023)
+        for _ in range(100):
+            m, vs = random_maze(rng)
+            s = rng.choice(vs)
+            k = rng.randint(0, 3)
+
+            paths = m.find_paths_from(s, k)
+            food = m.min_extra_food_from(s, k)
+            reachable = []
+            for t in vs:
+                expected = m.find_path(s, t, k)
+                got = paths.path(t)
+                if expected is None:
+                    self.assertIsNone(got)
+                    self.assertFalse(paths.reachable(t))
+                    self.assertIsNone(paths.cost(t))
+                else:
+                    reachable.append(t)
+                    self.assertEqual(len(got), len(expected))
+                    self.assertEqual(paths.cost(t), len(got) - 1)
+                    self.assertEqual(paths.locations(t), [])
+                    self.assertTrue(is_reachable(got, k))
+
+                expected = m.minimize_extra_food_with_path(s, t, k)
+                if expected is None:
+                    self.assertIsNone(food.path(t))
+                    self.assertIsNone(food.cost(t))
+                else:
+                    self.assertEqual(food.cost(t), len(expected[0]))
+                    self.assertEqual(len(food.locations(t)), len(expected[0]))
+                    self.assertEqual(food.path(t)[-1], t)
+
+            self.assertEqual(list(paths.destinations()), reachable)
+
+    def test_paths_are_built_on_demand(self):
+        """
+        Is the path to a destination only built when it is asked for, and
+        on the version the tree was made on?
+        """
+
+        #      *
+        # A -- B -- C -- D
+        m, (A, B, C, D) = build_maze(
+            [False, True, False, False],
+            [(0, 1), (1, 2), (2, 3)]
+        )
+
+        tree = m.find_paths_from(A, 2)
+        self.assertEqual(tree._plans, {})
+        m.block_edge(B, C)
+        E = Vertex(True)
+        m.add_vertex(E)
+
+        self.assertEqual(tree.path(D), [A, B, C, D])
+        self.assertEqual(len(tree._plans), 1)
+        self.assertEqual(tree.path(A), [A])
+        self.assertIsNone(tree.path(E))
+        self.assertIsNone(tree.path(Vertex(False)))
+
+        food = m.min_extra_food_from(A, 1)
+        self.assertEqual(food.locations(B), [])
+        self.assertIsNone(food.cost(D))
+
+        self.assertIsNone(m.find_paths_from(A, -1))
+        self.assertIsNone(m.min_extra_food_from(Vertex(True), 1))
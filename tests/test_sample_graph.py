@@ -297,3 +297,76 @@ class TestSampleGraph(unittest.TestCase):
             "maze.exists_path_with_extra_food",
             "Able to reach path with extra added food, should be true."
         )
+
+    def test_vertex_registry(self):
+        """
+        Are vertices indexed by identity with stable ids?
+        """
+
+        vs = [Vertex(i % 2 == 0) for i in range(1000)]
+
+        m = QuokkaMaze()
+
+        for v in vs:
+            should_be_true(m.add_vertex(v), "maze.add_vertex")
+
+        should_be_false(m.add_vertex(vs[10]), "maze.add_vertex")
+        should_be_false(m.add_vertex(None), "maze.add_vertex")
+
+        should_be_equal(len(m.vertices), 1000, "maze.add_vertex")
+        should_be_equal(list(m.vertices), vs, "maze.vertices")
+        should_be_equal(m.vertex_id(vs[10]), 10, "maze.vertex_id")
+        should_be_equal(m.vertex_id(Vertex(True)), None, "maze.vertex_id")
+
+        should_be_true(vs[999] in m.vertices, "maze.vertices")
+        should_be_false(Vertex(True) in m.vertices, "maze.vertices")
+        should_be_false([] in m.vertices, "maze.vertices")
+
+    def test_vertices_view_equality(self):
+        """
+        Does the vertices view compare equal to a list of the same vertices?
+        """
+
+        A = Vertex(True)
+        B = Vertex(False)
+
+        m = QuokkaMaze()
+        should_be_equal(m.vertices, [], "maze.vertices")
+
+        m.add_vertex(A)
+        m.add_vertex(B)
+
+        should_be_true(m.vertices == [A, B], "maze.vertices")
+        should_be_true(m.vertices == (A, B), "maze.vertices")
+        should_be_true([A, B] == m.vertices, "maze.vertices")
+        should_be_false(m.vertices == [B, A], "maze.vertices")
+        should_be_true(m.vertices != [A], "maze.vertices")
+        should_be_false(m.vertices == "AB", "maze.vertices")
+
+        other = QuokkaMaze()
+        other.add_vertex(A)
+        other.add_vertex(B)
+        should_be_true(m.vertices == other.vertices, "maze.vertices")
+
+    def test_fix_edge_rejects_self_loops(self):
+        """
+        Is the graph kept simple?
+        """
+
+        A = Vertex(True)
+        B = Vertex(True)
+
+        m = QuokkaMaze()
+        m.add_vertex(A)
+        m.add_vertex(B)
+
+        should_be_false(m.fix_edge(A, A), "maze.fix_edge")
+        should_be_false(A in A.edges, "maze.fix_edge")
+
+        should_be_true(m.fix_edge(A, B), "maze.fix_edge")
+        should_be_false(m.fix_edge(B, A), "maze.fix_edge")
+        should_be_equal(len(A.edges), 1, "maze.fix_edge")
+
+        should_be_true(m.block_edge(B, A), "maze.block_edge")
+        should_be_false(m.block_edge(A, B), "maze.block_edge")
+        check_edges(A, B, False)
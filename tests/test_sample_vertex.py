@@ -96,3 +96,59 @@ class TestSampleVertex(unittest.TestCase):
             1,
             "vertex.rm_edge"
         )
+
+    def test_edges_view(self):
+        """
+        Do the edges keep insertion order and behave like a sequence?
+        """
+
+        A = Vertex(True)
+        others = [Vertex(False) for _ in range(5)]
+
+        for v in others:
+            A.add_edge(v)
+
+        A.add_edge(A)
+        A.add_edge(None)
+
+        should_be_equal(list(A.edges), others, "vertex.edges")
+        should_be_equal(A.edges[0], others[0], "vertex.edges")
+        should_be_equal(A.edges[-1], others[-1], "vertex.edges")
+        should_be_equal(A.edges[1:3], others[1:3], "vertex.edges")
+
+        A.rm_edge(others[2])
+        A.rm_edge(others[2])
+
+        should_be_equal(len(A.edges), 4, "vertex.rm_edge")
+        should_be_false(others[2] in A.edges, "vertex.rm_edge")
+        should_be_true(others[3] in A.edges, "vertex.rm_edge")
+
+        with self.assertRaises(IndexError):
+            A.edges[4]
+
+    def test_edges_view_equality(self):
+        """
+        Does the edges view compare equal to a list of the same vertices?
+        """
+
+        A = Vertex(True)
+        B = Vertex(False)
+        C = Vertex(False)
+
+        should_be_equal(A.edges, [], "vertex.edges")
+
+        A.add_edge(B)
+        A.add_edge(C)
+
+        should_be_true(A.edges == [B, C], "vertex.edges")
+        should_be_true(A.edges == (B, C), "vertex.edges")
+        should_be_true([B, C] == A.edges, "vertex.edges")
+        should_be_false(A.edges == [C, B], "vertex.edges")
+        should_be_false(A.edges == [B], "vertex.edges")
+        should_be_true(A.edges != [B], "vertex.edges")
+        should_be_false(A.edges == "BC", "vertex.edges")
+
+        D = Vertex(False)
+        D.add_edge(B)
+        D.add_edge(C)
+        should_be_true(A.edges == D.edges, "vertex.edges")
@@ -0,0 +1,209 @@
+import asyncio
+import json
+import os
+import socket
+import tempfile
+import threading
+import unittest
+
+from service import QueryService, ReadWriteLock
+from tests.helpers import build_maze
+
+
+class TestQueryService(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        #           *
+        # 0 -- 1 -- 2 -- 3 -- 4
+        self.m, self.vs = build_maze(
+            [False, False, True, False, False],
+            [(0, 1), (1, 2), (2, 3), (3, 4)]
+        )
+        self.service = QueryService(self.m, workers=2, batch_delay=0.01)
+
+    async def asyncTearDown(self):
+        await self.service.close()
+
+    async def test_queries_and_edits(self):
+        """
+        Are queries answered with ids, and do edits change later answers?
+        """
+
+        handle = self.service.handle
+        response = await handle(
+            {'id': 1, 'op': 'find_path', 's': 0, 't': 4, 'k': 2}
+        )
+        self.assertEqual(
+            response,
+            {'id': 1, 'ok': True, 'result': [0, 1, 2, 3, 4]}
+        )
+
+        response = await handle({
+            'id': 2, 'op': 'minimize_extra_food', 's': 0, 't': 4, 'k': 1,
+            'strategy': 'astar'
+        })
+        self.assertEqual(response['result'], [1, 3])
+
+        response = await handle({'id': 3, 'op': 'block_edge', 'u': 2, 'v': 3})
+        self.assertEqual(response['result'], True)
+        response = await handle(
+            {'id': 4, 'op': 'exists_path_with_extra_food', 's': 0, 't': 4,
+             'k': 2, 'x': 9}
+        )
+        self.assertEqual(response['result'], False)
+
+    async def test_batches_concurrent_queries(self):
+        """
+        Are queries arriving together answered correctly in one batch?
+        """
+
+        requests = [
+            {'id': i, 'op': 'find_path', 's': 0, 't': t, 'k': 2}
+            for i, t in enumerate([1, 2, 3, 4] * 5)
+        ]
+        responses = await asyncio.gather(
+            *(self.service.handle(r) for r in requests)
+        )
+        for request, response in zip(requests, responses):
+            self.assertEqual(response['id'], request['id'])
+            self.assertEqual(response['result'], list(range(request['t'] + 1)))
+
+    async def test_bad_requests(self):
+        """
+        Are malformed requests answered with an error?
+        """
+
+        handle = self.service.handle
+        for request in (
+            [],
+            {'id': 1, 'op': 'drop_table'},
+            {'id': 1, 'op': 'find_path', 's': 0, 't': 4},
+            {'id': 1, 'op': 'find_path', 's': 0, 't': 99, 'k': 1},
+            {'id': 1, 'op': 'find_path', 's': 0, 't': '4', 'k': 1},
+            {'id': 1, 'op': 'find_path', 's': 0, 't': 4, 'k': 1,
+             'timeout': -1},
+        ):
+            response = await handle(request)
+            self.assertFalse(response['ok'])
+            self.assertEqual(response['error'], 'bad_request')
+
+        response = await handle(
+            {'id': 2, 'op': 'find_path', 's': 0, 't': 4, 'k': 1,
+             'strategy': 'sideways'}
+        )
+        self.assertEqual(response['error'], 'error')
+
+    async def test_timeout(self):
+        """
+        Does a query that can not finish in time get a timeout error?
+        """
+
+        release = threading.Event()
+        original = self.m.find_path
+
+        def slow(*args):
+            release.wait(5)
+            return original(*args)
+
+        self.m.find_path = slow
+        try:
+            response = await self.service.handle(
+                {'id': 1, 'op': 'find_path', 's': 0, 't': 4, 'k': 2,
+                 'timeout': 0.05}
+            )
+        finally:
+            release.set()
+        self.assertEqual(response['error'], 'timeout')
+
+    async def test_edit_after_timeout(self):
+        """
+        Does an edit go ahead while a query that timed out is still running?
+        """
+
+        release = threading.Event()
+        original = self.m.find_path
+
+        def slow(*args):
+            release.wait(5)
+            return original(*args)
+
+        self.m.find_path = slow
+        try:
+            response = await self.service.handle(
+                {'id': 1, 'op': 'find_path', 's': 0, 't': 4, 'k': 2,
+                 'timeout': 0.05}
+            )
+            self.assertEqual(response['error'], 'timeout')
+
+            edit = self.service.handle(
+                {'id': 2, 'op': 'block_edge', 'u': 2, 'v': 3}
+            )
+            response = await asyncio.wait_for(edit, 1.0)
+            self.assertEqual(response['result'], True)
+            response = await asyncio.wait_for(
+                self.service.handle(
+                    {'id': 3, 'op': 'can_reach', 's': 0, 't': 4, 'k': 2}
+                ),
+                1.0
+            )
+            self.assertEqual(response['result'], False)
+        finally:
+            release.set()
+
+    @unittest.skipUnless(hasattr(socket, 'AF_UNIX'), "needs unix sockets")
+    async def test_unix_socket(self):
+        """
+        Can a client talk to the service over a unix socket?
+        """
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'quokka.sock')
+            server = await asyncio.start_unix_server(self.service.serve, path)
+            async with server:
+                reader, writer = await asyncio.open_unix_connection(path)
+                writer.write(
+                    b'{"id": 1, "op": "can_reach", "s": 0, "t": 4, "k": 2}\n'
+                    b'not json\n'
+                )
+                await writer.drain()
+                responses = [
+                    json.loads(await reader.readline()) for _ in range(2)
+                ]
+                writer.close()
+                await writer.wait_closed()
+
+        responses.sort(key=lambda r: r['id'] is None)
+        self.assertEqual(responses[0], {'id': 1, 'ok': True, 'result': True})
+        self.assertEqual(responses[1]['error'], 'bad_request')
+
+
+class TestReadWriteLock(unittest.IsolatedAsyncioTestCase):
+
+    async def test_writer_excludes_readers(self):
+        """
+        Do readers share the lock, and does a waiting writer go first?
+        """
+
+        lock = ReadWriteLock()
+        events = []
+
+        async def reader(name, delay):
+            await asyncio.sleep(delay)
+            async with lock.read():
+                events.append(f'{name}+')
+                await asyncio.sleep(0.02)
+                events.append(f'{name}-')
+
+        async def writer():
+            await asyncio.sleep(0.005)
+            async with lock.write():
+                events.append('w+')
+                await asyncio.sleep(0.01)
+                events.append('w-')
+
+        await asyncio.gather(reader('a', 0), reader('b', 0), writer(),
+                             reader('c', 0.01))
+
+        self.assertEqual(events[:2], ['a+', 'b+'])
+        self.assertEqual(events.index('w+'), 4)
+        self.assertEqual(events[5:], ['w-', 'c+', 'c-'])
@@ -0,0 +1,249 @@
+import random
+import sys
+import threading
+import time
+import unittest
+
+from vertex import Vertex
+from csr import CSRGraph
+from tests.helpers import build_maze
+
+
+def rows(graph):
+    """
+    The food flag and sorted neighbour ids of every vertex of a graph.
+    """
+
+    return [
+        (graph.has_food(i), sorted(graph.neighbours(i)))
+        for i in range(graph.n)
+    ]
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def test_pinned_snapshot_does_not_change(self):
+        """
+        Does a snapshot keep answering for its version after edits?
+        """
+
+        #      *
+        # A -- B -- C    and 10 lone vertices
+        m, vs = build_maze([False, True, False] + [False] * 10, [
+            (0, 1), (1, 2)
+        ])
+        A, B, C = vs[:3]
+
+        before = m.snapshot()
+        self.assertIs(m.snapshot(), before)
+        # Building the maze up changed every row, so it was compacted.
+        self.assertEqual(before.changed, 0)
+
+        m.block_edge(B, C)
+        D = Vertex(True)
+        m.add_vertex(D)
+        m.fix_edge(C, D)
+        after = m.snapshot()
+
+        self.assertEqual(rows(before)[:3], [
+            (False, [1]), (True, [0, 2]), (False, [1])
+        ])
+        self.assertEqual(rows(after)[:3], [
+            (False, [1]), (True, [0]), (False, [13])
+        ])
+        self.assertEqual(rows(after)[13], (True, [2]))
+        self.assertEqual(after.n, 14)
+        self.assertIs(after.base, before.base)
+        self.assertEqual(after.changed, 3)
+
+    def test_matches_rebuilt_graph(self):
+        """
+        Do snapshots derived edit by edit match a graph built from scratch?
+        """
+
+        rng = random.Random(17)
+        m, vs = build_maze([False] * 4, [])
+        pinned = []
+        for _ in range(3000):
+            op = rng.random()
+            if op < 0.1:
+                v = Vertex(rng.random() < 0.3)
+                vs.append(v)
+                m.add_vertex(v)
+            elif op < 0.6:
+                m.fix_edge(*rng.sample(vs, 2))
+            else:
+                m.block_edge(*rng.sample(vs, 2))
+            if rng.random() < 0.05:
+                expected = rows(CSRGraph.from_vertices(vs))
+                pinned.append((m.snapshot(), expected))
+
+        for snapshot, expected in pinned:
+            self.assertEqual(rows(snapshot), expected)
+        self.assertEqual(rows(m.freeze()), rows(CSRGraph.from_vertices(vs)))
+
+    def test_direct_vertex_changes_need_refresh(self):
+        """
+        Are changes made to the vertices directly only seen after refresh?
+        """
+
+        # A -- B    C
+        m, (A, B, C) = build_maze([False, False, False], [(0, 1)])
+        self.assertIsNone(m.find_path(A, C, 2))
+        view = m.pin()
+
+        B.add_edge(C)
+        C.add_edge(B)
+        B.has_food = True
+        self.assertIsNone(m.find_path(A, C, 2))
+        self.assertIsNone(m.find_path(A, C, 1))
+
+        m.refresh()
+        self.assertEqual(m.find_path(A, C, 2), [A, B, C])
+        self.assertEqual(m.find_path(A, C, 1), [A, B, C])
+        self.assertEqual(rows(m.freeze()), rows(CSRGraph.from_vertices(
+            [A, B, C]
+        )))
+
+        # Views stay on the version they were pinned to.
+        view.refresh()
+        self.assertIsNone(view.find_path(A, C, 2))
+
+    def test_pinned_view(self):
+        """
+        Does a pinned view answer queries on its version and refuse edits?
+        """
+
+        #                     *
+        # A -- B -- C -- D -- E
+        m, (A, B, C, D, E) = build_maze(
+            [False, False, False, False, True],
+            [(0, 1), (1, 2), (2, 3), (3, 4)]
+        )
+        view = m.pin()
+
+        m.fix_edge(A, E)
+        F = Vertex(True)
+        m.add_vertex(F)
+
+        self.assertEqual(m.find_path(A, E, 1), [A, E])
+        self.assertEqual(view.find_path(A, E, 4), [A, B, C, D, E])
+        self.assertIsNone(view.find_path(A, E, 1))
+        self.assertEqual(view.minimize_extra_food(A, E, 2), [C])
+        self.assertIsNone(view.find_path(A, F, 4))
+
+        self.assertFalse(view.block_edge(A, B))
+        self.assertFalse(view.fix_edge(A, C))
+        self.assertIn(B, A.edges)
+
+    def test_views_share_indexes(self):
+        """
+        Do pinned views and the maze build each index once per version?
+        """
+
+        #      *
+        # A -- B -- C
+        m, (A, B, C) = build_maze([False, True, False], [(0, 1), (1, 2)])
+
+        view = m.pin()
+        index = view.food_index()
+        landmarks = view.landmarks()
+        self.assertIs(m.food_index(), index)
+        self.assertIs(m.landmarks(), landmarks)
+        self.assertIs(m.pin().food_index(), index)
+        self.assertIs(m.pin().landmarks(), landmarks)
+
+        m.block_edge(B, C)
+        current = m.food_index()
+        self.assertIsNot(current, index)
+        self.assertIs(m.pin().food_index(), current)
+
+        # A view of an older version does not evict the current index.
+        self.assertIs(view.food_index().graph, view.snapshot())
+        self.assertIs(m.food_index(), current)
+
+    def test_reads_during_writes(self):
+        """
+        Do queries on another thread only ever see whole edits?
+        """
+
+        # A ring with a chord. Whether or not the chord is there, a path of
+        # at most n / 2 hops joins the two vertices after its ends.
+        n = 60
+        m, vs = build_maze(
+            [True] * n,
+            [(i, (i + 1) % n) for i in range(n)]
+        )
+        m.fix_edge(vs[0], vs[n // 2])
+        stop = threading.Event()
+        errors = []
+
+        def read():
+            while not stop.is_set():
+                path = m.find_path(vs[1], vs[n // 2 + 1], 1)
+                if path is None or len(path) > n // 2 + 2:
+                    errors.append(path)
+
+        reader = threading.Thread(target=read)
+        reader.start()
+        try:
+            for _ in range(300):
+                m.block_edge(vs[0], vs[n // 2])
+                m.fix_edge(vs[0], vs[n // 2])
+        finally:
+            stop.set()
+            reader.join()
+        self.assertEqual(errors, [])
+
+    def test_snapshots_see_whole_edits(self):
+        """
+        Does every snapshot taken during edits have symmetric edges?
+        """
+
+        m, vs = build_maze([False] * 8, [(i, i + 1) for i in range(7)])
+        stop = threading.Event()
+        errors = []
+
+        def read():
+            while not stop.is_set():
+                graph = m.snapshot()
+                for i in range(graph.n):
+                    for j in graph.neighbours(i):
+                        if i not in graph.neighbours(j):
+                            errors.append((graph.version, i, j))
+
+        reader = threading.Thread(target=read)
+        interval = sys.getswitchinterval()
+        # Switch threads often, to interleave the reads with the edits.
+        sys.setswitchinterval(1e-5)
+        reader.start()
+        try:
+            for _ in range(2000):
+                m.fix_edge(vs[0], vs[7])
+                m.block_edge(vs[7], vs[0])
+        finally:
+            stop.set()
+            reader.join()
+            sys.setswitchinterval(interval)
+        self.assertEqual(errors, [])
+
+    def test_edits_do_not_copy_rows(self):
+        """
+        Is editing the edges of a hub as cheap as editing any other vertex?
+        """
+
+        BUDGET = 0.2
+        n = 50000
+        m, vs = build_maze([False] * n, [])
+        m.add_edges_bulk((vs[0], v) for v in vs[2:])
+        hub, other = vs[0], vs[1]
+        m.snapshot()
+
+        start = time.perf_counter()
+        for _ in range(200):
+            self.assertTrue(m.fix_edge(hub, other))
+            self.assertTrue(m.block_edge(hub, other))
+        elapsed = time.perf_counter() - start
+
+        self.assertLess(elapsed, BUDGET)
+        self.assertEqual(len(m.snapshot().neighbours(0)), n - 2)
@@ -0,0 +1,92 @@
+import unittest
+
+from stats import active_counters
+from tests.helpers import build_maze
+
+
+class TestStats(unittest.TestCase):
+
+    def test_disabled_by_default(self):
+        """
+        Nothing is recorded unless stats are enabled.
+        """
+
+        m, (A, B) = build_maze([True, True], [(0, 1)])
+        m.find_path(A, B, 1)
+
+        self.assertIsNone(m.stats_info())
+        self.assertIsNone(active_counters())
+
+    def test_records_operations(self):
+        """
+        Are calls, latency and search work recorded per operation?
+        """
+
+        #      *
+        # A -- B -- C -- D
+        m, (A, B, C, D) = build_maze(
+            [False, True, False, False],
+            [(0, 1), (1, 2), (2, 3)]
+        )
+        m.enable_stats()
+
+        m.find_path(A, D, 2)
+        m.find_path(A, D, 1)
+        m.fix_edge(A, C)
+        m.minimize_extra_food(A, D, 1)
+
+        info = m.stats_info()
+        self.assertEqual(info['find_path']['calls'], 2)
+        self.assertGreater(info['find_path']['expanded'], 0)
+        self.assertGreaterEqual(info['find_path']['peak_frontier'], 1)
+        self.assertEqual(sum(info['find_path']['histogram'].values()), 2)
+        self.assertEqual(info['fix_edge']['calls'], 1)
+        self.assertEqual(info['minimize_extra_food']['calls'], 1)
+        self.assertIsNone(active_counters())
+
+        m._stats.reset()
+        self.assertEqual(m.stats_info(), {})
+
+        m.disable_stats()
+        self.assertIsNone(m.stats_info())
+
+    def test_counts_enumerated_paths(self):
+        """
+        Are the simple paths of the fallback search counted?
+        """
+
+        #           F*
+        #           |
+        # A -- B -- C -- D -- E
+        # |                   |
+        # G -- H -- I* - J -- K -- L* - M
+        m, vs = build_maze(
+            [i in (5, 8, 11) for i in range(13)],
+            [(0, 1), (1, 2), (2, 3), (3, 4), (2, 5),
+             (0, 6), (6, 7), (7, 8), (8, 9), (9, 10), (10, 11), (11, 12),
+             (12, 4)]
+        )
+        m.enable_stats()
+
+        path = m.find_path(vs[0], vs[4], 3)
+        self.assertEqual(len(path), 9)
+        info = m.stats_info()['find_path']
+        self.assertGreater(info['paths'], 0)
+        self.assertEqual(info['fallbacks'], 1)
+        self.assertEqual(info['shortcuts'], 0)
+
+    def test_hooks(self):
+        """
+        Are hooks called after every operation?
+        """
+
+        m, (A, B) = build_maze([True, True], [(0, 1)])
+        seen = []
+        stats = m.enable_stats([lambda name, s, c: seen.append(name)])
+        stats.add_hook(lambda name, s, c: seen.append(c.expanded))
+
+        m.find_path(A, B, 1)
+        m.block_edge(A, B)
+
+        self.assertEqual(seen[0], 'find_path')
+        self.assertEqual(seen[2:], ['block_edge', 0])
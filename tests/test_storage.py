@@ -0,0 +1,161 @@
+import os
+import struct
+import tempfile
+import unittest
+
+from vertex import Vertex
+from graph import QuokkaMaze
+from storage import dump_snapshot, load_snapshot
+
+
+class TestSnapshots(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'maze.qmaz')
+
+        #           *         *
+        # A -- B -- C -- D -- E    F
+        self.m = QuokkaMaze.from_edges(
+            [(0, 1), (1, 2), (2, 3), (3, 4)],
+            food=[2, 4],
+            n=6
+        )
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        """
+        Does a saved maze load back with the same structure?
+        """
+
+        self.m.save(self.path)
+
+        for use_mmap in (True, False):
+            loaded = QuokkaMaze.load(self.path, mmap=use_mmap)
+            A, B, C, D, E, F = loaded.vertices
+
+            self.assertEqual(len(loaded.vertices), 6)
+            self.assertEqual(
+                [v.has_food for v in loaded.vertices],
+                [False, False, True, False, True, False]
+            )
+            self.assertEqual(loaded.find_path(A, E, 2), [A, B, C, D, E])
+            self.assertEqual(sorted(map(loaded.vertex_id, C.edges)), [1, 3])
+            self.assertEqual(len(F.edges), 0)
+
+    def test_loaded_maze_can_change(self):
+        """
+        Can a loaded maze be changed like any other maze?
+        """
+
+        self.m.save(self.path)
+        loaded = QuokkaMaze.load(self.path)
+        A, B, C, D, E, F = loaded.vertices
+
+        self.assertTrue(loaded.block_edge(B, C))
+        self.assertFalse(loaded.block_edge(B, C))
+        self.assertIsNone(loaded.find_path(A, E, 4))
+
+        self.assertTrue(loaded.fix_edge(A, F))
+        self.assertTrue(loaded.fix_edge(F, C))
+        self.assertEqual(loaded.find_path(A, E, 2), [A, F, C, D, E])
+
+        G = Vertex(True)
+        self.assertTrue(loaded.add_vertex(G))
+        self.assertTrue(loaded.fix_edge(E, G))
+        self.assertEqual(loaded.find_path(D, G, 1), [D, E, G])
+
+        # The file is unchanged.
+        again = QuokkaMaze.load(self.path)
+        self.assertEqual(len(again.vertices[1].edges), 2)
+
+    def test_round_trip_in_memory(self):
+        """
+        Does a snapshot held in a buffer load back with the same structure?
+        """
+
+        graph = self.m.freeze()
+        data = bytearray(dump_snapshot(graph))
+        loaded = load_snapshot(data)
+
+        self.assertEqual(loaded.n, 6)
+        self.assertEqual(list(loaded.offsets), list(graph.offsets))
+        self.assertEqual(list(loaded.targets), list(graph.targets))
+        self.assertEqual(
+            [loaded.has_food(i) for i in range(6)],
+            [False, False, True, False, True, False]
+        )
+
+        maze = QuokkaMaze.from_csr(loaded)
+        A, B, C, D, E, F = maze.vertices
+        self.assertEqual(maze.find_path(A, E, 2), [A, B, C, D, E])
+
+        with self.assertRaises(ValueError):
+            load_snapshot(data[:-1])
+
+    def test_rejects_corrupt_rows(self):
+        """
+        Are snapshots whose offsets or targets are corrupt rejected when
+        they are validated, and those whose offsets do not span the targets
+        even when they are not?
+        """
+
+        graph = self.m.freeze()
+        data = dump_snapshot(graph)
+        n, m = graph.n, len(graph.targets)
+        targets = len(data) - 4 * m
+        offsets = targets - 8 * (n + 1)
+
+        def patched(at, fmt, value):
+            bad = bytearray(data)
+            struct.pack_into(fmt, bad, at, value)
+            return bad
+
+        corrupt = [
+            patched(targets + 4, '<i', 99),
+            patched(targets, '<i', -1),
+            patched(offsets, '<q', 1),
+            patched(offsets + 8 * n, '<q', m - 1),
+            patched(offsets + 8 * 2, '<q', 0),
+        ]
+        for bad in corrupt:
+            with self.assertRaises(ValueError):
+                load_snapshot(bad, validate=True)
+        for bad in corrupt[2:4]:
+            with self.assertRaises(ValueError):
+                load_snapshot(bad)
+
+        loaded = load_snapshot(corrupt[0])
+        self.assertEqual(loaded.targets[1], 99)
+
+        with open(self.path, 'wb') as f:
+            f.write(corrupt[0])
+        for use_mmap in (True, False):
+            QuokkaMaze.load(self.path, mmap=use_mmap)
+            with self.assertRaises(ValueError):
+                QuokkaMaze.load(self.path, mmap=use_mmap, validate=True)
+
+    def test_rejects_bad_files(self):
+        """
+        Are files that are not snapshots rejected?
+        """
+
+        with open(self.path, 'wb') as f:
+            f.write(b'not a maze at all, just some bytes')
+        with self.assertRaises(ValueError):
+            QuokkaMaze.load(self.path)
+
+        with open(self.path, 'wb') as f:
+            pass
+        with self.assertRaises(ValueError):
+            QuokkaMaze.load(self.path)
+
+        self.m.save(self.path)
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        with open(self.path, 'wb') as f:
+            f.write(data[:-4])
+        with self.assertRaises(ValueError):
+            QuokkaMaze.load(self.path)
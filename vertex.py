@@ -6,6 +6,58 @@ Represents a vertex in the maze, holds the information about other
 connected vertices, and checks whether this vertex has food.
 """
 
+from collections.abc import Sequence
+from itertools import islice
+from typing import Dict, Iterator
+
+
+class EdgeView(Sequence):
+    """
+    A read-only view over the neighbours of a vertex, in insertion order.
+
+    The neighbours are stored as the keys of a dict, so membership tests are
+    O(1). Indexing is supported for compatibility but walks the dict, so
+    iterate over the view rather than indexing into it.
+    """
+
+    def __init__(self, adj: Dict['Vertex', None]) -> None:
+        self._adj = adj
+
+    def __len__(self) -> int:
+        return len(self._adj)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return list(self._adj)[i]
+        if i < 0:
+            i += len(self._adj)
+        if i < 0 or i >= len(self._adj):
+            raise IndexError("edge index out of range")
+        return next(islice(self._adj, i, None))
+
+    def __iter__(self) -> Iterator['Vertex']:
+        return iter(self._adj)
+
+    def __contains__(self, v) -> bool:
+        try:
+            return v in self._adj
+        except TypeError:
+            return False
+
+    def __eq__(self, other) -> bool:
+        # Compares equal to any sequence holding the same vertices in the
+        # same order, as the plain list this view replaced did.
+        if isinstance(other, EdgeView):
+            return list(self._adj) == list(other._adj)
+        if isinstance(other, Sequence) and not isinstance(other, str):
+            return list(self._adj) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"EdgeView({list(self._adj)!r})"
+
 
 class Vertex:
     """
@@ -14,14 +66,21 @@ class Vertex:
 
     Attributes:
         * self.has_food (bool) - indicates whether this location has food.
-        * self.edges (List[Vertex]) - list of connected vertices.
+        * self.edges (Sequence[Vertex]) - read-only view of the connected
+            vertices, backed by an insertion ordered dict.
 
     Functions:
         * add_edge(self, v) - connects 'v' to this vertex by adding an edge.
         * rm_edge(self, v) - removes the vertex 'v' from this vertex's edges,
             breaking the connection between this vertex and 'v'.
+
+    Once the vertex is in a maze, change its edges through the maze
+    (`QuokkaMaze.fix_edge` and `QuokkaMaze.block_edge`). The maze does not
+    see changes made here, or to `has_food`, until `QuokkaMaze.refresh`.
     """
 
+    __slots__ = ('has_food', '_adj')
+
     def __init__(self, has_food: bool) -> None:
         """
         Initialises this vertex, by setting the attribute whether it has food.
@@ -30,7 +89,14 @@ class Vertex:
         """
 
         self.has_food = has_food
-        self.edges = []
+        self._adj: Dict['Vertex', None] = {}
+
+    @property
+    def edges(self) -> EdgeView:
+        """
+        The vertices connected to this vertex.
+        """
+        return EdgeView(self._adj)
 
     def add_edge(self, v: 'Vertex') -> None:
         """
@@ -39,15 +105,9 @@ class Vertex:
         :param v - The vertex to add an edge between.
         """
         # TODO implement me please!
-        if v == self:
-            return
-        if v == None:
-            return
-        if self == None:
+        if v is self or not isinstance(v, Vertex):
             return
-        if v not in self.edges:
-            self.edges.append(v)
-
+        self._adj[v] = None
 
     def rm_edge(self, v: 'Vertex') -> None:
         """
@@ -55,9 +115,10 @@ class Vertex:
 
         :param v - The vertex to remove from edges.
         """
-    
-        while v in self.edges:
-            self.edges.remove(v)
-
         # TODO implement me please!
+        try:
+            self._adj.pop(v, None)
+        except TypeError:
+            # Unhashable objects are never neighbours.
+            pass
 